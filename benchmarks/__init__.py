@@ -0,0 +1,18 @@
+# File path: benchmarks/__init__.py
+
+""" __init__.py
+
+This package contains benchmarks and check scripts for the text analysis pipeline.
+
+Modules:
+- tokenizer_benchmark: Compares the per-token throughput of `tokenize_greek` with the previous regex chain.
+- lemmatizer_benchmark: Compares the compiled lemmatiser with the backoff chain it was compiled from.
+- synthetic_corpus: Generates reproducible synthetic polytonic Greek corpora of configurable size.
+- pipeline_benchmark: Times each pipeline stage on synthetic corpora and reports throughput, peak memory
+  and scaling curves as JSON.
+- import_time_check: Times `import utils` in fresh interpreters against `utils.IMPORT_TIME_BUDGET`.
+- analysis_server_check: Checks the analysis server's answers to a full job queue and to malformed or invalid requests.
+
+Usage:
+Run a benchmark as a module from the repository root, e.g. `python -m benchmarks.tokenizer_benchmark`.
+"""
@@ -0,0 +1,151 @@
+# File path: benchmarks/analysis_server_check.py
+
+""" analysis_server_check.py
+
+This script runs the analysis server in process with `LocalAnalysisClient` and checks how it answers
+requests it must reject: a full job queue, oversized bodies and header lines, invalid Content-Length
+headers, malformed JSON and missing or invalid parameters.
+
+Functions:
+- raw_request: Sends raw HTTP bytes through the server's request parser and returns its answer.
+- check_queue_full: Checks that a request is rejected with 503 while the job queue is full.
+- check_request_parsing: Checks the answers to malformed HTTP requests.
+- check_bad_input: Checks the answers to API requests with missing or invalid parameters.
+- run_checks: Runs every check against one server.
+
+Dependencies:
+- asyncio: For feeding requests to the server's event loop.
+- utils.analysis_server: The server and its in-process client.
+
+Usage:
+python -m benchmarks.analysis_server_check
+
+Notes:
+- The server loads the lemmatiser at startup, so the CLTK Greek model must be installed.
+- Exits with status 1, listing the failed checks, if any answer differs from the expected one.
+"""
+
+import sys
+import json
+import asyncio
+from http import HTTPStatus
+
+from utils.analysis_server import AnalysisServer, AnalysisServerError, LocalAnalysisClient, MAX_BODY_BYTES
+
+
+async def raw_request(server, data: bytes):
+    """Parses raw HTTP request bytes with the server's request handler.
+
+    Returns:
+    - tuple: (HTTP status, response body).
+    """
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return await server._handle_request(reader)
+
+
+async def _fill_queue(server):
+    """Occupies every job worker and fills the queue, then sends one more job and releases them all.
+
+    Returns:
+    - tuple: (HTTP status of the extra request, results of the blocked jobs).
+    """
+    release = asyncio.Event()
+
+    async def blocked():
+        await release.wait()
+        return "done"
+
+    jobs = []
+    for _ in range(server.concurrency + server.queue_size):
+        jobs.append(asyncio.ensure_future(server.submit(blocked)))
+        await asyncio.sleep(0)  # Lets an idle worker take the job off the queue
+    status, _ = await server.dispatch("POST", "/corpora", {"path": "greek_texts/texts"})
+    release.set()
+    return status, await asyncio.gather(*jobs)
+
+
+def check_queue_full(client) -> list:
+    """Checks that a request is rejected at once with 503 while every worker is busy and the queue is full."""
+    status, results = client._call(_fill_queue(client.server))
+    failures = []
+    if status != HTTPStatus.SERVICE_UNAVAILABLE:
+        failures.append(f"queue full: expected 503, got {status}")
+    if results != ["done"] * len(results):
+        failures.append(f"queue full: the queued jobs did not complete: {results}")
+    return failures
+
+
+def check_request_parsing(client) -> list:
+    """Checks the answers to oversized bodies and lines, invalid Content-Length headers and malformed JSON."""
+    cases = [
+        ("body too large", f"POST /score HTTP/1.1\r\nContent-Length: {MAX_BODY_BYTES + 1}\r\n\r\n".encode(),
+         HTTPStatus.REQUEST_ENTITY_TOO_LARGE),
+        ("non-numeric Content-Length", b"POST /score HTTP/1.1\r\nContent-Length: ten\r\n\r\n{}",
+         HTTPStatus.BAD_REQUEST),
+        ("negative Content-Length", b"POST /score HTTP/1.1\r\nContent-Length: -5\r\n\r\n{}", HTTPStatus.BAD_REQUEST),
+        ("invalid JSON", b"POST /score HTTP/1.1\r\nContent-Length: 5\r\n\r\n{oops", HTTPStatus.BAD_REQUEST),
+        ("JSON array body", b"POST /score HTTP/1.1\r\nContent-Length: 2\r\n\r\n[]", HTTPStatus.BAD_REQUEST),
+        ("malformed request line", b"GARBAGE\r\n\r\n", HTTPStatus.BAD_REQUEST),
+        ("request line too long", b"GET /" + b"a" * 70_000 + b" HTTP/1.1\r\n\r\n", HTTPStatus.BAD_REQUEST),
+        ("header line too long", b"GET /health HTTP/1.1\r\nX-Long: " + b"a" * 70_000 + b"\r\n\r\n",
+         HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE),
+        ("health", b"GET /health HTTP/1.1\r\n\r\n", HTTPStatus.OK)
+    ]
+    failures = []
+    for name, data, expected in cases:
+        status, body = client._call(raw_request(client.server, data))
+        if status != expected:
+            failures.append(f"{name}: expected {int(expected)}, got {int(status)} {body}")
+    return failures
+
+
+def check_bad_input(client) -> list:
+    """Checks the API errors for missing or invalid parameters, unknown routes and missing folders."""
+    cases = [
+        ("score without corpus", "POST", "/score", {"text": "λόγος"}, HTTPStatus.BAD_REQUEST),
+        ("score without text", "POST", "/score", {"corpus": "greek_texts/texts"}, HTTPStatus.BAD_REQUEST),
+        ("missing corpus folder", "POST", "/score", {"corpus": "no/such/folder", "text": "λόγος"},
+         HTTPStatus.NOT_FOUND),
+        ("zero top", "POST", "/score", {"corpus": "greek_texts/texts", "text": "λόγος", "top": 0},
+         HTTPStatus.BAD_REQUEST),
+        ("negative top", "POST", "/score", {"corpus": "greek_texts/texts", "text": "λόγος", "top": -3},
+         HTTPStatus.BAD_REQUEST),
+        ("non-integer top", "POST", "/score", {"corpus": "greek_texts/texts", "text": "λόγος", "top": "ten"},
+         HTTPStatus.BAD_REQUEST),
+        ("non-string text", "POST", "/score", {"corpus": "greek_texts/texts", "text": 5}, HTTPStatus.BAD_REQUEST),
+        ("files not a list", "POST", "/score", {"corpus": "greek_texts/texts", "files": "a.txt"},
+         HTTPStatus.BAD_REQUEST),
+        ("corpora without path", "POST", "/corpora", {}, HTTPStatus.BAD_REQUEST),
+        ("unknown route", "GET", "/nowhere", None, HTTPStatus.NOT_FOUND)
+    ]
+    failures = []
+    for name, method, path, payload, expected in cases:
+        try:
+            client.request(method, path, payload)
+            failures.append(f"{name}: expected {int(expected)}, got 200")
+        except AnalysisServerError as e:
+            if e.status != expected:
+                failures.append(f"{name}: expected {int(expected)}, got {e.status} {e.message}")
+    return failures
+
+
+def run_checks() -> dict:
+    """Runs every check against one in-process server with a queue of one job and one worker.
+
+    Returns:
+    - dict: Check name -> list of failures (empty when the check passed).
+    """
+    with LocalAnalysisClient(AnalysisServer(queue_size=1, concurrency=1)) as client:
+        return {
+            "queue_full": check_queue_full(client),
+            "request_parsing": check_request_parsing(client),
+            "bad_input": check_bad_input(client)
+        }
+
+
+if __name__ == "__main__":
+    results = run_checks()
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    sys.exit(1 if any(results.values()) else 0)
@@ -0,0 +1,87 @@
+# File path: benchmarks/import_time_check.py
+
+""" import_time_check.py
+
+This script measures `import utils` in fresh interpreters against the import-time budget
+(`utils.IMPORT_TIME_BUDGET`) and checks that the import does not load the heavy dependencies.
+
+Functions:
+- measure_import: Times `import utils` in a fresh interpreter with `-X importtime`.
+- run_check: Measures the import several times and compares the fastest run with the budget.
+
+Dependencies:
+- subprocess: For the fresh interpreters.
+- sys: For the running Python executable.
+
+Usage:
+python -m benchmarks.import_time_check [--repeat 5]
+
+Notes:
+- The fastest of the runs is compared with the budget, so a busy machine does not fail the check.
+- Exits with status 1 if the import is over budget or loads one of HEAVY_MODULES.
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+HEAVY_MODULES = ("cltk", "pandas", "matplotlib", "wordcloud", "scipy")  # Must only be imported on first use
+
+
+def measure_import(module="utils") -> dict:
+    """Times the import of a module in a fresh interpreter.
+
+    Parameters:
+    - module (str, optional): The module to import. Defaults to "utils".
+
+    Returns:
+    - dict: 'seconds' (cumulative import time reported by `-X importtime`) and 'heavy_modules' (those of
+      HEAVY_MODULES loaded by the import).
+    """
+    code = (f"import sys, {module}; "
+            f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    # Lines read "import time: <self us> | <cumulative us> | <indented module name>"
+    microseconds = None
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            microseconds = int(fields[1])
+    if microseconds is None:
+        raise RuntimeError(f"no import time reported for {module}: {result.stderr[-500:]}")
+    heavy_modules = [name for name in result.stdout.strip().split(",") if name]
+    return {"seconds": microseconds / 1e6, "heavy_modules": heavy_modules}
+
+
+def run_check(repeat=5) -> dict:
+    """Measures `import utils` `repeat` times and compares the fastest run with IMPORT_TIME_BUDGET.
+
+    Returns:
+    - dict: The budget, every measured time, the fastest, the heavy modules loaded and whether the check passed.
+    """
+    from utils import IMPORT_TIME_BUDGET
+
+    runs = [measure_import() for _ in range(repeat)]
+    fastest = min(run["seconds"] for run in runs)
+    heavy_modules = sorted({name for run in runs for name in run["heavy_modules"]})
+    return {
+        "budget_seconds": IMPORT_TIME_BUDGET,
+        "seconds": [run["seconds"] for run in runs],
+        "fastest_seconds": fastest,
+        "heavy_modules": heavy_modules,
+        "passed": fastest <= IMPORT_TIME_BUDGET and not heavy_modules
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Checks `import utils` against its import-time budget.")
+    parser.add_argument("--repeat", type=int, default=5, help="number of fresh interpreters to time")
+    args = parser.parse_args()
+
+    result = run_check(args.repeat)
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result["passed"] else 1)
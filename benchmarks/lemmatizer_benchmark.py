@@ -0,0 +1,73 @@
+# File path: benchmarks/lemmatizer_benchmark.py
+
+""" lemmatizer_benchmark.py
+
+This micro-benchmark compares the per-token throughput of the compiled lemmatiser with the CLTK
+GreekBackoffLemmatizer chain it was compiled from, and checks that both return the same lemmas.
+
+Functions:
+- corpus_tokens: Cleans and tokenises text files into the tokens the pipeline lemmatises.
+- run_benchmark: Times both lemmatisers on the same tokens and checks that their lemmas are identical.
+
+Dependencies:
+- CLTK: For the backoff lemmatiser.
+- timeit: For timing.
+
+Usage:
+python -m benchmarks.lemmatizer_benchmark [path ...]
+"""
+
+import sys
+import json
+import timeit
+
+from utils import get_all_txt_file_paths, get_data, cleaning_greek_text, get_greek_lemmatizer
+from utils.tokenizer import tokenize_greek
+from utils.lemma_cache import get_model_version
+from utils.compiled_lemmatizer import compile_lemmatizer, verify_compiled_lemmatizer
+
+
+def corpus_tokens(files) -> list:
+    """Returns the tokens of text files as lemmatised by the pipeline (cleaned, normalised, tokenised)."""
+    return [token for file_path in files for token in tokenize_greek(cleaning_greek_text(get_data(file_path)))]
+
+
+def run_benchmark(tokens: list, repeat=5) -> dict:
+    """Times the backoff lemmatiser and its compiled table on the same tokens.
+
+    Parameters:
+    - tokens (list): Tokens to lemmatise.
+    - repeat (int, optional): Number of timed runs; the fastest is reported. Defaults to 5.
+
+    Returns:
+    - dict: Token counts, compile time, table size, seconds and tokens per second for each lemmatiser,
+      and the speed-up.
+
+    Raises:
+    - AssertionError: If the two lemmatisers return different lemmas.
+    """
+    model = get_greek_lemmatizer()
+    compile_seconds = timeit.default_timer()
+    compiled = compile_lemmatizer(model, get_model_version(model))
+    compile_seconds = timeit.default_timer() - compile_seconds
+
+    mismatches = verify_compiled_lemmatizer(compiled, model, tokens)
+    assert not mismatches, f"the compiled lemmatiser differs from the backoff chain: {mismatches[:10]}"
+
+    backoff_seconds = min(timeit.repeat(lambda: model.lemmatize(tokens), number=1, repeat=repeat))
+    compiled_seconds = min(timeit.repeat(lambda: compiled.lemmatize(tokens), number=1, repeat=repeat))
+    return {
+        "tokens": len(tokens),
+        "distinct_tokens": len(set(tokens)),
+        "table_size": len(compiled),
+        "compile_seconds": compile_seconds,
+        "backoff": {"seconds": backoff_seconds, "tokens_per_second": len(tokens) / backoff_seconds},
+        "compiled": {"seconds": compiled_seconds, "tokens_per_second": len(tokens) / compiled_seconds},
+        "speedup": backoff_seconds / compiled_seconds
+    }
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:] or ["greek_texts"]
+    files = [file_path for path in paths for file_path in get_all_txt_file_paths(path)]
+    print(json.dumps(run_benchmark(corpus_tokens(files)), indent=2))
@@ -0,0 +1,347 @@
+# File path: benchmarks/pipeline_benchmark.py
+
+""" pipeline_benchmark.py
+
+This benchmark times each stage of the analysis pipeline of `main` on synthetic corpora of increasing
+size, and reports the time, throughput and peak memory of every stage as JSON for regression tracking.
+
+Stages:
+- discovery: `get_all_txt_file_paths` on the corpus and the analysis group.
+- model_loading: Loading the lemmatiser (once per process, so only the first run pays for it).
+- cleaning: `cleaning_greek_text` on the analysis group.
+- lemmatizing: `lemmatizing_text_cltk` on the cleaned analysis group.
+- word_statistics: `statistical_analysing` and `words_to_objects`.
+- creating_corpus: `creating_corpus` on the corpus.
+- word_search: `word_search` (inverted index) of the analysis words in the corpus.
+- calculate_idf: `calculate_idf` of the analysis words.
+- tfidf_matrix: `TfidfMatrix.from_corpus` and `score_words`, the scoring path used by `main`.
+- sorting: `WordTable.sorted_by('tf_idf')`, the full sort of the saved results.
+- top_k: `WordTable.top(50)`, the ranking printed and charted by `main`.
+- saving: `save_results_to_folder` into a temporary folder.
+
+Each run also times every result writer (CSV, JSON lines, Parquet, Feather, Excel) separately on the same
+words, under 'writers'.
+
+Functions:
+- run_pipeline: Runs and times every stage once on a corpus and an analysis group.
+- time_writers: Times each result writer on the same words.
+- fit_scaling_exponent: Fits seconds ∝ tokens ** exponent over several runs.
+- run_scaling_benchmark: Generates synthetic corpora of several sizes and runs the pipeline on each.
+
+Dependencies:
+- benchmarks.synthetic_corpus: Reproducible synthetic polytonic Greek corpora.
+- utils.instrumentation.RunReport: Stage timers with optional peak memory tracing.
+- utils: The pipeline stages being measured.
+
+Usage:
+python -m benchmarks.pipeline_benchmark --documents 10 100 1000 --tokens 2000 --output bench.json
+
+Notes:
+- Each run uses a fresh cache directory (lemma cache and corpus manifest), so runs measure cold caches
+  unless `--warm-cache` is given.
+- Tracing memory slows Python code down; pass `--no-memory` for timings closer to a normal run.
+  With several workers, only the memory of the main process is traced.
+- Run from the repository root, so the word cloud font in `static/fonts` is found while saving.
+"""
+
+import os
+import sys
+import json
+import math
+import argparse
+import platform
+import tempfile
+import contextlib
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synthetic_corpus import generate_corpus
+from utils import (get_all_txt_file_paths,
+                   get_data,
+                   get_cache_dir,
+                   LemmaCache,
+                   load_text_processors,
+                   cleaning_greek_text,
+                   lemmatizing_text_cltk,
+                   statistical_analysing,
+                   words_to_objects,
+                   creating_corpus,
+                   word_search,
+                   calculate_idf,
+                   TfidfMatrix,
+                   save_results_to_folder,
+                   write_results,
+                   RunReport)
+from utils.result_writers import WRITERS
+from utils.instrumentation import peak_rss_bytes
+from utils import text_processing
+
+
+def _throughput(measurement: dict, items: int, unit: str) -> None:
+    """Adds an item count and the items processed per second to a stage's measurements."""
+    measurement["items"] = items
+    measurement["unit"] = unit
+    measurement["items_per_second"] = items / measurement["seconds"] if measurement["seconds"] else None
+
+
+def _reset_lemma_cache() -> None:
+    """Points the lemma cache at the current cache directory with an empty memory, keeping the model."""
+    current = text_processing.get_lemmatizer()
+    cache_path = None if current.cache_path is None else get_cache_dir() / "lemmas.sqlite"
+    text_processing.lemmatizer = LemmaCache(current.model, cache_path=cache_path, model_version=current.model_version)
+
+
+def time_writers(words, folder, formats) -> dict:
+    """Times each result writer on the same words.
+
+    Parameters:
+    - words (WordTable): The words to write, in output order.
+    - folder (str or Path): Folder the files are written to; created if missing.
+    - formats (iterable): Writer formats, see `utils.result_writers.WRITERS`.
+
+    Returns:
+    - dict: Format -> seconds, file size and rows per second, or the error if the writer is unavailable.
+    """
+    Path(folder).mkdir(parents=True, exist_ok=True)
+    timings = {}
+    for name in formats:
+        try:
+            output = write_results(words, folder, (name,))[name]
+        except ImportError as e:  # Optional dependency not installed
+            timings[name] = {"error": str(e)}
+            continue
+        timings[name] = {
+            "seconds": output["seconds"],
+            "bytes": os.path.getsize(output["path"]),
+            "rows_per_second": len(words) / output["seconds"] if output["seconds"] else None
+        }
+    return timings
+
+
+def run_pipeline(corpus_path, analysis_path, results_folder, workers=1, trace_memory=True, save=True,
+                 writer_formats=tuple(WRITERS)) -> dict:
+    """Runs and times every stage of the pipeline once.
+
+    Parameters:
+    - corpus_path (str): Folder of corpus text files.
+    - analysis_path (str): Folder of analysis text files.
+    - results_folder (str or Path): Folder the results are saved into.
+    - workers (int or None, optional): Number of processes used to lemmatise the corpus. Defaults to 1.
+    - trace_memory (bool, optional): Whether to trace the peak memory of each stage. Defaults to True.
+    - save (bool, optional): Whether to time saving the results. Defaults to True.
+    - writer_formats (iterable, optional): Result writers timed separately. Defaults to every writer.
+
+    Returns:
+    - dict: Stage name -> seconds, peak memory and throughput, the writer timings, and the corpus and
+      lemma cache sizes.
+
+    Raises:
+    - AssertionError: If `word_search` and `calculate_idf` disagree with `TfidfMatrix.score_words`.
+    """
+    report = RunReport(trace_memory=trace_memory)
+
+    with report.stage("discovery") as stage:
+        corpus_files = get_all_txt_file_paths(corpus_path)
+        analysis_files = get_all_txt_file_paths(analysis_path)
+    _throughput(stage, len(corpus_files) + len(analysis_files), "files")
+
+    with report.stage("model_loading"):
+        load_text_processors()
+    cache_before = text_processing.lemmatizer.stats()
+
+    text = '\n'.join(get_data(file_path) for file_path in analysis_files)
+    with report.stage("cleaning") as stage:
+        cleaned = cleaning_greek_text(text)
+    _throughput(stage, len(text), "characters")
+
+    with report.stage("lemmatizing") as stage:
+        lemmatized = lemmatizing_text_cltk(cleaned)
+    tokens = lemmatized.split()
+    _throughput(stage, len(tokens), "tokens")
+    cache_after = text_processing.lemmatizer.stats()
+
+    with report.stage("word_statistics") as stage:
+        words = words_to_objects(statistical_analysing(lemmatized))
+    _throughput(stage, len(tokens), "tokens")
+
+    with report.stage("creating_corpus") as stage:
+        corpus, total_number_of_txt_files = creating_corpus(corpus_path, workers=workers)
+    _throughput(stage, corpus.token_count(), "tokens")
+
+    with report.stage("word_search") as stage:
+        word_search(corpus, words)
+    _throughput(stage, len(words), "words")
+
+    with report.stage("calculate_idf") as stage:
+        calculate_idf(total_number_of_txt_files, words)
+    _throughput(stage, len(words), "words")
+    legacy_scores = words.tf_idf.copy()
+
+    with report.stage("tfidf_matrix") as stage:
+        TfidfMatrix.from_corpus(corpus).score_words(words, total_number_of_txt_files)
+    _throughput(stage, corpus.token_count(), "tokens")
+    assert np.array_equal(legacy_scores, words.tf_idf), "word_search/calculate_idf differ from score_words"
+
+    with report.stage("sorting") as stage:
+        sorted_words = words.sorted_by('tf_idf')
+    _throughput(stage, len(words), "words")
+
+    with report.stage("top_k") as stage:
+        assert words.top(50).word == sorted_words[:50].word, "top-k differs from the full sort"
+    _throughput(stage, len(words), "words")
+
+    if save:
+        with report.stage("saving") as stage:
+            save_results_to_folder(words, sorted_words, corpus_path, corpus_files, analysis_path, analysis_files,
+                                   save_results=True, results_folder=results_folder)
+        _throughput(stage, len(words), "words")
+    writers = time_writers(sorted_words, Path(results_folder) / "writers", writer_formats)
+
+    stages = report.to_dict()["stages"]
+    return {
+        "corpus": {
+            "files": len(corpus_files),
+            "bytes": sum(os.path.getsize(file_path) for file_path in corpus_files),
+            "tokens": corpus.token_count(),
+            "vocabulary": len(corpus.vocabulary)
+        },
+        "analysis": {
+            "files": len(analysis_files),
+            "characters": len(text),
+            "tokens": len(tokens),
+            "distinct_words": len(words)
+        },
+        "lemma_cache": {key: cache_after[key] - cache_before[key] for key in ("hits", "disk_hits", "misses")},
+        "stages": stages,
+        "writers": writers,
+        "total_seconds": sum(stage["seconds"] for stage in stages.values())
+    }
+
+
+def fit_scaling_exponent(sizes: list, seconds: list):
+    """Fits seconds ∝ size ** exponent by least squares on a log-log scale.
+
+    Returns:
+    - float or None: The exponent (1.0 is linear scaling), or None with fewer than two usable points.
+    """
+    points = [(math.log(size), math.log(second)) for size, second in zip(sizes, seconds) if size > 0 and second > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if not spread:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def run_scaling_benchmark(documents=(10, 100), tokens_per_document=2000, vocabulary_size=20000, zipf_exponent=1.1,
+                          marker_rate=0.02, analysis_documents=5, seed=0, workers=1, trace_memory=True, save=True,
+                          warm_cache=False, work_dir=None, writer_formats=tuple(WRITERS)) -> dict:
+    """Generates synthetic corpora of several sizes and runs the timed pipeline on each.
+
+    Parameters:
+    - documents (iterable, optional): Corpus sizes, in documents, one run each. Defaults to (10, 100).
+    - tokens_per_document (int, optional): Mean words per document. Defaults to 2000.
+    - vocabulary_size (int, optional): Distinct word forms of the synthetic vocabulary. Defaults to 20,000.
+    - zipf_exponent (float, optional): Zipf skew of the word distribution. Defaults to 1.1.
+    - marker_rate (float, optional): Probability of an editorial marker after each word. Defaults to 0.02.
+    - analysis_documents (int, optional): Documents in the analysis group. Defaults to 5.
+    - seed (int, optional): Seed of the generated texts. Defaults to 0.
+    - workers (int or None, optional): Number of processes used to lemmatise the corpus. Defaults to 1.
+    - trace_memory (bool, optional): Whether to trace the peak memory of each stage. Defaults to True.
+    - save (bool, optional): Whether to time saving the results. Defaults to True.
+    - warm_cache (bool, optional): Whether runs share one cache directory instead of starting cold.
+    - work_dir (str or Path, optional): Folder for the corpora, caches and results. Defaults to a temporary
+      folder that is removed afterwards.
+    - writer_formats (iterable, optional): Result writers timed separately. Defaults to every writer.
+
+    Returns:
+    - dict: The configuration, the environment, one entry per run and, per stage, the scaling curve
+      (corpus tokens, seconds) with its fitted exponent. Model loading is left out of the curves.
+    """
+    config = {
+        "documents": list(documents),
+        "tokens_per_document": tokens_per_document,
+        "vocabulary_size": vocabulary_size,
+        "zipf_exponent": zipf_exponent,
+        "marker_rate": marker_rate,
+        "analysis_documents": analysis_documents,
+        "seed": seed,
+        "workers": workers,
+        "trace_memory": trace_memory,
+        "warm_cache": warm_cache,
+        "writer_formats": list(writer_formats)
+    }
+    generator_options = dict(tokens_per_document=tokens_per_document, vocabulary_size=vocabulary_size,
+                             zipf_exponent=zipf_exponent, marker_rate=marker_rate)
+
+    with contextlib.ExitStack() as stack:
+        if work_dir is None:
+            work_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="tfidf_greek_bench_"))
+        work_dir = Path(work_dir)
+        previous_cache = os.environ.get("TFIDF_GREEK_CACHE")
+        stack.callback(lambda: os.environ.__setitem__("TFIDF_GREEK_CACHE", previous_cache) if previous_cache
+                       else os.environ.pop("TFIDF_GREEK_CACHE", None))
+
+        analysis_path = work_dir / "analysis"
+        generate_corpus(analysis_path, documents=analysis_documents, seed=seed + 1, **generator_options)
+
+        runs = []
+        for number_of_documents in documents:
+            corpus_path = work_dir / f"corpus_{number_of_documents}"
+            generate_corpus(corpus_path, documents=number_of_documents, seed=seed, **generator_options)
+
+            os.environ["TFIDF_GREEK_CACHE"] = str(work_dir / ("cache" if warm_cache else f"cache_{number_of_documents}"))
+            if text_processing.lemmatizer is not None:
+                _reset_lemma_cache()
+
+            run = run_pipeline(str(corpus_path), str(analysis_path), work_dir / f"results_{number_of_documents}",
+                               workers=workers, trace_memory=trace_memory, save=save,
+                               writer_formats=writer_formats)
+            run["documents"] = number_of_documents
+            runs.append(run)
+
+    scaling = {}
+    for name in runs[0]["stages"] if runs else ():
+        if name == "model_loading":  # Paid by the first run only
+            continue
+        sizes = [run["corpus"]["tokens"] for run in runs]
+        seconds = [run["stages"][name]["seconds"] for run in runs]
+        scaling[name] = {"corpus_tokens": sizes, "seconds": seconds, "exponent": fit_scaling_exponent(sizes, seconds)}
+
+    environment = {"python_version": sys.version.split()[0], "platform": platform.platform(),
+                   "cpu_count": os.cpu_count(), "peak_rss_bytes": peak_rss_bytes()}
+
+    return {"config": config, "environment": environment, "runs": runs, "scaling": scaling}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Times each pipeline stage on synthetic Greek corpora.")
+    parser.add_argument("--documents", type=int, nargs="+", default=[10, 100], help="corpus sizes, in documents")
+    parser.add_argument("--tokens", type=int, default=2000, help="mean words per document")
+    parser.add_argument("--vocabulary", type=int, default=20000, help="distinct word forms")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of the word distribution")
+    parser.add_argument("--markers", type=float, default=0.02, help="editorial markers per word")
+    parser.add_argument("--analysis-documents", type=int, default=5, help="documents in the analysis group")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="0 uses every CPU")
+    parser.add_argument("--no-memory", action="store_true", help="do not trace peak memory")
+    parser.add_argument("--no-save", action="store_true", help="do not time saving the results")
+    parser.add_argument("--warm-cache", action="store_true", help="share the lemma cache between runs")
+    parser.add_argument("--work-dir", help="keep the corpora, caches and results in this folder")
+    parser.add_argument("--formats", nargs="*", default=list(WRITERS), help="result writers to time")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(sys.stderr):  # Keep progress messages out of the JSON report
+        report = run_scaling_benchmark(args.documents, args.tokens, args.vocabulary, args.zipf, args.markers,
+                                       args.analysis_documents, args.seed, args.workers or None,
+                                       not args.no_memory, not args.no_save, args.warm_cache, args.work_dir,
+                                       args.formats)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,186 @@
+# File path: benchmarks/synthetic_corpus.py
+
+""" synthetic_corpus.py
+
+This module generates reproducible synthetic corpora of polytonic Ancient Greek text for benchmarking.
+Words are built from Greek syllables with breathings and accents, drawn from a Zipf-distributed
+vocabulary, and interleaved with the punctuation, quotation marks, line numbers and editorial markers
+(`col12`, `±3`, `[...]`, supplements in brackets, `†`, `⏑`, `–`) found in the bundled editions.
+
+Functions:
+- build_vocabulary: Builds a list of distinct synthetic Greek word forms.
+- zipf_cumulative_weights: Returns the cumulative Zipf weights of a vocabulary.
+- generate_document: Generates the text of one synthetic document.
+- generate_corpus: Writes a folder of synthetic `.txt` documents.
+
+Dependencies:
+- random: Seeded generators make every corpus reproducible.
+- itertools.accumulate: For the cumulative Zipf weights.
+- pathlib: For creating the output folder.
+- utils.tokenizer.GRAVE_TO_ACUTE: Final acute accents become grave before another word, as in the texts.
+
+Usage:
+>>> paths = generate_corpus("bench/corpus", documents=100, tokens_per_document=2000, zipf_exponent=1.1)
+
+Notes:
+- The same parameters always produce the same files. The vocabulary depends only on `vocabulary_size`
+  and `vocabulary_seed`, so a corpus and an analysis group generated with different `seed` values share
+  their word forms.
+"""
+
+import random
+from pathlib import Path
+from itertools import accumulate
+from utils.tokenizer import GRAVE_TO_ACUTE
+
+ONSETS = ["", "β", "γ", "δ", "ζ", "θ", "κ", "λ", "μ", "ν", "ξ", "π", "ρ", "σ", "τ", "φ", "χ", "ψ",
+          "στ", "πρ", "κλ", "θρ", "χρ", "τρ", "γν", "σπ"]
+VOWELS = ["α", "ε", "η", "ι", "ο", "υ", "ω", "αι", "ει", "οι", "ου", "αυ", "ευ"]
+CODAS = ["", "", "", "", "σ", "ν", "ρ"]
+ENDINGS = ["ς", "ς", "ν", "ν", ""]
+
+ACUTE = dict(zip("αεηιουω", "άέήίόύώ"))
+CIRCUMFLEX = dict(zip("αηιυω", "ᾶῆῖῦῶ"))
+SMOOTH_BREATHING = dict(zip("αεηιουω", "ἀἐἠἰὀὐὠ"))
+ROUGH_BREATHING = dict(zip("αεηιουω", "ἁἑἡἱὁὑὡ"))
+ACUTE_TO_GRAVE = {acute: grave for grave, acute in GRAVE_TO_ACUTE.items()}
+
+PUNCTUATION_MARKS = [",", "·", ".", ";"]
+EDITORIAL_MARKERS = ["±{n}", "[...]", "[.....]", "†", "⏑", "–"]
+
+
+def _accented(vowel: str, rng: random.Random) -> str:
+    """Accents a vowel or diphthong (on its second vowel), with a circumflex where possible."""
+    head, tail = vowel[:-1], vowel[-1]
+    if tail in CIRCUMFLEX and rng.random() < 0.3:
+        return head + CIRCUMFLEX[tail]
+    return head + ACUTE[tail]
+
+
+def _make_word(rng: random.Random) -> str:
+    """Builds one word of one to four syllables with a breathing on an initial vowel and one accent."""
+    syllable_count = rng.choice((1, 2, 2, 3, 3, 3, 4))
+    accented = syllable_count - 1 - rng.randrange(min(3, syllable_count))  # One of the last three syllables
+    syllables = []
+    for position in range(syllable_count):
+        onset = rng.choice(ONSETS) if position else rng.choice(ONSETS + ONSETS[1:])
+        vowel = rng.choice(VOWELS)
+        if position == accented:
+            vowel = _accented(vowel, rng)
+        if position == 0 and not onset and vowel[0] in SMOOTH_BREATHING:
+            breathing = ROUGH_BREATHING if rng.random() < 0.3 else SMOOTH_BREATHING
+            vowel = breathing[vowel[0]] + vowel[1:]
+        coda = rng.choice(ENDINGS) if position == syllable_count - 1 else rng.choice(CODAS)
+        syllables.append(onset + vowel + coda)
+    return "".join(syllables)
+
+
+def build_vocabulary(size: int, seed: int = 0) -> list:
+    """Builds a list of distinct synthetic Greek word forms.
+
+    Parameters:
+    - size (int): Number of distinct word forms.
+    - seed (int, optional): Seed of the generator. Defaults to 0.
+
+    Returns:
+    - list: The word forms, most frequent rank first.
+    """
+    rng = random.Random(seed)
+    vocabulary = []
+    seen = set()
+    while len(vocabulary) < size:
+        word = _make_word(rng)
+        if word not in seen:
+            seen.add(word)
+            vocabulary.append(word)
+    return vocabulary
+
+
+def zipf_cumulative_weights(size: int, exponent: float) -> list:
+    """Returns the cumulative weights 1 / rank ** exponent of `size` ranks, for `random.choices`."""
+    return list(accumulate(1 / rank ** exponent for rank in range(1, size + 1)))
+
+
+def generate_document(rng: random.Random, vocabulary: list, cumulative_weights: list, tokens: int,
+                      marker_rate: float = 0.02, column: int = 1) -> str:
+    """Generates the text of one synthetic document.
+
+    Parameters:
+    - rng (random.Random): The seeded generator.
+    - vocabulary (list): Word forms, most frequent rank first.
+    - cumulative_weights (list): Cumulative Zipf weights of the vocabulary.
+    - tokens (int): Number of words in the document.
+    - marker_rate (float, optional): Probability of an editorial marker after each word. Defaults to 0.02.
+    - column (int, optional): Number of the `colN` marker opening the document. Defaults to 1.
+
+    Returns:
+    - str: Lines of 6 to 10 words, numbered every fifth line like the bundled papyri.
+    """
+    words = rng.choices(vocabulary, cum_weights=cumulative_weights, k=tokens)
+    lines = []
+    line = [f"(col{column})"]
+    line_length = rng.randint(6, 10)
+    for position, word in enumerate(words):
+        roll = rng.random()
+        if roll < marker_rate / 2:  # Supplement in brackets inside the word, e.g. [ἕκ]αστον
+            cut = rng.randint(1, len(word))
+            word = f"[{word[:cut]}]{word[cut:]}"
+        elif roll < 0.04:
+            word = f"‘{word}’"
+        elif word[-1] in ACUTE_TO_GRAVE and position + 1 < len(words) and rng.random() < 0.8:
+            word = word[:-1] + ACUTE_TO_GRAVE[word[-1]]  # Final acute becomes grave before another word
+
+        if rng.random() < 0.12:
+            word += rng.choice(PUNCTUATION_MARKS)
+        line.append(word)
+        if rng.random() < marker_rate / 2:
+            line.append(rng.choice(EDITORIAL_MARKERS).format(n=rng.randint(1, 12)))
+
+        if len(line) >= line_length:
+            if (len(lines) + 1) % 5 == 0:
+                line.append(f"  ({len(lines) + 1})")
+            lines.append(" ".join(line))
+            line = []
+            line_length = rng.randint(6, 10)
+    if line:
+        lines.append(" ".join(line))
+    return "\n".join(lines) + "\n"
+
+
+def generate_corpus(output_dir, documents=100, tokens_per_document=2000, vocabulary_size=20000,
+                    zipf_exponent=1.1, marker_rate=0.02, seed=0, vocabulary_seed=0) -> list:
+    """Writes a folder of synthetic polytonic Greek documents.
+
+    Parameters:
+    - output_dir (str or Path): Folder to write into; created if missing.
+    - documents (int, optional): Number of documents. Defaults to 100.
+    - tokens_per_document (int, optional): Mean number of words per document; lengths vary uniformly
+      between half and one and a half times this value. Defaults to 2000.
+    - vocabulary_size (int, optional): Number of distinct word forms. Defaults to 20,000.
+    - zipf_exponent (float, optional): Skew of the word distribution; higher values concentrate the
+      text on fewer forms. Defaults to 1.1.
+    - marker_rate (float, optional): Probability of an editorial marker after each word. Defaults to 0.02.
+    - seed (int, optional): Seed of the document texts. Defaults to 0.
+    - vocabulary_seed (int, optional): Seed of the word forms. Defaults to 0.
+
+    Returns:
+    - list: Paths of the written `.txt` files, in order.
+
+    Example:
+    >>> generate_corpus("bench/corpus", documents=10, tokens_per_document=500)[:2]
+    ['bench/corpus/doc00000.txt', 'bench/corpus/doc00001.txt']
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    vocabulary = build_vocabulary(vocabulary_size, vocabulary_seed)
+    cumulative_weights = zipf_cumulative_weights(vocabulary_size, zipf_exponent)
+    rng = random.Random(seed)
+
+    file_paths = []
+    for document in range(documents):
+        tokens = rng.randint(max(1, tokens_per_document // 2), max(1, tokens_per_document * 3 // 2))
+        text = generate_document(rng, vocabulary, cumulative_weights, tokens, marker_rate, column=document + 1)
+        file_path = output_dir / f"doc{document:05d}.txt"
+        file_path.write_text(text, encoding="utf-8")
+        file_paths.append(str(file_path))
+    return file_paths
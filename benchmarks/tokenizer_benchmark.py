@@ -0,0 +1,129 @@
+# File path: benchmarks/tokenizer_benchmark.py
+
+""" tokenizer_benchmark.py
+
+This micro-benchmark compares the per-token throughput of `tokenize_greek` with the tokenisation
+code path it replaced in `lemmatizing_text_cltk` (CLTK punctuation splitting, a GreekNormalizeProcess
+run, four `re.sub` calls, a per-token punctuation regex and per-token grave accent replacement).
+
+Functions:
+- legacy_replace_grave_with_acute: The previous per-token accent replacement (one str.replace per vowel).
+- legacy_tokenize: The previous tokenisation code path, kept for comparison.
+- run_benchmark: Times both code paths on the same text and checks that their tokens are identical.
+
+Dependencies:
+- CLTK: For the punctuation helpers and the normaliser used by the previous code path.
+- timeit: For timing.
+
+Usage:
+python -m benchmarks.tokenizer_benchmark [path ...]
+
+Notes:
+- Both code paths receive the same input, the output of `cleaning_greek_text`, as in the pipeline;
+  cleaning itself is not timed.
+"""
+
+import re
+import sys
+import json
+import string
+import timeit
+from cltk.core.data_types import Doc
+from cltk.alphabet.processes import GreekNormalizeProcess
+from cltk.alphabet.text_normalization import split_leading_punct, split_trailing_punct, remove_odd_punct
+
+from utils import get_all_txt_file_paths, get_data, cleaning_greek_text
+from utils.tokenizer import tokenize_greek
+
+# Accent map of the previous code path
+LEGACY_GRAVE_TO_ACUTE = {
+    'ὰ': 'ά',
+    'ὲ': 'έ',
+    'ὴ': 'ή',
+    'ὶ': 'ί',
+    'ὺ': 'ύ',
+    'ὸ': 'ό',
+    'ὼ': 'ώ'
+}
+_legacy_normalize_proc = None
+
+
+def legacy_replace_grave_with_acute(word: str) -> str:
+    """Replaces grave-accented vowels as the previous `replace_grave_with_acute` did."""
+    for grave, acute in LEGACY_GRAVE_TO_ACUTE.items():
+        word = word.replace(grave, acute)
+    return word
+
+
+def legacy_tokenize(text: str) -> list:
+    """Tokenises text exactly as `lemmatizing_text_cltk` did before `tokenize_greek` was introduced."""
+    global _legacy_normalize_proc
+    if _legacy_normalize_proc is None:
+        _legacy_normalize_proc = GreekNormalizeProcess(language="grc")
+
+    custom_punctuation = string.punctuation + "·«»⟦⟧…"
+
+    # Initial punctuation handling
+    text = split_trailing_punct(text, punctuation=list(custom_punctuation))
+    text = split_leading_punct(text, punctuation=list(custom_punctuation))
+    text = remove_odd_punct(text)
+
+    # Normalize the text for Ancient Greek
+    non_normed_doc = Doc(raw=text)
+    normalized_doc = _legacy_normalize_proc.run(input_doc=non_normed_doc)
+    normalized_text = normalized_doc.raw
+
+    # Remove editorial markers
+    normalized_text = re.sub(r'col\d+', '', normalized_text)
+    normalized_text = re.sub(r'±\d+', '', normalized_text)
+    normalized_text = re.sub(r'\[.*?\]', '', normalized_text)
+    normalized_text = re.sub(r'[⏑–†]', '', normalized_text)
+
+    # Tokenise and clean tokens
+    tokenized_text = normalized_text.split()
+    tokens_cleaned = []
+    for t in tokenized_text:
+        t = re.sub(rf'^[{re.escape(custom_punctuation)}]+|[{re.escape(custom_punctuation)}]+$', '', t)
+        t = legacy_replace_grave_with_acute(t)
+        if t:
+            tokens_cleaned.append(t)
+    return tokens_cleaned
+
+
+def run_benchmark(text: str, repeat=5) -> dict:
+    """Times the previous and the current tokeniser on a text.
+
+    Parameters:
+    - text (str): Text to tokenise, as produced by `cleaning_greek_text`.
+    - repeat (int, optional): Number of timed runs; the fastest is reported. Defaults to 5.
+
+    Returns:
+    - dict: Token count, seconds and tokens per second for each code path, and the speed-up.
+
+    Raises:
+    - AssertionError: If the two code paths produce different tokens.
+    """
+    tokens = tokenize_greek(text)
+    legacy_tokens = legacy_tokenize(text)
+    if tokens != legacy_tokens:
+        position = next((i for i, (a, b) in enumerate(zip(tokens, legacy_tokens)) if a != b),
+                        min(len(tokens), len(legacy_tokens)))
+        raise AssertionError(f"tokenize_greek differs from the previous code path at token {position}: "
+                             f"{tokens[position:position + 5]} != {legacy_tokens[position:position + 5]}")
+
+    legacy_seconds = min(timeit.repeat(lambda: legacy_tokenize(text), number=1, repeat=repeat))
+    current_seconds = min(timeit.repeat(lambda: tokenize_greek(text), number=1, repeat=repeat))
+    return {
+        "tokens": len(tokens),
+        "legacy": {"seconds": legacy_seconds, "tokens_per_second": len(tokens) / legacy_seconds},
+        "tokenize_greek": {"seconds": current_seconds, "tokens_per_second": len(tokens) / current_seconds},
+        "speedup": legacy_seconds / current_seconds
+    }
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:] or ["greek_texts"]
+    files = [file_path for path in paths for file_path in get_all_txt_file_paths(path)]
+    cleaned = cleaning_greek_text('\n'.join(get_data(file_path) for file_path in files))  # Same input for both paths
+    sample = '\n'.join([cleaned] * 20)  # Repeat the small bundled corpus
+    print(json.dumps(run_benchmark(sample), indent=2))
@@ -6,32 +6,52 @@ This script analyses a corpus of text files to perform text cleaning, corpus cre
 
 Functions:
 - main: The main function that handles the workflow of text analysis.
+- main_batch: Analyses several groups against the same corpus, building the corpus only once.
 
 Modules:
 - utils: Contains helper functions including:
   - get_all_txt_file_paths: Retrieves all .txt file paths from a directory.
   - text_cleaning_lemmas: Cleans and processes text files into lemmas.
+  - get_analysis_groups: Resolves the analysis groups of a batch run.
+  - process_analysis_groups: Cleans and processes several analysis groups in parallel.
   - creating_corpus: Creates a corpus of texts and counts total .txt files.
-  - word_search: Performs word searching in a given corpus.
-  - calculate_idf: Calculates the IDF (Inverse Document Frequency) of words.
+  - TfidfMatrix: Sparse document-term TF-IDF engine; scores the analysis words against the corpus.
+  - calculate_idf: Scores the analysis words against a document-frequency table.
+  - DocumentFrequencyTable, corpus_fingerprint: Persisted document frequencies of a reference corpus.
   - generate_visualisations: Generates visualisations for word analysis results.
   - save_results_to_folder: Saves analysis results to specified folders.
+  - RenderExecutor: Renders the saved figures in background processes.
+  - get_lemmatizer: Loads the lemmatiser and its lemma cache.
+  - RunReport: Stage timers, optional profiling and counters emitted as a JSON run report.
+  - check_formats: Validates the requested result formats before any work is done.
 
 Usage:
 Run as a standalone script to process Greek texts for analysis.
 """
 
 # Import required functions from utils.py
+import os
+from datetime import datetime
 from utils import (get_all_txt_file_paths,
                    text_cleaning_lemmas,
+                   get_analysis_groups,
+                   process_analysis_groups,
                    creating_corpus,
-                   word_search,
+                   TfidfMatrix,
                    calculate_idf,
+                   DocumentFrequencyTable,
+                   corpus_fingerprint,
+                   get_lemmatizer,
                    generate_visualisations,
-                   save_results_to_folder)
+                   save_results_to_folder,
+                   RenderExecutor,
+                   RunReport,
+                   check_formats)
 
 
-def main(corpus_path, analysis_path, visualisations=True, save_results=False):
+def main(corpus_path, analysis_path, visualisations=True, save_results=False, incremental=False, workers=1,
+         profile=False, trace_memory=False, report_path=None, df_table=None, save_df_table=None, formats=("csv",),
+         corpus_store=None, extensionless=True):
     """ Main function for text analysis pipeline.
 
     Parameters:
@@ -39,48 +59,236 @@ def main(corpus_path, analysis_path, visualisations=True, save_results=False):
     - analysis_path (str): Path to the folder containing analysis text files.
     - visualisations (bool): Whether to generate visualisations. Default is True.
     - save_results (bool): Whether to save the analysis results. Default is False.
+    - incremental (bool): Whether to only re-process corpus files changed since the last run. Default is False.
+    - workers (int or None): Number of processes used to lemmatise the corpus. Default is 1, None uses every CPU.
+    - profile (bool): Whether to capture a cProfile profile of each stage in the run report. Default is False.
+    - trace_memory (bool): Whether to record the peak memory of each stage in the run report. Default is False.
+    - report_path (str, optional): File the JSON run report is written to. Default is None.
+    - df_table (str or DocumentFrequencyTable, optional): Document-frequency table (or its `.npz` file) to
+      score against instead of the corpus; `corpus_path` may then be None. Default is None.
+    - save_df_table (str, optional): File the document-frequency table of the corpus is written to. Default is None.
+    - formats (str or tuple): Formats of the saved word statistics: 'csv', 'jsonl', 'parquet', 'feather'
+      and/or 'excel'. Default is ('csv',).
+    - corpus_store (str, optional): Directory of a memory-mapped corpus store, reused while the corpus files
+      are unchanged and rebuilt otherwise. Default is None (the corpus is held in memory).
+    - extensionless (bool): Whether files without an extension are corpus and analysis texts, besides `.txt`
+      files. Default is True; False only reads `.txt` files.
+
+    Returns:
+    - RunReport: Stage timings and counters (files, bytes, tokens, lemmas, cache hits) of the run.
+
+    Raises:
+    - ValueError: If a format in `formats` is unknown; checked before any file is read.
 
     Workflow:
     1. Retrieves text file paths for corpus and analysis.
-    2. Cleans and processes the analysis files into lemmas.
-    3. Creates a text corpus and counts the total number of text files.
-    4. Performs word searches within the corpus.
-    5. Calculates the IDF of words in the analysis.
-    6. Sorts words based on TF-IDF scores.
-    7. Prints the top 50 words with the highest TF-IDF scores.
-    8. Optionally generates visualisations and saves results.
+    2. Loads the lemmatiser.
+    3. Cleans and processes the analysis files into lemmas.
+    4. Creates a text corpus and counts the total number of text files, or loads the document-frequency table.
+    5. Builds the sparse document-term matrix of the corpus (skipped with a document-frequency table).
+    6. Calculates the document frequency, IDF and TF-IDF of words in the analysis.
+    7. Ranks the top 50 words by TF-IDF score, without sorting the whole vocabulary.
+    8. Prints the top 50 words with the highest TF-IDF scores.
+    9. Optionally generates visualisations and saves results, with the run report in `metadata.yaml`
+       and `run_report.json`.
+
+    Notes:
+    - Every step runs inside a stage of the run report. Lemma cache counters only cover lookups made in
+      this process, not those of corpus worker processes.
+    - Saved figures are rendered by background processes; the 'rendering' stage is the time spent waiting
+      for them after the other results were written.
+    - With `df_table` and a `corpus_path`, a warning is printed if the corpus files changed since the
+      table was built.
     """
+    formats = check_formats(formats)  # Fail before the corpus run, not after it
+    report = RunReport(profile=profile, trace_memory=trace_memory)
+
     # Step 1: Retrieve file paths
-    corpus_files = get_all_txt_file_paths(corpus_path)  # List of corpus text files
-    analysis_files = get_all_txt_file_paths(analysis_path)  # List of analysis files
+    with report.stage("discovery"):
+        corpus_files = (get_all_txt_file_paths(corpus_path, extensionless=extensionless)
+                        if corpus_path is not None else [])  # Corpus text files
+        analysis_files = get_all_txt_file_paths(analysis_path, extensionless=extensionless)  # List of analysis files
+    report.count_files("corpus", corpus_files)
+    report.count_files("analysis", analysis_files)
 
-    # Step 2: Clean and process analysis files
-    x = text_cleaning_lemmas(analysis_files)
+    # Step 2: Load the lemmatiser
+    with report.stage("model_loading"):
+        lemmatizer = get_lemmatizer()
+    cache_before = lemmatizer.stats()
 
-    # Step 3: Create corpus and count text files
-    corpus_texts, total_number_of_txt_files = creating_corpus(corpus_path)
+    # Step 3: Clean and process analysis files
+    with report.stage("analysis_lemmatizing"):
+        x = text_cleaning_lemmas(analysis_files)
+    report.count("analysis_tokens", x.raw_count.sum())
+    report.count("analysis_lemmas", len(x))
 
-    # Step 4: Perform word search within corpus
-    word_search(corpus_texts, x)
+    if df_table is not None:
+        # Step 4: Load the document-frequency table instead of the corpus
+        with report.stage("df_table_loading"):
+            table = df_table if isinstance(df_table, DocumentFrequencyTable) else DocumentFrequencyTable.load(df_table)
+            if corpus_files and not table.matches(corpus_fingerprint(corpus_files, corpus_path,
+                                                                     lemmatizer.model_version)):
+                print("Warning: the document-frequency table was not built from the current corpus files.")
+        corpus_files = corpus_files or table.files
+        report.count("corpus_lemmas", len(table))
 
-    # Step 5: Calculate IDF for words
-    calculate_idf(total_number_of_txt_files, x)
+        # Step 6: Calculate IDF and TF-IDF for words from the table
+        with report.stage("scoring"):
+            calculate_idf(None, x, df_table=table)
+    else:
+        # Step 4: Create corpus and count text files
+        with report.stage("creating_corpus"):
+            corpus, total_number_of_txt_files = creating_corpus(corpus_path, incremental=incremental, workers=workers,
+                                                                report=report, df_table_path=save_df_table,
+                                                                store_path=corpus_store, files=corpus_files)
+        report.count("corpus_tokens", corpus.token_count())
+        report.count("corpus_lemmas", len(corpus.vocabulary))
 
-    # Step 6: Sort words by TF-IDF score
-    sorted_words = sorted(x, key=lambda word_obj: word_obj.tf_idf, reverse=True)
+        # Step 5: Build the document-term matrix of the corpus
+        with report.stage("document_term_matrix"):
+            engine = TfidfMatrix.from_corpus(corpus)
 
-    # Step 7: Print top 50 words for reference
-    for word in sorted_words[:50]:
+        # Step 6: Calculate document frequency, IDF and TF-IDF for words
+        with report.stage("scoring"):
+            engine.score_words(x, total_number_of_txt_files)
+    report.count_changes("lemma_cache", cache_before, lemmatizer.stats(), ("hits", "disk_hits", "misses"))
+
+    # Step 7: Rank the top 50 words by TF-IDF score; every word is only sorted for the saved results
+    with report.stage("sorting"):
+        top_words = x.top(50)
+
+    # Step 8: Print top 50 words for reference
+    for word in top_words:
         print(f'Word: {word.word}, score: {word.tf_idf}')
 
-    # Step 8: Generate visualisations if requested
+    # Step 9: Generate visualisations if requested; the rendered figures are reused when saving
+    figures = None
     if visualisations:
-        generate_visualisations(sorted_words)
+        with report.stage("visualisations"):
+            figures = generate_visualisations(x)
 
-    # Step 9: Save results if requested
+    # Step 10: Save results if requested
+    # Figures not rendered yet are rendered by background processes while the word statistics are written
     if save_results:
-        save_results_to_folder(x, sorted_words, corpus_path, corpus_files, analysis_path, analysis_files,
-                               save_results=True)
+        with RenderExecutor() as renderer:
+            with report.stage("saving"):
+                results_folder = save_results_to_folder(x, x, corpus_path, corpus_files, analysis_path,
+                                                        analysis_files, save_results=True, run_report=report,
+                                                        formats=formats, figures=figures, render_executor=renderer)
+            with report.stage("rendering"):
+                renderer.join()  # Waits for the figures still being rendered
+        report.save(results_folder / "run_report.json")
+    if figures is not None:
+        figures.close()
+    if report_path:
+        report.save(report_path)
+
+    return report
+
+
+def main_batch(corpus_path, analysis_paths, visualisations=False, save_results=True, incremental=False, workers=1,
+               profile=False, trace_memory=False, report_path=None, formats=("csv",), corpus_store=None,
+               extensionless=True):
+    """ Analyses several groups against one corpus in a single corpus pass.
+
+    Parameters:
+    - corpus_path (str): Path to the folder containing corpus text files.
+    - analysis_paths (str or list): List of analysis group folders, or a parent folder whose subfolders are the groups.
+    - visualisations (bool): Whether to generate visualisations for each group. Default is False.
+    - save_results (bool): Whether to save one result set per group. Default is True.
+    - incremental (bool): Whether to only re-process corpus files changed since the last run. Default is False.
+    - workers (int or None): Number of processes used to lemmatise the corpus and the groups. Default is 1,
+      None uses every CPU.
+    - profile (bool): Whether to capture a cProfile profile of each stage in the run report. Default is False.
+    - trace_memory (bool): Whether to record the peak memory of each stage in the run report. Default is False.
+    - report_path (str, optional): File the JSON run report is written to. Default is None.
+    - formats (str or tuple): Formats of each group's saved word statistics (see `main`). Default is ('csv',).
+    - corpus_store (str, optional): Directory of a memory-mapped corpus store (see `main`). Default is None.
+    - extensionless (bool): Whether files without an extension are texts (see `main`). Default is True.
+
+    Returns:
+    - RunReport: Stage timings and counters of the whole batch; per-group stages accumulate over the groups.
+
+    Raises:
+    - ValueError: If a format in `formats` is unknown; checked before any file is read.
+
+    Workflow:
+    1. Resolves the analysis groups and their text files.
+    2. Cleans and processes all groups, in parallel if several workers are requested.
+    3. Creates the corpus and its document-term matrix once.
+    4. Scores, ranks and prints each group as `main` does.
+    5. Optionally generates visualisations and saves each group's results under a shared timestamped folder,
+       with the run report in each `metadata.yaml` and the final report in the batch folder.
+    """
+    formats = check_formats(formats)  # Fail before the corpus run, not after it
+    report = RunReport(profile=profile, trace_memory=trace_memory)
+
+    # Step 1: Retrieve groups and file paths
+    with report.stage("discovery"):
+        corpus_files = get_all_txt_file_paths(corpus_path, extensionless=extensionless)
+        analysis_groups = get_analysis_groups(analysis_paths)
+        group_files = [get_all_txt_file_paths(group_path, extensionless=extensionless)
+                       for group_path in analysis_groups]
+    report.count_files("corpus", corpus_files)
+    report.count_files("analysis", [file_path for files in group_files for file_path in files])
+    report.count("analysis_groups", len(analysis_groups))
+
+    # Step 2: Clean and process all analysis groups
+    with report.stage("analysis_lemmatizing"):
+        group_words = process_analysis_groups(group_files, workers=workers)
+    report.count("analysis_tokens", sum(x.raw_count.sum() for x in group_words))
+    report.count("analysis_lemmas", sum(len(x) for x in group_words))
+
+    # Step 3: Create corpus and its document-term matrix once
+    with report.stage("creating_corpus"):
+        corpus, total_number_of_txt_files = creating_corpus(corpus_path, incremental=incremental, workers=workers,
+                                                            report=report, store_path=corpus_store,
+                                                            files=corpus_files)
+    report.count("corpus_tokens", corpus.token_count())
+    report.count("corpus_lemmas", len(corpus.vocabulary))
+    with report.stage("document_term_matrix"):
+        engine = TfidfMatrix.from_corpus(corpus)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    batch_folder = f'results/batch_{timestamp}'
+    # Figures are rendered by background processes while the next group is scored
+    with RenderExecutor() as renderer:
+        for group_path, analysis_files, x in zip(analysis_groups, group_files, group_words):
+            group_name = os.path.basename(os.path.normpath(group_path))
+
+            # Step 4: Score and sort the group
+            with report.stage("scoring"):
+                engine.score_words(x, total_number_of_txt_files)
+            with report.stage("sorting"):
+                top_words = x.top(50)
+
+            print(f'Group: {group_name}')
+            for word in top_words:
+                print(f'Word: {word.word}, score: {word.tf_idf}')
+
+            # Step 5: Generate visualisations and save results if requested
+            figures = None
+            if visualisations:
+                with report.stage("visualisations"):
+                    figures = generate_visualisations(x)
+            if save_results:
+                with report.stage("saving"):
+                    save_results_to_folder(x, x, corpus_path, corpus_files, group_path, analysis_files,
+                                           save_results=True, results_folder=f'{batch_folder}/{group_name}',
+                                           run_report=report, formats=formats, figures=figures,
+                                           render_executor=renderer)
+            if figures is not None:
+                figures.close()
+        if save_results:
+            with report.stage("rendering"):
+                renderer.join()  # Waits for the figures still being rendered
+
+    if save_results and analysis_groups:
+        report.save(os.path.join(batch_folder, "run_report.json"))
+    if report_path:
+        report.save(report_path)
+
+    return report
 
 
 if __name__ == "__main__":
@@ -0,0 +1,43 @@
+### File path: server.py
+
+""" server.py
+
+This script runs the analysis server, which keeps the lemmatiser and the processed corpora loaded and
+scores analysis groups against them on request (see `utils.analysis_server` for the JSON API).
+
+Modules:
+- utils:
+  - AnalysisServer: asyncio JSON server with a bounded job queue and concurrency limits.
+
+Usage:
+python server.py --corpus greek_texts/texts --port 8765
+python server.py --corpus greek_texts/texts --socket /tmp/tfidf_greek.sock
+
+Then, from another process:
+>>> from utils import AnalysisClient
+>>> AnalysisClient(port=8765).score("greek_texts/texts", path="greek_texts/groups/stoic", top=10)
+"""
+
+import argparse
+from utils import AnalysisServer
+
+
+if __name__ == "__main__":
+    """ Execution starts here.
+
+    The server loads the lemmatiser and the given corpora, then serves requests until interrupted.
+    """
+    parser = argparse.ArgumentParser(description="Runs the TF-IDF analysis server.")
+    parser.add_argument("--corpus", action="append", default=[], help="corpus folder to load at startup")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", help="serve on this Unix socket instead of a TCP port")
+    parser.add_argument("--queue-size", type=int, default=16, help="maximum number of queued jobs")
+    parser.add_argument("--concurrency", type=int, default=2, help="jobs processed at the same time")
+    parser.add_argument("--max-connections", type=int, default=32, help="requests handled at the same time")
+    parser.add_argument("--workers", type=int, default=1, help="processes used to lemmatise a corpus, 0 for every CPU")
+    args = parser.parse_args()
+
+    server = AnalysisServer(queue_size=args.queue_size, concurrency=args.concurrency,
+                            max_connections=args.max_connections, workers=args.workers or None)
+    server.run(host=args.host, port=args.port, socket_path=args.socket, preload=args.corpus)
@@ -2,26 +2,151 @@
 
 """ __init__.py
 
-This script initialises the utils package by importing various modules required for text analysis.
+This script initialises the utils package, which provides the modules required for text analysis.
 
 Modules:
-- classes: Contains definitions for text-related classes, including Word objects.
+- classes: Contains definitions for text-related classes, including the WordTable column store and Word objects.
 - file_operations: Handles file retrieval and operations such as reading and writing text files.
+- file_discovery: Finds corpus files with os.scandir and glob patterns, with their sizes and modification times.
 - visualisations: Contains functions for generating visual representations of word analysis results.
+- rendering: Renders the bar chart and word cloud once, for both display and saving, optionally in background processes.
+- lemma_cache: Provides the persistent token → lemma cache used by the lemmatiser.
+- compiled_lemmatizer: Compiles the backoff lemmatiser chain into a frozen token → lemma table.
+- model_snapshot: Saves and restores ready-to-use models as versioned snapshot files.
+- model_provisioning: Installs the CLTK Greek model offline and checks that it is present.
+- tokenizer: Single-pass tokeniser for editorial markers, punctuation and accents.
 - text_processing: Provides tools for text cleaning, tokenisation, and lemmatisation.
+- corpus_manifest: Keeps the manifest of processed corpus files for incremental builds.
+- vocabulary: Interns lemmas to integer ids and stores documents as compact token arrays.
+- corpus_store: Memory-mapped on-disk corpus store (token ids, document offsets and vocabulary files).
+- inverted_index: Provides the lemma → postings index used for document frequency lookups.
+- df_table: Persisted lemma → document count table of a corpus, for scoring without the corpus texts.
 - tfidf_analysis: Calculates and analyses TF-IDF scores for words in a text corpus.
+- tfidf_matrix: Vectorised TF-IDF engine on a sparse document-term matrix.
 - save_results: Manages saving analysis results into files or folders.
+- result_writers: Pluggable CSV, JSON lines, Parquet, Feather and Excel writers for the word statistics.
 - corpus_processing: Facilitates corpus creation and word searching.
+- instrumentation: Stage timers, optional profiling and counters for the JSON run report.
+- analysis_server: Long-running JSON server that keeps the lemmatiser and corpora loaded, and its clients.
 
 Usage:
 By importing this package, all core functionalities are made available for text analysis workflows.
+
+Notes:
+- Submodules are imported lazily, on first access of one of their names, so `import utils` does not load
+  CLTK, pandas, matplotlib or wordcloud. The lemmatiser itself is loaded on first use.
+- Import-time budget: `import utils` must stay within IMPORT_TIME_BUDGET seconds. Check it with
+  `python -m benchmarks.import_time_check`, which times the import in fresh interpreters and fails when
+  it is over budget or loads CLTK, pandas, matplotlib, wordcloud or SciPy.
 """
 
-# Import required modules from utils package
-from .classes import *            # Import text-related class definitions
-from .file_operations import *    # Import file retrieval and operation functions
-from .visualisations import *     # Import visualisation tools
-from .text_processing import *    # Import text cleaning and processing functions
-from .tfidf_analysis import *     # Import TF-IDF calculation tools
-from .save_results import *       # Import result saving utilities
-from .corpus_processing import *  # Import corpus creation and word search functions
+import importlib
+
+IMPORT_TIME_BUDGET = 0.05  # Seconds allowed for `import utils`
+
+# Public name -> submodule that defines it
+_exports = {
+    # Import text-related class definitions
+    "Word": "classes",
+    "WordTable": "classes",
+    "as_word_table": "classes",
+    # Import file retrieval and operation functions
+    "get_data": "file_operations",
+    "iter_text_chunks": "file_operations",
+    "get_all_txt_file_paths": "file_operations",
+    "DiscoveredFile": "file_discovery",
+    "discover_files": "file_discovery",
+    "get_cache_dir": "file_operations",
+    "get_analysis_groups": "file_operations",
+    # Import visualisation tools
+    "generate_visualisations": "visualisations",
+    # Import the lemma cache
+    "LemmaCache": "lemma_cache",
+    "get_model_version": "lemma_cache",
+    "model_version_key": "lemma_cache",
+    "CompiledLemmatizer": "compiled_lemmatizer",
+    "compile_lemmatizer": "compiled_lemmatizer",
+    "get_compiled_lemmatizer": "compiled_lemmatizer",
+    "save_snapshot": "model_snapshot",
+    "load_snapshot": "model_snapshot",
+    "get_snapshot": "model_snapshot",
+    "ModelNotProvisionedError": "model_provisioning",
+    "check_greek_model": "model_provisioning",
+    "provision_greek_model": "model_provisioning",
+    # Import the tokeniser
+    "GreekTokenizer": "tokenizer",
+    "tokenize_greek": "tokenizer",
+    # Import text cleaning and processing functions
+    "get_greek_lemmatizer": "text_processing",
+    "get_compiled_greek_lemmatizer": "text_processing",
+    "load_text_processors": "text_processing",
+    "load_normalizer": "text_processing",
+    "load_lemmatizer": "text_processing",
+    "get_lemmatizer": "text_processing",
+    "cleaning_greek_text": "text_processing",
+    "grave_to_acute_map": "text_processing",
+    "replace_grave_with_acute": "text_processing",
+    "lemmatizing_text_cltk": "text_processing",
+    "text_cleaning_lemmas": "text_processing",
+    "iter_lemmatized_chunks": "text_processing",
+    "lemmatize_token_lists": "text_processing",
+    "iter_lemmatized_files": "text_processing",
+    # Import the vocabulary and compact corpus
+    "Vocabulary": "vocabulary",
+    "TokenCorpus": "vocabulary",
+    # Import the memory-mapped corpus store
+    "CorpusStoreWriter": "corpus_store",
+    "MappedCorpus": "corpus_store",
+    # Import the inverted index
+    "InvertedIndex": "inverted_index",
+    "build_inverted_index": "inverted_index",
+    # Import the document-frequency table
+    "DocumentFrequencyTable": "df_table",
+    "corpus_fingerprint": "df_table",
+    # Import the corpus manifest
+    "CorpusManifest": "corpus_manifest",
+    # Import TF-IDF calculation tools
+    "statistical_analysing": "tfidf_analysis",
+    "statistical_analysing_counts": "tfidf_analysis",
+    "words_to_objects": "tfidf_analysis",
+    "calculate_idf": "tfidf_analysis",
+    "word_search": "tfidf_analysis",
+    # Import the sparse TF-IDF engine
+    "TfidfMatrix": "tfidf_matrix",
+    # Import the shared figure rendering
+    "ResultFigures": "rendering",
+    "RenderExecutor": "rendering",
+    # Import result saving utilities
+    "save_results_to_folder": "save_results",
+    # Import the result writers
+    "write_results": "result_writers",
+    "check_formats": "result_writers",
+    "register_writer": "result_writers",
+    # Import corpus creation and word search functions
+    "process_corpus": "corpus_processing",
+    "creating_corpus": "corpus_processing",
+    "size_balanced_chunks": "corpus_processing",
+    "process_analysis_groups": "corpus_processing",
+    # Import the run report
+    "RunReport": "instrumentation",
+    # Import the analysis server and its clients
+    "AnalysisServer": "analysis_server",
+    "AnalysisClient": "analysis_server",
+    "LocalAnalysisClient": "analysis_server",
+    "AnalysisServerError": "analysis_server",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    """Imports the submodule defining `name` on first access."""
+    if name in _exports:
+        value = getattr(importlib.import_module(f".{_exports[name]}", __name__), name)
+        globals()[name] = value  # Later lookups skip this function
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
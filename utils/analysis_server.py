@@ -0,0 +1,537 @@
+# File path: utils/analysis_server.py
+
+""" analysis_server.py
+
+This module provides a long-running analysis server that loads the lemmatiser and the processed corpora
+once and then scores analysis groups or texts against them on request, through a small JSON API served
+over HTTP on a TCP port or a Unix socket.
+
+Classes:
+- AnalysisServer: asyncio server with a bounded job queue and request concurrency limits.
+- AnalysisClient: Blocking JSON client for a running server (TCP or Unix socket).
+- LocalAnalysisClient: In-process stand-in client that runs a server without sockets, for tests and scripts.
+- AnalysisServerError: Raised by the clients when the server answers with an error status.
+
+API (JSON bodies and responses):
+- GET /health: Server status, loaded corpora and queue length.
+- GET /stats: Request counters and lemma cache statistics.
+- GET /corpora: The loaded corpora.
+- POST /corpora {"path": ..., "name": ...}: Loads (lemmatises and indexes) a corpus folder.
+- POST /score {"corpus": ..., "text": ... | "files": [...] | "path": ..., "top": 50}: Scores an analysis
+  group against a corpus; the corpus is loaded first if it is a folder that is not loaded yet.
+
+Dependencies:
+- asyncio: For the server, the job queue and the worker tasks.
+- concurrent.futures.ThreadPoolExecutor: Runs lemmatisation and scoring off the event loop.
+- http.client: For the blocking client.
+- utils: The pipeline functions used to load corpora and score groups.
+
+Usage:
+>>> AnalysisServer(queue_size=16, concurrency=2).run(port=8765, preload=["greek_texts/texts"])
+>>> client = AnalysisClient(port=8765)
+>>> client.score("greek_texts/texts", path="greek_texts/groups/stoic", top=10)
+
+Notes:
+- The lemmatiser is not thread-safe, so everything that lemmatises runs on one dedicated thread;
+  scoring runs on a pool of `concurrency` threads.
+- When the job queue is full, requests are rejected at once with status 503 instead of waiting.
+- The server is meant for local use: it has no authentication and reads any folder it is given.
+"""
+
+import os
+import json
+import stat
+import time
+import socket
+import asyncio
+import threading
+import http.client
+from http import HTTPStatus
+from concurrent.futures import ThreadPoolExecutor
+
+from .file_operations import get_all_txt_file_paths
+from .text_processing import (load_text_processors, get_lemmatizer, cleaning_greek_text, lemmatizing_text_cltk,
+                              text_cleaning_lemmas)
+from .tfidf_analysis import statistical_analysing, words_to_objects
+from .corpus_processing import creating_corpus
+from .tfidf_matrix import TfidfMatrix
+
+MAX_BODY_BYTES = 16 * 1024 * 1024  # Largest request body accepted
+
+
+class AnalysisServerError(RuntimeError):
+    def __init__(self, status: int, message: str):
+        """Initialises the error with the HTTP status and the message returned by the server."""
+        super().__init__(f"{status}: {message}")
+        self.status = status
+        self.message = message
+
+
+class AnalysisServer:
+    def __init__(self, queue_size=16, concurrency=2, max_connections=32, workers=1, incremental=True):
+        """Initialises the server; nothing is loaded until `start`.
+
+        Parameters:
+        - queue_size (int, optional): Maximum number of queued jobs; further jobs are rejected. Defaults to 16.
+        - concurrency (int, optional): Number of jobs processed at the same time. Defaults to 2.
+        - max_connections (int, optional): Maximum number of requests handled at the same time; further
+          connections wait. Defaults to 32.
+        - workers (int or None, optional): Processes used to lemmatise a corpus when it is loaded. Defaults to 1.
+        - incremental (bool, optional): Whether corpora are loaded through the corpus manifest. Defaults to True.
+        """
+        self.queue_size = queue_size
+        self.concurrency = concurrency
+        self.max_connections = max_connections
+        self.workers = workers
+        self.incremental = incremental
+        self.corpora = {}  # Corpus name -> loaded corpus details, including its TfidfMatrix
+        self.counters = {"requests": 0, "rejected": 0, "completed": 0, "failed": 0}
+        self._queue = None
+        self._tasks = []
+        self._loading = {}  # Corpus name -> future of a load in progress
+        self._connections = None
+        self._lemmatizer_executor = None
+        self._scoring_executor = None
+
+    # Lifecycle
+
+    async def start(self, host=None, port=None, socket_path=None):
+        """Loads the lemmatiser, starts the job workers and, if an address is given, the listener.
+
+        Parameters:
+        - host (str, optional): TCP host, e.g. "127.0.0.1".
+        - port (int, optional): TCP port.
+        - socket_path (str, optional): Unix socket path; used instead of host and port.
+
+        Returns:
+        - asyncio.Server or None: The listener, or None when no address is given (in-process use).
+        """
+        self._queue = asyncio.Queue(self.queue_size)
+        self._connections = asyncio.Semaphore(self.max_connections)
+        self._lemmatizer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lemmatiser")
+        self._scoring_executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="scoring")
+        self._tasks = [asyncio.create_task(self._job_worker()) for _ in range(self.concurrency)]
+
+        # Load the lemmatiser once, on the thread that will use it
+        await asyncio.get_running_loop().run_in_executor(self._lemmatizer_executor, load_text_processors)
+
+        if socket_path is not None:
+            if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                os.unlink(socket_path)  # Stale socket of a previous run
+            return await asyncio.start_unix_server(self._handle_connection, path=socket_path)
+        if port is not None:
+            return await asyncio.start_server(self._handle_connection, host or "127.0.0.1", port)
+        return None
+
+    async def close(self):
+        """Stops the job workers and the executors."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for executor in (self._lemmatizer_executor, self._scoring_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, host="127.0.0.1", port=8765, socket_path=None, preload=()):
+        """Runs the server until interrupted.
+
+        Parameters:
+        - host (str, optional): TCP host. Defaults to "127.0.0.1".
+        - port (int, optional): TCP port. Defaults to 8765.
+        - socket_path (str, optional): Unix socket path; used instead of host and port.
+        - preload (iterable, optional): Corpus folders loaded before the first request.
+        """
+        try:
+            asyncio.run(self._serve_forever(host, port, socket_path, preload))
+        except KeyboardInterrupt:
+            pass
+
+    async def _serve_forever(self, host, port, socket_path, preload):
+        listener = await self.start(host, port, socket_path)
+        try:
+            for corpus_path in preload:
+                details = await self.submit(self._load_corpus, corpus_path, None)
+                print(f"Loaded corpus {details['name']}: {details['documents']} documents "
+                      f"in {details['seconds']:.2f} s")
+            print(f"Listening on {socket_path or f'http://{host}:{port}'}")
+            async with listener:
+                await listener.serve_forever()
+        finally:
+            await self.close()
+            if socket_path is not None and os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+    # Job queue
+
+    async def submit(self, job, *args):
+        """Queues a job and waits for its result.
+
+        Parameters:
+        - job (coroutine function): The job, called with `args`.
+
+        Returns:
+        - object: The result of the job.
+
+        Raises:
+        - AnalysisServerError: With status 503 if the queue is full.
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((job, args, future))
+        except asyncio.QueueFull:
+            self.counters["rejected"] += 1
+            raise AnalysisServerError(HTTPStatus.SERVICE_UNAVAILABLE, "job queue is full") from None
+        return await future
+
+    async def _job_worker(self):
+        while True:
+            job, args, future = await self._queue.get()
+            try:
+                if not future.cancelled():
+                    future.set_result(await job(*args))
+                    self.counters["completed"] += 1
+            except Exception as e:
+                self.counters["failed"] += 1
+                if not future.cancelled():
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    async def _run_lemmatizing(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._lemmatizer_executor, function, *args)
+
+    async def _run_scoring(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._scoring_executor, function, *args)
+
+    # Jobs
+
+    def _build_corpus(self, corpus_path):
+        start = time.perf_counter()
+        corpus, total_number_of_txt_files = creating_corpus(corpus_path, incremental=self.incremental,
+                                                            workers=self.workers)
+        engine = TfidfMatrix.from_corpus(corpus)
+        return engine, total_number_of_txt_files, time.perf_counter() - start
+
+    async def _load_corpus(self, corpus_path, name):
+        """Loads a corpus folder under `name` (defaults to the path), or returns it if it is loaded."""
+        name = name or corpus_path
+        if name in self.corpora:
+            return self._describe(name)
+        if name in self._loading:  # Another job is loading the same corpus
+            await asyncio.shield(self._loading[name])
+            return self._describe(name)
+        if not os.path.isdir(corpus_path):
+            raise AnalysisServerError(HTTPStatus.NOT_FOUND, f"corpus folder not found: {corpus_path}")
+
+        loading = self._loading[name] = asyncio.get_running_loop().create_future()
+        try:
+            engine, total_number_of_txt_files, seconds = await self._run_lemmatizing(self._build_corpus, corpus_path)
+            self.corpora[name] = {"path": corpus_path, "engine": engine, "documents": total_number_of_txt_files,
+                                  "seconds": seconds, "loaded_at": time.time()}
+            loading.set_result(None)
+        except Exception as e:
+            loading.set_exception(e)
+            loading.exception()  # Mark as retrieved when nobody else is waiting
+            raise
+        finally:
+            del self._loading[name]
+        return self._describe(name)
+
+    def _describe(self, name) -> dict:
+        loaded = self.corpora[name]
+        return {"name": name, "path": loaded["path"], "documents": loaded["documents"],
+                "vocabulary": len(loaded["engine"].vocabulary), "seconds": loaded["seconds"]}
+
+    @staticmethod
+    def _analyse_text(text):
+        return words_to_objects(statistical_analysing(lemmatizing_text_cltk(cleaning_greek_text(text))))
+
+    @staticmethod
+    def _score(engine, total_number_of_txt_files, words, top):
+        engine.score_words(words, total_number_of_txt_files)
+        top_words = words.top(top)
+        return [{"word": word, "raw_count": raw_count, "frequency": frequency, "idf": idf, "tf_idf": tf_idf,
+                 "found_in_texts": found_in_texts}
+                for word, raw_count, frequency, idf, tf_idf, found_in_texts in zip(
+                    top_words.word, top_words.raw_count.tolist(), top_words.frequency.tolist(),
+                    top_words.idf.tolist(), top_words.tf_idf.tolist(), top_words.found_in_texts.tolist())]
+
+    @staticmethod
+    def _validate_corpus_payload(payload):
+        """Checks the body of POST /corpora, raising a 400 AnalysisServerError if it is invalid."""
+        if not isinstance(payload.get("path"), str) or not payload["path"]:
+            raise AnalysisServerError(HTTPStatus.BAD_REQUEST, "'path' is required and must be a string")
+        if payload.get("name") is not None and not isinstance(payload["name"], str):
+            raise AnalysisServerError(HTTPStatus.BAD_REQUEST, "'name' must be a string")
+
+    @staticmethod
+    def _validate_score_payload(payload):
+        """Checks the body of POST /score, raising a 400 AnalysisServerError if it is invalid."""
+        if not isinstance(payload.get("corpus"), str) or not payload["corpus"]:
+            raise AnalysisServerError(HTTPStatus.BAD_REQUEST, "'corpus' is required and must be a string")
+        if "text" in payload:
+            if not isinstance(payload["text"], str):
+                raise AnalysisServerError(HTTPStatus.BAD_REQUEST, "'text' must be a string")
+        elif "files" in payload:
+            files = payload["files"]
+            if not isinstance(files, list) or not all(isinstance(file_path, str) for file_path in files):
+                raise AnalysisServerError(HTTPStatus.BAD_REQUEST, "'files' must be a list of strings")
+        elif "path" in payload:
+            if not isinstance(payload["path"], str):
+                raise AnalysisServerError(HTTPStatus.BAD_REQUEST, "'path' must be a string")
+        else:
+            raise AnalysisServerError(HTTPStatus.BAD_REQUEST, "one of 'text', 'files' or 'path' is required")
+        top = payload.get("top", 50)
+        if isinstance(top, bool) or not isinstance(top, int) or top < 1:
+            raise AnalysisServerError(HTTPStatus.BAD_REQUEST, "'top' must be a positive integer")
+
+    async def _score_group(self, payload):
+        """Scores an analysis group; the payload has been checked by `_validate_score_payload`."""
+        start = time.perf_counter()
+        corpus = payload["corpus"]
+        if corpus not in self.corpora:
+            await self._load_corpus(corpus, None)
+        loaded = self.corpora[corpus]
+
+        if "text" in payload:
+            words = await self._run_lemmatizing(self._analyse_text, payload["text"])
+        else:
+            files = payload["files"] if "files" in payload else get_all_txt_file_paths(payload["path"])
+            missing = [file_path for file_path in files if not os.path.isfile(file_path)]
+            if missing or not files:
+                raise AnalysisServerError(HTTPStatus.NOT_FOUND, f"no such analysis files: {missing or files}")
+            words = await self._run_lemmatizing(text_cleaning_lemmas, files)
+
+        top = payload.get("top", 50)
+        results = await self._run_scoring(self._score, loaded["engine"], loaded["documents"], words, top)
+        return {"corpus": corpus, "documents": loaded["documents"], "words": len(words), "results": results,
+                "elapsed_ms": (time.perf_counter() - start) * 1000}
+
+    # Requests
+
+    async def dispatch(self, method: str, path: str, payload=None):
+        """Answers one API request.
+
+        Parameters:
+        - method (str): "GET" or "POST".
+        - path (str): The route, e.g. "/score".
+        - payload (dict, optional): The JSON body of a POST request.
+
+        Returns:
+        - tuple: (HTTP status, JSON-serialisable response body).
+
+        Notes:
+        - Request bodies are validated before a job is queued; invalid ones get 400. Any other error,
+          including one raised while lemmatising or scoring, is a server error (500).
+        """
+        self.counters["requests"] += 1
+        payload = payload if payload is not None else {}
+        try:
+            if not isinstance(payload, dict):
+                raise AnalysisServerError(HTTPStatus.BAD_REQUEST, "body must be a JSON object")
+            if method == "GET" and path == "/health":
+                return HTTPStatus.OK, {"status": "ok", "corpora": list(self.corpora),
+                                       "queued": self._queue.qsize(), "queue_size": self.queue_size}
+            if method == "GET" and path == "/stats":
+                return HTTPStatus.OK, {"requests": dict(self.counters), "lemma_cache": get_lemmatizer().stats()}
+            if method == "GET" and path == "/corpora":
+                return HTTPStatus.OK, {"corpora": [self._describe(name) for name in self.corpora]}
+            if method == "POST" and path == "/corpora":
+                self._validate_corpus_payload(payload)
+                return HTTPStatus.OK, await self.submit(self._load_corpus, payload["path"], payload.get("name"))
+            if method == "POST" and path == "/score":
+                self._validate_score_payload(payload)
+                return HTTPStatus.OK, await self.submit(self._score_group, payload)
+            raise AnalysisServerError(HTTPStatus.NOT_FOUND, f"no route for {method} {path}")
+        except AnalysisServerError as e:
+            return e.status, {"error": e.message}
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+
+    async def _handle_connection(self, reader, writer):
+        async with self._connections:
+            try:
+                status, body = await self._handle_request(reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                writer.close()
+                return
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            status = HTTPStatus(status)
+            writer.write(f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                         f"Content-Type: application/json; charset=utf-8\r\n"
+                         f"Content-Length: {len(data)}\r\n"
+                         f"Connection: close\r\n\r\n".encode("latin-1") + data)
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+
+    async def _handle_request(self, reader):
+        """Reads one HTTP request and dispatches it."""
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+        except ValueError:  # Longer than the stream reader's line limit
+            return HTTPStatus.BAD_REQUEST, {"error": "request line too long"}
+        if len(request_line) != 3:
+            return HTTPStatus.BAD_REQUEST, {"error": "malformed request line"}
+        method, target, _ = request_line
+
+        headers = {}
+        try:
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+        except ValueError:
+            return HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, {"error": "header line too long"}
+
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            return HTTPStatus.BAD_REQUEST, {"error": "invalid Content-Length header"}
+        if length > MAX_BODY_BYTES:
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "request body too large"}
+        try:
+            payload = json.loads(await reader.readexactly(length)) if length else None
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {"error": "body is not valid JSON"}
+        if payload is not None and not isinstance(payload, dict):
+            return HTTPStatus.BAD_REQUEST, {"error": "body must be a JSON object"}
+        return await self.dispatch(method.upper(), target.split("?", 1)[0], payload)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class _ClientMethods:
+    def health(self) -> dict:
+        """Returns the server status."""
+        return self.request("GET", "/health")
+
+    def stats(self) -> dict:
+        """Returns the request counters and lemma cache statistics."""
+        return self.request("GET", "/stats")
+
+    def corpora(self) -> list:
+        """Returns the loaded corpora."""
+        return self.request("GET", "/corpora")["corpora"]
+
+    def load_corpus(self, path, name=None) -> dict:
+        """Loads a corpus folder on the server and returns its details."""
+        return self.request("POST", "/corpora", {"path": path, "name": name})
+
+    def score(self, corpus, text=None, files=None, path=None, top=50) -> dict:
+        """Scores an analysis group against a corpus.
+
+        Parameters:
+        - corpus (str): Name or folder of the corpus.
+        - text (str, optional): The analysis text itself.
+        - files (list, optional): Analysis file paths, as seen by the server.
+        - path (str, optional): Analysis folder, as seen by the server.
+        - top (int, optional): Number of words returned, highest TF-IDF first. Defaults to 50.
+
+        Returns:
+        - dict: 'results' holds the top words with their raw count, frequency, IDF, TF-IDF and document count.
+        """
+        payload = {"corpus": corpus, "top": top}
+        if text is not None:
+            payload["text"] = text
+        elif files is not None:
+            payload["files"] = list(files)
+        elif path is not None:
+            payload["path"] = path
+        return self.request("POST", "/score", payload)
+
+
+class AnalysisClient(_ClientMethods):
+    def __init__(self, host="127.0.0.1", port=8765, socket_path=None, timeout=600):
+        """Initialises a client for a running server.
+
+        Parameters:
+        - host (str, optional): TCP host. Defaults to "127.0.0.1".
+        - port (int, optional): TCP port. Defaults to 8765.
+        - socket_path (str, optional): Unix socket path; used instead of host and port.
+        - timeout (float, optional): Seconds to wait for a response. Defaults to 600.
+        """
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def request(self, method: str, path: str, payload=None) -> dict:
+        """Sends one request and returns the decoded JSON response.
+
+        Raises:
+        - AnalysisServerError: If the server answers with an error status.
+        """
+        if self.socket_path is not None:
+            connection = _UnixHTTPConnection(self.socket_path, self.timeout)
+        else:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else None
+            headers = {"Content-Type": "application/json"} if body is not None else {}
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            data = json.loads(response.read() or b"{}")
+        finally:
+            connection.close()
+        if response.status >= 400:
+            raise AnalysisServerError(response.status, data.get("error", response.reason))
+        return data
+
+
+class LocalAnalysisClient(_ClientMethods):
+    def __init__(self, server=None):
+        """Starts a server without sockets on a background event loop, for tests and scripts.
+
+        Parameters:
+        - server (AnalysisServer, optional): The server to run. Defaults to a new AnalysisServer.
+
+        Notes:
+        - Requests go straight to `AnalysisServer.dispatch`, through the same job queue as network requests.
+          Call `close` (or use the client as a context manager) to stop the loop.
+        """
+        self.server = server or AnalysisServer()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="analysis-server", daemon=True)
+        self._thread.start()
+        self._call(self.server.start())
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def request(self, method: str, path: str, payload=None) -> dict:
+        """Sends one request to the in-process server and returns its response body.
+
+        Raises:
+        - AnalysisServerError: If the server answers with an error status.
+        """
+        status, body = self._call(self.server.dispatch(method, path, payload))
+        if status >= 400:
+            raise AnalysisServerError(status, body.get("error", ""))
+        return json.loads(json.dumps(body))  # The same plain values a network client would see
+
+    def close(self) -> None:
+        """Stops the server and its event loop."""
+        self._call(self.server.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
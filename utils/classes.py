@@ -2,12 +2,16 @@
 
 """ classes.py
 
-This module defines the `Word` class used for text analysis purposes.
+This module defines the `WordTable` and `Word` classes used for text analysis purposes.
 
-Class:
-- Word: Represents a word with attributes for frequency, raw count, IDF, TF-IDF score, and the number of texts it appears in.
+Classes:
+- WordTable: Column store (struct of arrays) of word statistics for a whole analysis group.
+- Word: Lightweight row view of a WordTable, keeping the attribute interface of the original Word objects.
 
-Attributes:
+Functions:
+- as_word_table: Returns a WordTable for either a WordTable or a list of Word objects.
+
+Attributes (one column per attribute in WordTable, one value per attribute in Word):
 - word (str): The word itself.
 - frequency (float): The frequency of the word (default is 0).
 - raw_count (int): The raw count of occurrences in the text (default is 0).
@@ -15,13 +19,134 @@ Attributes:
 - tf_idf (float): The Term Frequency-Inverse Document Frequency score of the word (default is 0).
 - found_in_texts (int): The number of texts in which the word was found (default is 0).
 
+Dependencies:
+- numpy: For the numeric columns.
+- sys.intern: For the interned word column.
+
 Usage:
-This class is utilised to store word statistics during the TF-IDF calculation process.
+These classes are utilised to store word statistics during the TF-IDF calculation process.
+Scoring, sorting and saving operate on the WordTable columns; iterating over a WordTable yields Word views.
+`WordTable.top` ranks only the leading rows (printing, charts); `sorted_by` ranks every row (full exports).
 """
 
+import sys
+import numpy as np
+
+
+class WordTable:
+    def __init__(self, words, raw_count, frequency=None, idf=None, tf_idf=None, found_in_texts=None):
+        """Initialises a WordTable from its columns.
+
+        Parameters:
+        - words (list): The words; stored interned.
+        - raw_count (array-like): Raw count of each word.
+        - frequency (array-like, optional): Frequency of each word. Defaults to 0.
+        - idf (array-like, optional): IDF score of each word. Defaults to 0.
+        - tf_idf (array-like, optional): TF-IDF score of each word. Defaults to 0.
+        - found_in_texts (array-like, optional): Number of texts each word was found in. Defaults to 0.
+        """
+        size = len(words)
+        self.word = [sys.intern(word) for word in words]  # Interned word column
+        self.raw_count = np.asarray(raw_count, dtype=np.int64).reshape(size)
+        self.frequency = self._column(frequency, np.float64, size)
+        self.idf = self._column(idf, np.float64, size)
+        self.tf_idf = self._column(tf_idf, np.float64, size)
+        self.found_in_texts = self._column(found_in_texts, np.int64, size)
+
+    @staticmethod
+    def _column(values, dtype, size):
+        if values is None:
+            return np.zeros(size, dtype=dtype)
+        return np.array(values, dtype=dtype).reshape(size)
+
+    @classmethod
+    def from_words(cls, word_objects):
+        """Builds a WordTable from a list of Word objects."""
+        return cls([w.word for w in word_objects],
+                   [w.raw_count for w in word_objects],
+                   [w.frequency for w in word_objects],
+                   [w.idf for w in word_objects],
+                   [w.tf_idf for w in word_objects],
+                   [w.found_in_texts for w in word_objects])
+
+    def take(self, indices):
+        """Returns a new WordTable with the rows at `indices`, in that order."""
+        indices = np.asarray(indices, dtype=np.int64)
+        return WordTable([self.word[i] for i in indices.tolist()], self.raw_count[indices],
+                         self.frequency[indices], self.idf[indices], self.tf_idf[indices],
+                         self.found_in_texts[indices])
+
+    def sorted_by(self, column='tf_idf', descending=True):
+        """Returns a new WordTable sorted by a numeric column.
+
+        Parameters:
+        - column (str, optional): Column to sort by. Defaults to 'tf_idf'.
+        - descending (bool, optional): Whether to sort from highest to lowest. Defaults to True.
+
+        Notes:
+        - The sort is stable, so ties keep their original order, as with `sorted(..., reverse=True)`.
+        """
+        values = getattr(self, column)
+        order = np.argsort(-values if descending else values, kind='stable')
+        return self.take(order)
+
+    def top(self, k, column='tf_idf', descending=True):
+        """Returns a new WordTable with the `k` highest (or lowest) rows of a numeric column, ranked.
+
+        Parameters:
+        - k (int): Number of rows to keep.
+        - column (str, optional): Column to rank by. Defaults to 'tf_idf'.
+        - descending (bool, optional): Whether to keep the highest values. Defaults to True.
+
+        Notes:
+        - The rows are selected with a partition in O(n) and only they are sorted, in O(k log k).
+        - The result equals `self.sorted_by(column, descending)[:k]`, ties included: among equal values
+          at the cut-off, the rows that come first are kept.
+        """
+        keys = -getattr(self, column) if descending else getattr(self, column)
+        if k >= len(keys):
+            return self.sorted_by(column, descending)
+        if k <= 0:
+            return self.take([])
+
+        # Rows strictly before the k-th key, then the earliest rows tied with it
+        threshold = np.partition(keys, k - 1)[k - 1]
+        before = np.flatnonzero(keys < threshold)
+        tied = np.flatnonzero(keys == threshold)[:k - len(before)]
+        rows = np.sort(np.concatenate([before, tied]))
+        return self.take(rows[np.argsort(keys[rows], kind='stable')])
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.take(range(len(self))[item])
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("WordTable index out of range")
+        return Word._view(self, item)
+
+    def __iter__(self):
+        return (Word._view(self, row) for row in range(len(self)))
+
+    def __len__(self):
+        return len(self.word)
+
+
+def _column_property(name):
+    def getter(self):
+        return getattr(self._table, name)[self._row].item()
+
+    def setter(self, value):
+        getattr(self._table, name)[self._row] = value
+
+    return property(getter, setter)
+
+
 class Word:
+    __slots__ = ('_table', '_row')
+
     def __init__(self, word, frequency=0, raw_count=0, idf=0, tf_idf=0):
-        """Initialises a Word object with specified attributes.
+        """Initialises a standalone Word object with specified attributes.
 
         Parameters:
         - word (str): The word itself.
@@ -29,10 +154,39 @@ class Word:
         - raw_count (int, optional): Raw count of word occurrences. Defaults to 0.
         - idf (float, optional): IDF score of the word. Defaults to 0.
         - tf_idf (float, optional): TF-IDF score of the word. Defaults to 0.
+
+        Notes:
+        - A standalone Word is backed by a one-row WordTable; Words obtained from a WordTable are views
+          of its rows, and setting their attributes updates the table.
         """
-        self.word = word  # The word string
-        self.frequency = frequency  # Frequency of the word
-        self.raw_count = raw_count  # Raw occurrence count in text
-        self.idf = idf  # Inverse Document Frequency score
-        self.tf_idf = tf_idf  # TF-IDF score
-        self.found_in_texts = 0  # Number of texts where the word was found
+        self._table = WordTable([word], [raw_count], [frequency], [idf], [tf_idf])
+        self._row = 0
+
+    @classmethod
+    def _view(cls, table, row):
+        word_obj = cls.__new__(cls)
+        word_obj._table = table
+        word_obj._row = row
+        return word_obj
+
+    @property
+    def word(self):
+        return self._table.word[self._row]  # The word string
+
+    @word.setter
+    def word(self, value):
+        self._table.word[self._row] = sys.intern(value)
+
+    frequency = _column_property('frequency')  # Frequency of the word
+    raw_count = _column_property('raw_count')  # Raw occurrence count in text
+    idf = _column_property('idf')  # Inverse Document Frequency score
+    tf_idf = _column_property('tf_idf')  # TF-IDF score
+    found_in_texts = _column_property('found_in_texts')  # Number of texts where the word was found
+
+    def __repr__(self):
+        return f"Word({self.word!r}, raw_count={self.raw_count}, tf_idf={self.tf_idf})"
+
+
+def as_word_table(words) -> WordTable:
+    """Returns `words` if it is a WordTable, otherwise a WordTable built from a list of Word objects."""
+    return words if isinstance(words, WordTable) else WordTable.from_words(words)
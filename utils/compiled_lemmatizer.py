@@ -0,0 +1,252 @@
+# File path: utils/compiled_lemmatizer.py
+
+""" compiled_lemmatizer.py
+
+This module compiles a CLTK backoff lemmatiser chain into a single frozen lookup table.
+GreekBackoffLemmatizer asks up to five sub-lemmatisers per token (a model dictionary, a unigram
+tagger, regular expressions, an older dictionary and the identity). Every token found in one of the
+dictionary layers is resolved through the whole chain once, at compile time; at run time such tokens
+are a single dictionary lookup, and only the remaining tokens go through the regex and identity layers.
+
+Class:
+- CompiledLemmatizer: Frozen token → lemma table with the non-dictionary layers as fallback.
+
+Functions:
+- compile_lemmatizer: Walks a backoff chain and builds its CompiledLemmatizer.
+- get_compiled_lemmatizer: Loads the compiled table of a model version from the cache, compiling it if needed.
+- verify_compiled_lemmatizer: Lists the tokens on which a compiled lemmatiser and its source model disagree.
+
+Dependencies:
+- numpy: For the `.npz` file format.
+- json: For the fallback layers and metadata.
+- re: For the regex fallback layer.
+
+Usage:
+>>> compiled = compile_lemmatizer(GreekBackoffLemmatizer(), model_version)
+>>> compiled.lemmatize(["θεοί", "ἀνθρώπων"])
+[('θεοί', 'θεός'), ('ἀνθρώπων', 'ἄνθρωπος')]
+
+Notes:
+- The output is identical to the backoff chain's: every layer decides from the token alone, so resolving
+  a token once is exact. Chains with context-dependent layers (e.g. bigram taggers) are refused.
+- The file is a NumPy `.npz` archive holding the tokens and lemmas (UTF-8, NUL-separated) and the
+  fallback layers as JSON; nothing is pickled. `python -m benchmarks.lemmatizer_benchmark` checks the
+  equivalence over the bundled texts.
+"""
+
+import os
+import re
+import json
+import numpy as np
+from pathlib import Path
+
+COMPILED_LEMMATIZER_FORMAT = 1  # Version of the file layout
+_SEPARATOR = "\0"  # Separates the tokens, and the lemmas, in the file
+
+
+class CompiledLemmatizer:
+    def __init__(self, table, fallbacks, model_version=None, models_path=None):
+        """Initialises the lemmatiser from its table and fallback layers.
+
+        Parameters:
+        - table (dict): Token -> lemma, for every token known to a dictionary layer of the chain.
+        - fallbacks (list): The non-dictionary layers, in chain order, as dicts: {'kind': 'regexp',
+          'patterns': [[pattern, replacement], ...]}, {'kind': 'identity'} or {'kind': 'default', 'lemma': ...}.
+        - model_version (str, optional): Version key of the source model.
+        - models_path (str, optional): Model directory of the source model.
+        """
+        self.table = table
+        self.fallbacks = fallbacks
+        self.model_version = model_version
+        self.models_path = models_path
+        self._layers = [self._fallback_layer(layer) for layer in fallbacks]
+
+    @staticmethod
+    def _fallback_layer(layer):
+        """Returns a token -> lemma (or None) function for a fallback layer description."""
+        kind = layer["kind"]
+        if kind == "regexp":
+            patterns = [(re.compile(pattern), replacement) for pattern, replacement in layer["patterns"]]
+
+            def regexp(token):
+                # As RegexpLemmatizer: the first matching pattern decides
+                for pattern, replacement in patterns:
+                    if pattern.search(token):
+                        return pattern.sub(replacement, token)
+                return None
+            return regexp
+        if kind == "identity":
+            return lambda token: token
+        if kind == "default":
+            return lambda token, lemma=layer["lemma"]: lemma
+        raise ValueError(f"unknown fallback layer: {kind}")
+
+    def _fallback(self, token):
+        lemma = None
+        for layer in self._layers:
+            lemma = layer(token)
+            if lemma is not None and lemma != "":
+                break
+        return lemma
+
+    def lemmatize(self, tokens: list) -> list:
+        """Lemmatises a list of tokens.
+
+        Parameters:
+        - tokens (list): Tokens to lemmatise.
+
+        Returns:
+        - list: (token, lemma) tuples, as returned by the source backoff chain.
+        """
+        table_get = self.table.get
+        fallback = self._fallback
+        return [(token, lemma if (lemma := table_get(token)) is not None else fallback(token)) for token in tokens]
+
+    def save(self, path) -> None:
+        """Writes the lemmatiser to a `.npz` file, replacing it atomically.
+
+        Raises:
+        - ValueError: If a token or lemma contains the NUL separator.
+        """
+        tokens = list(self.table)
+        lemmas = [self.table[token] for token in tokens]
+        if any(_SEPARATOR in value for value in tokens + lemmas):
+            raise ValueError("tokens and lemmas must not contain NUL characters")
+        metadata = {
+            "format": COMPILED_LEMMATIZER_FORMAT,
+            "model_version": self.model_version,
+            "models_path": self.models_path,
+            "fallbacks": self.fallbacks
+        }
+        temporary_file = f"{path}.tmp"
+        with open(temporary_file, "wb") as f:
+            np.savez(
+                f,
+                tokens=np.frombuffer(_SEPARATOR.join(tokens).encode("utf-8"), dtype=np.uint8),
+                lemmas=np.frombuffer(_SEPARATOR.join(lemmas).encode("utf-8"), dtype=np.uint8),
+                metadata=np.frombuffer(json.dumps(metadata, ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+            )
+        os.replace(temporary_file, path)
+
+    @classmethod
+    def load(cls, path):
+        """Reads a lemmatiser written by `save`.
+
+        Raises:
+        - ValueError: If the file was written in an unsupported format.
+        """
+        with np.load(path, allow_pickle=False) as archive:
+            metadata = json.loads(archive["metadata"].tobytes().decode("utf-8"))
+            if metadata.get("format") != COMPILED_LEMMATIZER_FORMAT:
+                raise ValueError(f"unsupported compiled lemmatiser format in {path}: {metadata.get('format')}")
+            tokens_text = archive["tokens"].tobytes().decode("utf-8")
+            lemmas_text = archive["lemmas"].tobytes().decode("utf-8")
+        table = dict(zip(tokens_text.split(_SEPARATOR), lemmas_text.split(_SEPARATOR))) if tokens_text else {}
+        return cls(table, metadata["fallbacks"], metadata.get("model_version"), metadata.get("models_path"))
+
+    def __len__(self):
+        return len(self.table)
+
+
+def _describe_layer(tagger):
+    """Returns ('table', mapping) for a dictionary layer, ('fallback', description) for a token-only layer.
+
+    Raises:
+    - ValueError: If the layer decides from anything but the token itself.
+    """
+    from nltk.tag.sequential import UnigramTagger
+    from cltk.lemmatize.backoff import DictLemmatizer, RegexpLemmatizer, IdentityLemmatizer, DefaultLemmatizer
+
+    if isinstance(tagger, DictLemmatizer):
+        return "table", tagger.lemmas
+    if isinstance(tagger, RegexpLemmatizer):
+        return "fallback", {"kind": "regexp", "patterns": [[pattern, replacement]
+                                                           for pattern, replacement in tagger._regexs]}
+    if isinstance(tagger, IdentityLemmatizer):
+        return "fallback", {"kind": "identity"}
+    if isinstance(tagger, DefaultLemmatizer):
+        return "fallback", {"kind": "default", "lemma": tagger.lemma}
+    if getattr(type(tagger), "context", None) is UnigramTagger.context:  # A unigram's context is the token
+        return "table", tagger._context_to_tag
+    raise ValueError(f"cannot compile the context-dependent lemmatiser {tagger!r}")
+
+
+def compile_lemmatizer(model, model_version=None) -> CompiledLemmatizer:
+    """Walks the backoff chain of a lemmatiser once and builds its frozen lookup table.
+
+    Parameters:
+    - model (object): A CLTK backoff lemmatiser, e.g. GreekBackoffLemmatizer (its `lemmatizer` attribute
+      is the head of the chain) or a SequentialBackoffLemmatizer.
+    - model_version (str, optional): Version key stored with the table.
+
+    Returns:
+    - CompiledLemmatizer: The compiled lemmatiser.
+
+    Workflow:
+    1. Splits the chain into dictionary layers and token-only fallback layers.
+    2. Resolves every token of every dictionary layer through the whole chain, as `tag_one` would.
+    3. Keeps the fallback layers for tokens found in no dictionary.
+    """
+    head = getattr(model, "lemmatizer", model)
+    layers = [_describe_layer(tagger) for tagger in head._taggers]
+    fallbacks = [description for kind, description in layers if kind == "fallback"]
+    lookups = [description.get if kind == "table" else CompiledLemmatizer._fallback_layer(description)
+               for kind, description in layers]
+
+    table = {}
+    for kind, mapping in layers:
+        if kind != "table":
+            continue
+        for token in mapping:
+            if token in table:
+                continue
+            # Same walk as tag_one: the first layer with a non-empty lemma decides
+            lemma = None
+            for lookup in lookups:
+                lemma = lookup(token)
+                if lemma is not None and lemma != "":
+                    break
+            if lemma is not None:  # A token no layer answers for behaves the same outside the table
+                table[token] = lemma
+    return CompiledLemmatizer(table, fallbacks, model_version, getattr(model, "models_path", None))
+
+
+def get_compiled_lemmatizer(load_model, model_version, cache_dir):
+    """Returns the compiled lemmatiser of a model version, compiling and saving it on first use.
+
+    Parameters:
+    - load_model (callable): Returns the backoff lemmatiser; only called if no compiled table is cached.
+    - model_version (str): Version key of the model (see `model_version_key`).
+    - cache_dir (str or Path): Directory of the compiled tables.
+
+    Returns:
+    - CompiledLemmatizer: The lemmatiser.
+    """
+    path = Path(cache_dir) / "lemmatizers" / f"compiled_{model_version}.npz"
+    if path.exists():
+        try:
+            return CompiledLemmatizer.load(path)
+        except (ValueError, KeyError, OSError):
+            pass  # Unreadable or outdated file: compile again
+    compiled = compile_lemmatizer(load_model(), model_version)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    compiled.save(path)
+    return compiled
+
+
+def verify_compiled_lemmatizer(compiled, model, tokens) -> list:
+    """Compares a compiled lemmatiser with its source model.
+
+    Parameters:
+    - compiled (CompiledLemmatizer): The compiled lemmatiser.
+    - model (object): The source backoff lemmatiser.
+    - tokens (iterable): Tokens to compare on; each distinct token is checked once.
+
+    Returns:
+    - list: (token, model lemma, compiled lemma) for every token on which they disagree.
+    """
+    distinct_tokens = list(dict.fromkeys(tokens))
+    expected = model.lemmatize(distinct_tokens)
+    actual = compiled.lemmatize(distinct_tokens)
+    return [(token, lemma, compiled_lemma)
+            for (token, lemma), (_, compiled_lemma) in zip(expected, actual) if lemma != compiled_lemma]
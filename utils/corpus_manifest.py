@@ -0,0 +1,140 @@
+# File path: utils/corpus_manifest.py
+
+""" corpus_manifest.py
+
+This module keeps a manifest of every processed corpus file (content hash, size and modification time)
+together with its lemmatised output, so that incremental corpus builds only re-process new or changed files.
+
+Class:
+- CorpusManifest: Manifest and lemmatised-output store for a single corpus folder.
+
+Dependencies:
+- hashlib: For content hashes of corpus files.
+- json: For reading and writing the manifest.
+- utils.file_operations.get_cache_dir: Location of the manifest directory.
+- utils.file_discovery.file_stat: Sizes and modification times, as read during discovery.
+
+Usage:
+Used by `creating_corpus(..., incremental=True)`; it is not normally needed directly.
+
+Notes:
+- Files whose size and modification time are unchanged are reused without being read.
+- Files whose size or modification time changed are hashed; only files with a new hash are re-processed.
+- The whole manifest is discarded when the lemmatiser model version changes.
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from .file_operations import get_cache_dir
+from .file_discovery import file_stat
+
+
+def _hash_file(file_path) -> str:
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CorpusManifest:
+    def __init__(self, folder_path, model_version, cache_dir=None):
+        """Loads the manifest of a corpus folder, starting empty if none exists or the model changed.
+
+        Parameters:
+        - folder_path (str): Path to the corpus folder.
+        - model_version (str): Version key of the lemmatiser that produced the outputs.
+        - cache_dir (str or Path, optional): Directory holding all manifests. Defaults to `get_cache_dir()`.
+        """
+        folder_key = hashlib.sha1(os.path.abspath(folder_path).encode("utf-8")).hexdigest()[:16]
+        self.directory = Path(cache_dir or get_cache_dir()) / "corpora" / folder_key
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest_file = self.directory / "manifest.json"
+        self.model_version = model_version
+        self.entries = {}  # file path -> {"hash", "size", "mtime"}
+        self.reused = 0  # Files served from the manifest
+        self.rebuilt = 0  # Files that had to be processed
+        self._hashes = {}  # Hashes computed during lookup, reused by update
+
+        if self.manifest_file.exists():
+            with open(self.manifest_file, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("model_version") == model_version:
+                self.entries = manifest.get("files", {})
+
+    def _output_file(self, content_hash) -> Path:
+        return self.directory / f"{content_hash}.txt"
+
+    def lookup(self, file_path):
+        """Returns the stored lemmatised text of a file if the file is unchanged, otherwise None.
+
+        Parameters:
+        - file_path (str): Path to the corpus file.
+
+        Returns:
+        - str or None: The lemmatised text, or None if the file must be processed.
+        """
+        output_file = self.lookup_file(file_path)
+        return None if output_file is None else output_file.read_text(encoding="utf-8")
+
+    def lookup_file(self, file_path):
+        """Returns the file holding the lemmatised text of a file if the file is unchanged, otherwise None.
+
+        Parameters:
+        - file_path (str): Path to the corpus file.
+
+        Returns:
+        - Path or None: The stored output, or None if the file must be processed.
+        """
+        entry = self.entries.get(file_path)
+        if entry is None:
+            return None
+
+        size, mtime_ns = file_stat(file_path)
+        if size != entry["size"] or mtime_ns != entry["mtime"]:
+            content_hash = _hash_file(file_path)
+            self._hashes[file_path] = content_hash
+            if content_hash != entry["hash"]:
+                return None
+            entry["size"], entry["mtime"] = size, mtime_ns  # Touched but not changed
+
+        output_file = self._output_file(entry["hash"])
+        if not output_file.exists():
+            return None
+        self.reused += 1
+        return output_file
+
+    def update(self, file_path, text):
+        """Records the lemmatised text of a newly processed file.
+
+        Parameters:
+        - file_path (str): Path to the corpus file.
+        - text (str): Its lemmatised text.
+        """
+        size, mtime_ns = file_stat(file_path)
+        content_hash = self._hashes.pop(file_path, None) or _hash_file(file_path)
+        self._output_file(content_hash).write_text(text, encoding="utf-8")
+        self.entries[file_path] = {"hash": content_hash, "size": size, "mtime": mtime_ns}
+        self.rebuilt += 1
+
+    def prune(self, file_paths):
+        """Drops files that are no longer part of the corpus, and outputs no longer referenced.
+
+        Parameters:
+        - file_paths (list): The current corpus files.
+        """
+        current = set(file_paths)
+        self.entries = {path: entry for path, entry in self.entries.items() if path in current}
+        referenced = {f"{entry['hash']}.txt" for entry in self.entries.values()}
+        for output_file in self.directory.glob("*.txt"):
+            if output_file.name not in referenced:
+                output_file.unlink()
+
+    def save(self):
+        """Writes the manifest to disk atomically."""
+        temporary_file = self.manifest_file.with_suffix(".tmp")
+        with open(temporary_file, "w", encoding="utf-8") as f:
+            json.dump({"model_version": self.model_version, "files": self.entries}, f, ensure_ascii=False)
+        os.replace(temporary_file, self.manifest_file)
@@ -9,17 +9,37 @@ for structured text analysis.
 Functions:
 - process_corpus: Cleans and processes all text files in a given corpus path.
 - creating_corpus: Generates a corpus from text files and counts the total number of files.
+- size_balanced_chunks: Splits files into chunks of roughly equal total size for worker processes.
+- process_analysis_groups: Cleans and lemmatises several analysis groups, optionally in parallel.
 
 Dependencies:
 - utils: Contains helper functions such as get_all_txt_file_paths and text_cleaning_lemmas.
+- utils.inverted_index: Builds the lemma → postings index of the corpus.
+- utils.vocabulary: Compact token-id representation of the corpus.
+- utils.corpus_store: Memory-mapped on-disk corpus store.
+- utils.corpus_manifest: Stores lemmatised outputs for incremental corpus builds.
+- utils.df_table: Persisted document-frequency table of the corpus.
 - tqdm: Used to display progress bars for file processing tasks.
+- concurrent.futures: Process pool for parallel corpus lemmatisation.
+- utils.file_discovery: File sizes read during discovery, for size-balanced chunks.
 
 Usage:
 These functions are essential for preparing text data for further
 analysis, such as TF-IDF calculations or word frequency visualisations.
 """
 
+import os
+import heapq
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from utils import get_all_txt_file_paths, text_cleaning_lemmas
+from . import text_processing
+from .text_processing import iter_lemmatized_files
+from .file_discovery import file_size
+from .inverted_index import build_inverted_index
+from .vocabulary import TokenCorpus
+from .corpus_store import CorpusStoreWriter, MappedCorpus
+from .corpus_manifest import CorpusManifest
+from .df_table import DocumentFrequencyTable, corpus_fingerprint
 from tqdm import tqdm
 
 
@@ -55,36 +75,201 @@ def process_corpus(corpus_path, normalize_proc, lemmatizer):
     return corpus_texts
 
 
-def creating_corpus(folder_path):
+def size_balanced_chunks(indexed_files, number_of_chunks):
+    """Splits files into chunks whose total file sizes are roughly equal.
+
+    Parameters:
+    - indexed_files (list): (position, file path) tuples.
+    - number_of_chunks (int): Number of chunks to create.
+
+    Returns:
+    - list: Non-empty lists of (position, file path) tuples.
+
+    Notes:
+    - Files are assigned largest first to the currently lightest chunk.
+    """
+    chunks = [[] for _ in range(max(1, number_of_chunks))]
+    heap = [(0, i) for i in range(len(chunks))]  # (total size, chunk number)
+    sized_files = sorted(indexed_files, key=lambda item: file_size(item[1]), reverse=True)
+    for position, file_path in sized_files:
+        total_size, i = heapq.heappop(heap)
+        chunks[i].append((position, file_path))
+        heapq.heappush(heap, (total_size + file_size(file_path), i))
+    return [chunk for chunk in chunks if chunk]
+
+
+def _process_chunk(chunk):
+    """Lemmatises a chunk of (position, file path) tuples inside a worker process, in batches of files."""
+    return [(chunk[index][0], text) for index, text in iter_lemmatized_files([file_path for _, file_path in chunk])]
+
+
+def _lemmatised_texts(pending, workers):
+    """Yields (position, lemmatised text) for each pending file, in the order they are finished.
+
+    Parameters:
+    - pending (list): (position, file path) tuples.
+    - workers (int): Number of worker processes; files are processed in this process if 1.
+    """
+    if workers > 1 and len(pending) > 1:
+        chunks = size_balanced_chunks(pending, min(len(pending), workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=text_processing.load_text_processors) as pool:
+            futures = [pool.submit(_process_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+    else:
+        # Clean and process text content; files are lemmatised together, in batches
+        for index, text in iter_lemmatized_files([file_path for _, file_path in pending]):
+            yield pending[index][0], text
+
+
+def creating_corpus(folder_path, with_index=False, incremental=False, workers=1, report=None, df_table_path=None,
+                    store_path=None, files=None):
     """Creates a text corpus from files and counts the total number of text files.
 
     Parameters:
     - folder_path (str): Path to the folder containing text files.
+    - with_index (bool): Whether to also build an inverted index of the corpus. Default is False.
+    - incremental (bool): Whether to reuse the lemmatised output of unchanged files from the corpus
+      manifest. Default is False.
+    - workers (int or None): Number of worker processes. 1 (default) processes files sequentially,
+      None uses every CPU.
+    - report (RunReport, optional): If given, the numbers of processed and reused files are counted in it.
+    - df_table_path (str or Path, optional): If given, the document-frequency table of the corpus is
+      written to this `.npz` file (see `DocumentFrequencyTable`).
+    - store_path (str or Path, optional): If given, the corpus is kept in a memory-mapped store in this
+      directory (see `MappedCorpus`). A store built from the same files and model is opened without
+      processing any file; otherwise the store is rebuilt.
+    - files (list, optional): The corpus files, as returned by `get_all_txt_file_paths(folder_path)`, so a
+      folder discovered by the caller is not scanned again. Discovered here if None.
 
     Returns:
-    - tuple: (list of corpus texts, total number of text files)
+    - tuple: (TokenCorpus of the corpus texts, total number of text files), followed by the InvertedIndex
+      if `with_index` is True. With `store_path`, the corpus is a MappedCorpus.
 
     Workflow:
-    1. Retrieves all `.txt` files from the specified folder.
-    2. Processes each file using `text_cleaning_lemmas`.
-    3. Counts the total number of files processed.
+    1. Retrieves the text files of the specified folder (unless given), and opens the corpus store if it is current.
+    2. Processes the files in batches with `iter_lemmatized_files`, or reuses their stored output in incremental mode.
+    3. Encodes the texts as token-id arrays over a shared vocabulary, in file order, in memory or into the store.
+    4. Optionally writes the document-frequency table and builds an inverted index of the corpus.
+    5. Counts the total number of files processed.
 
     Example:
     >>> corpus, total_files = creating_corpus("data/texts")
     >>> print(f"Total files: {total_files}")
+    >>> corpus, total_files, index = creating_corpus("data/texts", with_index=True, workers=8)
+    >>> corpus, total_files = creating_corpus("data/texts", store_path="data/texts_store")
 
     Notes:
     - Uses tqdm to display progress as files are processed.
-    - Each processed text remains tokenised (not joined into strings).
+    - Each processed text is stored as an `array('I')` of token ids; use `corpus.text(i)` to get it back as a string.
+    - Texts are encoded as soon as every text before them is; with a store, the corpus is never held in memory.
+    - In incremental mode, deleted files are dropped from the manifest and their outputs removed.
+    - With several workers, files are sent to a process pool in size-balanced chunks; each worker loads
+      the lemmatiser and normaliser once. The returned texts keep the original file order.
     """
-    txt_files = get_all_txt_file_paths(folder_path)  # Retrieve all text file paths
+    txt_files = files if files is not None else get_all_txt_file_paths(folder_path)  # Retrieve all text file paths
     total_number_of_txt_files = len(txt_files)  # Count total files
-    corpus_texts = []
+    needs_model = incremental or df_table_path is not None or store_path is not None
+    model_version = text_processing.get_lemmatizer().model_version if needs_model else None
+    fingerprint = None
+    if df_table_path is not None or store_path is not None:
+        fingerprint = corpus_fingerprint(txt_files, folder_path, model_version)
+    relative_files = [os.path.relpath(file_path, folder_path) for file_path in txt_files]
+    workers = workers or os.cpu_count()
 
-    # Use tqdm to show file processing progress
-    for file_path in tqdm(txt_files, desc="Processing files", unit="file"):
-        # Clean and process text content
-        text = text_cleaning_lemmas([file_path], analysis=False)
-        corpus_texts.append(text)
+    # An up-to-date store replaces processing altogether
+    corpus = None
+    if store_path is not None and MappedCorpus.exists(store_path):
+        corpus = MappedCorpus.open(store_path)
+        if corpus.matches(fingerprint):
+            print(f"Reusing the corpus store in {store_path}.")
+        else:
+            corpus = None
+    pending = []
 
-    return corpus_texts, total_number_of_txt_files
+    if corpus is None:
+        manifest = CorpusManifest(folder_path, model_version) if incremental else None
+
+        # Collect files that need processing; unchanged files come straight from the manifest
+        stored_outputs = [None] * total_number_of_txt_files
+        for position, file_path in enumerate(txt_files):
+            output_file = manifest.lookup_file(file_path) if manifest is not None else None
+            if output_file is None:
+                pending.append((position, file_path))
+            else:
+                stored_outputs[position] = output_file
+
+        # Encode texts as token-id arrays; document ids match the file order, so a text finished early
+        # waits in `ready` until every text before it has been encoded
+        sink = CorpusStoreWriter(store_path) if store_path is not None else TokenCorpus()
+        ready = {}
+        next_position = 0
+
+        def encode_ready_texts():
+            nonlocal next_position
+            while next_position < total_number_of_txt_files:
+                if next_position in ready:
+                    text = ready.pop(next_position)
+                elif stored_outputs[next_position] is not None:
+                    text = stored_outputs[next_position].read_text(encoding="utf-8")
+                else:
+                    break
+                sink.add_document(text)
+                next_position += 1
+
+        # Use tqdm to show file processing progress
+        with tqdm(total=total_number_of_txt_files, initial=total_number_of_txt_files - len(pending),
+                  desc="Processing files", unit="file") as progress:
+            encode_ready_texts()
+            for position, text in _lemmatised_texts(pending, workers):
+                if manifest is not None:
+                    manifest.update(txt_files[position], text)
+                ready[position] = text
+                encode_ready_texts()
+                progress.update(1)
+
+        if manifest is not None:
+            manifest.prune(txt_files)
+            manifest.save()
+            print(f"Reused {manifest.reused} of {total_number_of_txt_files} files, processed {manifest.rebuilt}.")
+
+        if store_path is not None:
+            sink.close(fingerprint, model_version, relative_files)
+            corpus = MappedCorpus.open(store_path)
+        else:
+            corpus = sink
+
+    if report is not None:
+        report.count("corpus_files_processed", len(pending))
+        report.count("corpus_files_reused", total_number_of_txt_files - len(pending))
+
+    if df_table_path is not None:
+        DocumentFrequencyTable.from_corpus(
+            corpus,
+            fingerprint=fingerprint,
+            model_version=model_version,
+            files=relative_files
+        ).save(df_table_path)
+
+    if with_index:
+        return corpus, total_number_of_txt_files, build_inverted_index(corpus)
+    return corpus, total_number_of_txt_files
+
+
+def process_analysis_groups(group_files, workers=1):
+    """Cleans and lemmatises several analysis groups into Word objects.
+
+    Parameters:
+    - group_files (list): One list of file paths per analysis group.
+    - workers (int or None): Number of worker processes. 1 (default) processes groups sequentially,
+      None uses every CPU.
+
+    Returns:
+    - list: One list of Word objects per group, in the order of `group_files`.
+    """
+    workers = workers or os.cpu_count()
+    if workers > 1 and len(group_files) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(group_files)),
+                                 initializer=text_processing.load_text_processors) as pool:
+            return list(pool.map(text_cleaning_lemmas, group_files))
+    return [text_cleaning_lemmas(files) for files in group_files]
@@ -0,0 +1,191 @@
+# File path: utils/corpus_store.py
+
+""" corpus_store.py
+
+This module provides an on-disk format for a lemmatised corpus that is opened with `numpy.memmap`
+instead of being loaded: the token ids of every document are concatenated in one file, the start of
+each document is kept in an offset array, and the lemmas in a vocabulary file. The operating system
+pages the tokens in on demand and shares the pages between every process that opens the same store.
+
+Classes:
+- CorpusStoreWriter: Streams documents, in order, into a new store.
+- MappedCorpus: A TokenCorpus whose documents are zero-copy views of a memory-mapped store.
+
+Files (inside the store directory):
+- tokens.bin: Token ids of all documents, concatenated (little-endian uint32).
+- offsets.bin: Start of each document in tokens.bin, plus the total (little-endian uint64, documents + 1 values).
+- vocabulary.txt: The lemmas in id order, one per line (UTF-8).
+- store.json: Format, sizes, corpus fingerprint, model version and file list; written last.
+
+Dependencies:
+- numpy: For the memory maps and the token arrays.
+- json: For the store metadata.
+- utils.vocabulary: Vocabulary and TokenCorpus.
+
+Usage:
+>>> corpus, total = creating_corpus("greek_texts/texts", store_path="texts_store")  # Builds or reuses the store
+>>> corpus = MappedCorpus.open("texts_store")                                       # Opens it directly
+>>> TfidfMatrix.from_corpus(corpus)
+
+Notes:
+- Documents are written as they are produced, so building a store never holds the whole corpus in memory.
+- Files are replaced atomically and store.json is removed while a store is rewritten, so a store that
+  is open elsewhere keeps its old contents and an interrupted build is never opened.
+"""
+
+import os
+import json
+import numpy as np
+from pathlib import Path
+from .vocabulary import Vocabulary, TokenCorpus
+
+CORPUS_STORE_FORMAT = 1  # Version of the store layout
+TOKEN_DTYPE = np.dtype('<u4')  # Token ids
+OFFSET_DTYPE = np.dtype('<u8')  # Document offsets
+
+
+def _map(path, dtype, count):
+    """Memory-maps `count` values of `dtype` from a file (an empty array for an empty file)."""
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+
+class CorpusStoreWriter:
+    def __init__(self, directory, vocabulary=None):
+        """Starts a new store in `directory`, replacing any store already there once `close` is called.
+
+        Parameters:
+        - directory (str or Path): The store directory; created if needed.
+        - vocabulary (Vocabulary, optional): Vocabulary to extend. A new one is created if None.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / "store.json").unlink(missing_ok=True)  # The store is incomplete until closed
+        self.vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        self.offsets = [0]
+        self._tokens = open(self.directory / "tokens.bin.tmp", "wb")
+
+    def add_document(self, text) -> int:
+        """Encodes and appends a lemmatised document, returning its document id.
+
+        Parameters:
+        - text (str or list): The lemmatised text, as a space-separated string or a list of lemmas.
+        """
+        token_ids = np.frombuffer(self.vocabulary.encode(text), dtype=np.uint32)
+        self._tokens.write(token_ids.astype(TOKEN_DTYPE, copy=False).tobytes())
+        self.offsets.append(self.offsets[-1] + len(token_ids))
+        return len(self.offsets) - 2
+
+    def close(self, fingerprint=None, model_version=None, files=None) -> None:
+        """Writes the offsets, vocabulary and metadata, and moves every file into place.
+
+        Parameters:
+        - fingerprint (str, optional): Fingerprint of the corpus files (see `corpus_fingerprint`).
+        - model_version (str, optional): Version key of the lemmatiser that produced the lemmas.
+        - files (list, optional): Corpus file paths, relative to the corpus folder.
+        """
+        self._tokens.close()
+        np.asarray(self.offsets, dtype=OFFSET_DTYPE).tofile(self.directory / "offsets.bin.tmp")
+        with open(self.directory / "vocabulary.txt.tmp", "w", encoding="utf-8") as f:
+            f.write("\n".join(self.vocabulary.lemmas))
+        for name in ("tokens.bin", "offsets.bin", "vocabulary.txt"):
+            os.replace(self.directory / f"{name}.tmp", self.directory / name)
+
+        metadata = {
+            "format": CORPUS_STORE_FORMAT,
+            "documents": len(self.offsets) - 1,
+            "tokens": self.offsets[-1],
+            "lemmas": len(self.vocabulary),
+            "fingerprint": fingerprint,
+            "model_version": model_version,
+            "files": list(files or [])
+        }
+        with open(self.directory / "store.json.tmp", "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False)
+        os.replace(self.directory / "store.json.tmp", self.directory / "store.json")
+
+
+class _MappedDocuments:
+    """Read-only sequence of the documents of a store, as views of the token memory map."""
+
+    def __init__(self, tokens, offsets):
+        self.tokens = tokens
+        self.offsets = offsets
+
+    def __getitem__(self, doc_id):
+        if doc_id < 0:
+            doc_id += len(self)
+        if not 0 <= doc_id < len(self):
+            raise IndexError("document id out of range")
+        return self.tokens[int(self.offsets[doc_id]):int(self.offsets[doc_id + 1])]
+
+    def __iter__(self):
+        bounds = self.offsets.tolist()
+        return (self.tokens[start:end] for start, end in zip(bounds, bounds[1:]))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+class MappedCorpus(TokenCorpus):
+    def __init__(self, vocabulary, tokens, offsets, metadata=None):
+        """Initialises a corpus over token and offset arrays; use `open` to map a store.
+
+        Parameters:
+        - vocabulary (Vocabulary): The lemma ↔ id mapping of the store.
+        - tokens (numpy.ndarray): Token ids of all documents, concatenated.
+        - offsets (numpy.ndarray): Start of each document in `tokens`, plus the total.
+        - metadata (dict, optional): The contents of store.json.
+
+        Attributes:
+        - documents (sequence): Document i is `tokens[offsets[i]:offsets[i + 1]]`, a view without a copy.
+        """
+        self.vocabulary = vocabulary
+        self.tokens = tokens
+        self.offsets = offsets
+        self.metadata = dict(metadata or {})
+        self.documents = _MappedDocuments(tokens, offsets)
+
+    @staticmethod
+    def exists(directory) -> bool:
+        """Returns whether `directory` holds a complete store."""
+        return (Path(directory) / "store.json").is_file()
+
+    @classmethod
+    def open(cls, directory):
+        """Memory-maps a store written by CorpusStoreWriter.
+
+        Parameters:
+        - directory (str or Path): The store directory.
+
+        Returns:
+        - MappedCorpus: The corpus; only the vocabulary is read into memory.
+
+        Raises:
+        - FileNotFoundError: If the directory holds no complete store.
+        - ValueError: If the store was written in an unsupported format.
+        """
+        directory = Path(directory)
+        with open(directory / "store.json", "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+        if metadata.get("format") != CORPUS_STORE_FORMAT:
+            raise ValueError(f"unsupported corpus store format in {directory}: {metadata.get('format')}")
+
+        with open(directory / "vocabulary.txt", "r", encoding="utf-8") as f:
+            lemmas_text = f.read()
+        vocabulary = Vocabulary(lemmas_text.split("\n") if lemmas_text else [])
+        tokens = _map(directory / "tokens.bin", TOKEN_DTYPE, metadata["tokens"])
+        offsets = _map(directory / "offsets.bin", OFFSET_DTYPE, metadata["documents"] + 1)
+        return cls(vocabulary, tokens, offsets, metadata)
+
+    def matches(self, fingerprint: str) -> bool:
+        """Returns whether the store was built from a corpus with the given fingerprint."""
+        return self.metadata.get("fingerprint") is not None and self.metadata["fingerprint"] == fingerprint
+
+    def add_document(self, text) -> int:
+        raise TypeError("a MappedCorpus is read-only; write documents with CorpusStoreWriter")
+
+    def token_count(self) -> int:
+        """Returns the total number of tokens in the corpus."""
+        return len(self.tokens)
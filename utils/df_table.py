@@ -0,0 +1,168 @@
+# File path: utils/df_table.py
+
+""" df_table.py
+
+This module provides a compact, persisted document-frequency (DF) table of a corpus: the number of
+documents containing each lemma, the total number of documents and a fingerprint of the corpus files.
+With a saved table, an analysis group can be scored against a fixed reference corpus without
+lemmatising, or even having, the corpus texts.
+
+Class:
+- DocumentFrequencyTable: Lemma → document count table with the corpus size and fingerprint.
+
+Functions:
+- corpus_fingerprint: Hashes the contents and relative paths of the corpus files and the model version.
+
+Dependencies:
+- numpy: For the document frequency column and the `.npz` file format.
+- json: For the table metadata.
+- utils.corpus_manifest: Content hashes of the corpus files.
+
+Usage:
+>>> corpus, total = creating_corpus("greek_texts/texts", df_table_path="texts_df.npz")
+>>> table = DocumentFrequencyTable.load("texts_df.npz")
+>>> calculate_idf(None, word_objects, df_table=table)
+
+Notes:
+- The file is a NumPy `.npz` archive holding the lemmas (UTF-8, newline-separated), their document
+  frequencies (uint32) and the metadata as JSON; nothing is pickled.
+"""
+
+import os
+import json
+import hashlib
+import numpy as np
+from .corpus_manifest import _hash_file
+
+DF_TABLE_FORMAT = 1  # Version of the file layout
+
+
+def corpus_fingerprint(file_paths, folder_path, model_version) -> str:
+    """Hashes the contents and relative paths of the corpus files and the lemmatiser model version.
+
+    Parameters:
+    - file_paths (list): The corpus files, in corpus order.
+    - folder_path (str): The corpus folder; paths are hashed relative to it.
+    - model_version (str): Version key of the lemmatiser.
+
+    Returns:
+    - str: A hex digest that changes whenever a file is added, removed, renamed or edited, or the model changes.
+    """
+    digest = hashlib.sha1(f"model {model_version}\n".encode("utf-8"))
+    for file_path in file_paths:
+        relative_path = os.path.relpath(file_path, folder_path)
+        digest.update(f"{relative_path}\0{_hash_file(file_path)}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class DocumentFrequencyTable:
+    def __init__(self, lemmas, document_frequencies, document_count, fingerprint=None, model_version=None,
+                 files=None):
+        """Initialises a table from its columns.
+
+        Parameters:
+        - lemmas (list): The lemmas of the corpus.
+        - document_frequencies (array-like): Number of documents containing each lemma.
+        - document_count (int): Total number of documents in the corpus.
+        - fingerprint (str, optional): Fingerprint of the corpus files (see `corpus_fingerprint`).
+        - model_version (str, optional): Version key of the lemmatiser that produced the lemmas.
+        - files (list, optional): Corpus file paths, relative to the corpus folder.
+        """
+        self.lemmas = list(lemmas)
+        self.document_frequencies = np.asarray(document_frequencies, dtype=np.int64).reshape(len(self.lemmas))
+        self.document_count = int(document_count)
+        self.fingerprint = fingerprint
+        self.model_version = model_version
+        self.files = list(files or [])
+        self.ids = {lemma: term_id for term_id, lemma in enumerate(self.lemmas)}  # Lemma -> row
+
+    @classmethod
+    def from_corpus(cls, corpus, fingerprint=None, model_version=None, files=None):
+        """Builds the table of a TokenCorpus.
+
+        Parameters:
+        - corpus (TokenCorpus): The lemmatised corpus.
+        - fingerprint, model_version, files: Stored with the table (see `__init__`).
+
+        Returns:
+        - DocumentFrequencyTable: The table; lemmas found in no document are left out.
+        """
+        counts = np.zeros(len(corpus.vocabulary), dtype=np.int64)
+        for document in corpus:
+            token_ids = np.frombuffer(document, dtype=np.uint32) if document.itemsize == 4 \
+                else np.asarray(document, dtype=np.uint32)
+            counts[np.unique(token_ids)] += 1  # Each document counts once per lemma
+        present = np.flatnonzero(counts)
+        lemmas = corpus.vocabulary.lemmas
+        return cls([lemmas[term_id] for term_id in present.tolist()], counts[present], len(corpus),
+                   fingerprint, model_version, files)
+
+    def document_frequency(self, lemma: str) -> int:
+        """Returns the number of documents containing `lemma` (0 if it is not in the corpus)."""
+        row = self.ids.get(lemma)
+        return 0 if row is None else int(self.document_frequencies[row])
+
+    def document_frequency_of(self, lemmas) -> np.ndarray:
+        """Returns the document frequency of each lemma (0 for lemmas not in the corpus)."""
+        get_row = self.ids.get
+        rows = np.array([-1 if (row := get_row(lemma)) is None else row for lemma in lemmas], dtype=np.int64)
+        frequencies = np.zeros(len(rows), dtype=np.int64)
+        found = rows >= 0
+        frequencies[found] = self.document_frequencies[rows[found]]
+        return frequencies
+
+    def matches(self, fingerprint: str) -> bool:
+        """Returns whether the table was built from a corpus with the given fingerprint."""
+        return self.fingerprint is not None and self.fingerprint == fingerprint
+
+    def save(self, path) -> None:
+        """Writes the table to a `.npz` file, replacing it atomically.
+
+        Parameters:
+        - path (str or Path): Target file; should end in `.npz`.
+        """
+        metadata = {
+            "format": DF_TABLE_FORMAT,
+            "document_count": self.document_count,
+            "fingerprint": self.fingerprint,
+            "model_version": self.model_version,
+            "files": self.files
+        }
+        temporary_file = f"{path}.tmp"
+        with open(temporary_file, "wb") as f:
+            np.savez_compressed(
+                f,
+                lemmas=np.frombuffer("\n".join(self.lemmas).encode("utf-8"), dtype=np.uint8),
+                document_frequencies=self.document_frequencies.astype(np.uint32),
+                metadata=np.frombuffer(json.dumps(metadata, ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+            )
+        os.replace(temporary_file, path)
+
+    @classmethod
+    def load(cls, path):
+        """Reads a table written by `save`.
+
+        Parameters:
+        - path (str or Path): The `.npz` file.
+
+        Returns:
+        - DocumentFrequencyTable: The table.
+
+        Raises:
+        - ValueError: If the file was written in an unsupported format.
+        """
+        with np.load(path, allow_pickle=False) as archive:
+            metadata = json.loads(archive["metadata"].tobytes().decode("utf-8"))
+            if metadata.get("format") != DF_TABLE_FORMAT:
+                raise ValueError(f"unsupported DF table format in {path}: {metadata.get('format')}")
+            lemmas_text = archive["lemmas"].tobytes().decode("utf-8")
+            document_frequencies = archive["document_frequencies"]
+        lemmas = lemmas_text.split("\n") if lemmas_text else []
+        return cls(lemmas, document_frequencies, metadata["document_count"], metadata.get("fingerprint"),
+                   metadata.get("model_version"), metadata.get("files"))
+
+    def __contains__(self, lemma):
+        return lemma in self.ids
+
+    def __len__(self):
+        return len(self.lemmas)
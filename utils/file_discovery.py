@@ -0,0 +1,142 @@
+# File path: utils/file_discovery.py
+
+""" file_discovery.py
+
+This module finds the text files of a corpus or analysis folder with `os.scandir`. Files are selected
+with include and exclude glob patterns, returned in sorted order, and carry the size and modification
+time read during the scan, so later stages (size-balanced scheduling, incremental manifests, run
+reports) do not stat each file again.
+
+Class:
+- DiscoveredFile: A file path (a `str`) carrying the size and modification time read during discovery.
+
+Functions:
+- discover_files: Recursively finds the files of a folder matching include/exclude patterns.
+- file_size: Returns the size of a file, from discovery if available.
+- file_stat: Returns the size and modification time (ns) of a file, from discovery if available.
+
+Dependencies:
+- os: `os.scandir` for the traversal.
+- fnmatch: For the glob patterns.
+- concurrent.futures: Threads for the optional parallel traversal.
+
+Usage:
+>>> files = discover_files("greek_texts/texts")
+>>> files[0], files[0].size
+('greek_texts/texts/...', 10423)
+>>> discover_files("corpus", include=("*.txt", "*.xml"), exclude=("drafts/*",), workers=8)
+
+Notes:
+- Patterns without a '/' match file and folder names; patterns with a '/' match paths relative to the root.
+- Files without an extension (e.g. `greek_texts/texts/arartus`) are included unless `extensionless=False`.
+- Hidden files and folders are excluded by default; symbolic links to folders are not followed, as in `os.walk`.
+"""
+
+import os
+from fnmatch import fnmatch
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_INCLUDE = ("*.txt",)  # Files selected by name, besides files without an extension
+DEFAULT_EXCLUDE = (".*",)  # Hidden files and folders
+
+
+class DiscoveredFile(str):
+    """A file path, usable wherever a path string is, with the `size` and `mtime_ns` read during discovery."""
+
+    def __new__(cls, path, size, mtime_ns):
+        discovered = super().__new__(cls, path)
+        discovered.size = size
+        discovered.mtime_ns = mtime_ns
+        return discovered
+
+    def __reduce__(self):
+        return DiscoveredFile, (str(self), self.size, self.mtime_ns)
+
+
+def _matches(name: str, relative_path: str, patterns) -> bool:
+    """Returns whether a name, or its path relative to the root (for patterns with a '/'), matches a pattern."""
+    return any(fnmatch(relative_path if "/" in pattern else name, pattern) for pattern in patterns)
+
+
+def _scan_directory(directory, relative_directory, include, exclude, extensionless):
+    """Scans one folder and returns (its matching files, its subfolders to traverse)."""
+    files, subdirectories = [], []
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return files, subdirectories  # Unreadable folder: skipped, as os.walk does
+    for entry in entries:
+        relative_path = f"{relative_directory}{entry.name}"
+        if _matches(entry.name, relative_path, exclude):
+            continue
+        try:
+            if entry.is_dir():
+                if not entry.is_symlink():
+                    subdirectories.append((entry.path, f"{relative_path}/"))
+            elif entry.is_file() and (_matches(entry.name, relative_path, include)
+                                      or (extensionless and "." not in entry.name)):
+                stat = entry.stat()
+                files.append(DiscoveredFile(entry.path, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            continue  # Removed or unreadable since the folder was listed
+    return files, subdirectories
+
+
+def discover_files(root, include=DEFAULT_INCLUDE, exclude=DEFAULT_EXCLUDE, extensionless=True, workers=1) -> list:
+    """Recursively finds the files of a folder.
+
+    Parameters:
+    - root (str): The folder to search, or a single file (returned as is).
+    - include (tuple, optional): Glob patterns of the files to select. Defaults to ("*.txt",).
+    - exclude (tuple, optional): Glob patterns of the files and folders to skip. Defaults to hidden ones.
+    - extensionless (bool, optional): Also select files whose name has no extension. Defaults to True.
+    - workers (int, optional): Number of threads scanning folders in parallel. Defaults to 1.
+
+    Returns:
+    - list: DiscoveredFile paths, sorted. Empty if `root` does not exist.
+
+    Workflow:
+    1. Scans the folders one level at a time; with several workers, the folders of a level are scanned
+       by a thread pool (`os.scandir` releases the GIL while reading a folder).
+    2. Keeps the files matching `include` (or without an extension) and not `exclude`, with their stat.
+    3. Sorts the files by path.
+
+    Example:
+    >>> discover_files("greek_texts/groups/orphic")
+    """
+    root = os.fspath(root)
+    if os.path.isfile(root):
+        stat = os.stat(root)
+        return [DiscoveredFile(root, stat.st_size, stat.st_mtime_ns)]
+
+    files = []
+    level = [(root, "")]
+    pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        while level:
+            if pool is not None and len(level) > 1:
+                results = pool.map(lambda item: _scan_directory(*item, include, exclude, extensionless), level)
+            else:
+                results = (_scan_directory(*item, include, exclude, extensionless) for item in level)
+            level = []
+            for level_files, subdirectories in results:
+                files.extend(level_files)
+                level.extend(subdirectories)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    files.sort()
+    return files
+
+
+def file_stat(path) -> tuple:
+    """Returns (size, modification time in ns) of a file, without a system call for a DiscoveredFile."""
+    if isinstance(path, DiscoveredFile):
+        return path.size, path.mtime_ns
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def file_size(path) -> int:
+    """Returns the size of a file in bytes, without a system call for a DiscoveredFile."""
+    return path.size if isinstance(path, DiscoveredFile) else os.path.getsize(path)
@@ -7,13 +7,18 @@ from a given folder or directory structure.
 
 Functions:
 - get_data: Reads the content of a single text file and returns it as a string.
-- get_all_txt_file_paths: Retrieves all `.txt` file paths in a directory, including subdirectories.
+- iter_text_chunks: Streams the lines of one or more text files in chunks of bounded size.
+- get_all_txt_file_paths: Retrieves all text file paths in a directory, including subdirectories, in sorted order.
+- get_cache_dir: Returns (and creates) the directory used for persistent caches.
+- get_analysis_groups: Resolves a list of analysis group folders, or the subfolders of a parent folder.
 
 Usage:
 These functions are used to load data for text processing workflows.
 """
 
 import os
+from pathlib import Path
+from .file_discovery import DEFAULT_INCLUDE, DEFAULT_EXCLUDE, discover_files
 
 
 def get_data(filename: str) -> str:
@@ -33,38 +38,95 @@ def get_data(filename: str) -> str:
         return f.read()
 
 
-def get_all_txt_file_paths(main_folder):
-    """Retrieves all `.txt` file paths from a folder, including subdirectories.
+def iter_text_chunks(file_paths, chunk_size=1 << 16):
+    """Streams text files as chunks of whole lines, so large texts are never held in memory at once.
 
     Parameters:
-    - main_folder (str): The path to the main folder or `.txt` file.
+    - file_paths (list): Paths of the files to read, in order.
+    - chunk_size (int, optional): Approximate number of characters per chunk. Defaults to 65,536.
+
+    Yields:
+    - str: Consecutive chunks of whole lines. Files are separated by a newline, as if they had been
+      joined with '\\n'.
+
+    Example:
+    >>> for chunk in iter_text_chunks(["a.txt", "b.txt"]):
+    ...     print(len(chunk))
+    """
+    lines = []
+    size = 0
+    for path in file_paths:
+        with open(path, "r") as f:
+            for line in f:
+                lines.append(line)
+                size += len(line)
+                if size >= chunk_size:
+                    yield ''.join(lines)
+                    lines, size = [], 0
+        if lines and not lines[-1].endswith('\n'):
+            lines[-1] += '\n'  # Keep the last line of a file apart from the first line of the next
+    if lines:
+        yield ''.join(lines)
+
+
+def get_all_txt_file_paths(main_folder, include=DEFAULT_INCLUDE, exclude=DEFAULT_EXCLUDE, workers=1,
+                           extensionless=True):
+    """Retrieves all text file paths from a folder, including subdirectories.
+
+    Parameters:
+    - main_folder (str): The path to the main folder or a single text file.
+    - include (tuple, optional): Glob patterns of the files to select. Defaults to ("*.txt",).
+    - exclude (tuple, optional): Glob patterns of the files and folders to skip. Defaults to hidden ones.
+    - workers (int, optional): Number of threads scanning folders in parallel. Defaults to 1.
+    - extensionless (bool, optional): Also select files whose name has no extension. Defaults to True;
+      False selects only the files matching `include`.
 
     Returns:
-    - list: A list of file paths pointing to `.txt` files.
+    - list: Sorted file paths, as DiscoveredFile strings carrying each file's size and modification time.
 
     Workflow:
-    - If `main_folder` is a single `.txt` file, it adds that to the list.
-    - Otherwise, it recursively searches for `.txt` files in the folder and subfolders.
+    - If `main_folder` is a single file, it is returned on its own.
+    - Otherwise, the folder and its subfolders are scanned with `discover_files`.
 
     Example:
     >>> txt_files = get_all_txt_file_paths("my_folder")
     >>> print(txt_files)
 
     Notes:
-    - Uses os.walk to traverse the directory structure.
-    - Filters files with `.txt` extension.
+    - Selects `.txt` files and, unless `extensionless` is False, files without an extension
+      (e.g. `greek_texts/texts/arartus`).
+    """
+    return discover_files(main_folder, include=include, exclude=exclude, extensionless=extensionless, workers=workers)
+
+
+def get_cache_dir() -> Path:
+    """Returns the directory used for persistent caches, creating it if needed.
+
+    Returns:
+    - Path: `$TFIDF_GREEK_CACHE` if set, otherwise `~/.cache/tfidf_greek`.
+
+    Example:
+    >>> cache_file = get_cache_dir() / "lemmas.sqlite"
+    """
+    cache_dir = Path(os.environ.get("TFIDF_GREEK_CACHE", Path.home() / ".cache" / "tfidf_greek")).expanduser()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def get_analysis_groups(analysis_paths) -> list:
+    """Resolves the analysis groups of a batch run.
+
+    Parameters:
+    - analysis_paths (str or list): A list of group folders, or a single parent folder whose subfolders are the groups.
+
+    Returns:
+    - list: Paths of the analysis groups. A parent folder without subfolders is treated as a single group.
+
+    Example:
+    >>> get_analysis_groups("greek_texts/groups")
+    ['greek_texts/groups/orphic', 'greek_texts/groups/stoic']
     """
-    txt_file_paths = []
-
-    # If the provided path itself is a `.txt` file
-    if main_folder.endswith('.txt'):
-        txt_file_paths.append(main_folder)
-    else:
-        # Walk through the directory structure
-        for root, _, files in os.walk(main_folder):
-            for file in files:
-                if file.endswith('.txt'):
-                    # Construct the full path and add to the list
-                    txt_file_paths.append(os.path.join(root, file))
-
-    return txt_file_paths
+    if isinstance(analysis_paths, (str, os.PathLike)):
+        subfolders = sorted(entry.path for entry in os.scandir(analysis_paths) if entry.is_dir())
+        return subfolders or [str(analysis_paths)]
+    return [str(path) for path in analysis_paths]
@@ -0,0 +1,160 @@
+# File path: utils/instrumentation.py
+
+""" instrumentation.py
+
+This module provides the run report used to instrument the analysis pipeline: stage timers used as
+context managers, optional cProfile and tracemalloc capture per stage, and named counters (files, bytes,
+tokens, lemmas, cache hits). The report is emitted as JSON and embedded into `metadata.yaml`.
+
+Class:
+- RunReport: Stage timings, profiles, peak memory and counters of one run.
+
+Functions:
+- peak_rss_bytes: Returns the peak resident set size of the process.
+
+Dependencies:
+- time: For the stage timers.
+- cProfile, pstats: For optional per-stage profiles.
+- tracemalloc: For optional per-stage peak memory.
+- resource: For the peak resident set size of the process, where available.
+- json: For the JSON run report.
+- utils.file_discovery: For the sizes of counted files.
+
+Usage:
+>>> report = RunReport(profile=True)
+>>> with report.stage("creating_corpus"):
+...     corpus, total = creating_corpus("greek_texts/texts")
+>>> report.count("corpus_tokens", corpus.token_count())
+>>> report.save("run_report.json")
+
+Notes:
+- A stage entered several times (e.g. once per analysis group) accumulates its seconds and calls.
+- Stages should not be nested when profiling, since only one profiler can be active at a time.
+"""
+
+import sys
+import json
+import time
+import cProfile
+import pstats
+import tracemalloc
+import contextlib
+from datetime import datetime
+from .file_discovery import file_size
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def peak_rss_bytes():
+    """Returns the peak resident set size of the process in bytes, or None where it is unavailable."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024  # Kilobytes on Linux
+
+
+def _profile_summary(profiler, top_n) -> list:
+    """Returns the `top_n` functions of a profile by cumulative time."""
+    stats = pstats.Stats(profiler).stats  # (file, line, function) -> (calls, primitive calls, tottime, cumtime, callers)
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:top_n]
+    return [{
+        "function": f"{file_name}:{line}({function})",
+        "calls": calls,
+        "total_seconds": total_time,
+        "cumulative_seconds": cumulative_time
+    } for (file_name, line, function), (_, calls, total_time, cumulative_time, _) in rows]
+
+
+class RunReport:
+    def __init__(self, profile=False, trace_memory=False, profile_top_n=20):
+        """Initialises an empty run report.
+
+        Parameters:
+        - profile (bool, optional): Whether to capture a cProfile profile of each stage. Defaults to False.
+        - trace_memory (bool, optional): Whether to trace the peak memory of each stage. Defaults to False.
+        - profile_top_n (int, optional): Number of functions kept per stage profile. Defaults to 20.
+        """
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.profile_top_n = profile_top_n
+        self.started = datetime.now()
+        self._start = time.perf_counter()
+        self.stages = {}  # Stage name -> measurements, in the order stages were first entered
+        self.counters = {}  # Counter name -> value
+        self._profilers = {}  # Stage name -> cProfile.Profile, reused when a stage is entered again
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Times the enclosed block as stage `name`, with a profile and peak memory if enabled.
+
+        Parameters:
+        - name (str): Name of the stage.
+
+        Yields:
+        - dict: The measurements of the stage; callers may add their own fields.
+        """
+        entry = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+        profiler = self._profilers.setdefault(name, cProfile.Profile()) if self.profile else None
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        if profiler is not None:
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            seconds = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+                entry["profile"] = _profile_summary(profiler, self.profile_top_n)
+            if self.trace_memory:
+                entry["peak_memory_bytes"] = max(entry.get("peak_memory_bytes", 0), tracemalloc.get_traced_memory()[1])
+            if started_tracing:
+                tracemalloc.stop()
+            entry["seconds"] += seconds
+            entry["calls"] += 1
+
+    def count(self, name: str, value=1) -> None:
+        """Adds `value` to the counter `name`."""
+        self.counters[name] = self.counters.get(name, 0) + int(value)
+
+    def count_files(self, prefix: str, file_paths) -> None:
+        """Counts the files and their total size in bytes as `<prefix>_files` and `<prefix>_bytes`."""
+        self.count(f"{prefix}_files", len(file_paths))
+        self.count(f"{prefix}_bytes", sum(file_size(file_path) for file_path in file_paths))
+
+    def count_changes(self, prefix: str, before: dict, after: dict, keys) -> None:
+        """Counts the change of each of `keys` between two snapshots of counters, e.g. cache statistics."""
+        for key in keys:
+            self.count(f"{prefix}_{key}", after[key] - before[key])
+
+    def to_dict(self) -> dict:
+        """Returns the report as plain Python values, ready for JSON or YAML.
+
+        Returns:
+        - dict: Start time, wall-clock and staged seconds, options, stages, counters and the peak RSS.
+        """
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "wall_seconds": time.perf_counter() - self._start,
+            "staged_seconds": sum(entry["seconds"] for entry in self.stages.values()),
+            "options": {"profile": self.profile, "trace_memory": self.trace_memory},
+            "stages": {name: dict(entry) for name, entry in self.stages.items()},
+            "counters": dict(self.counters),
+            "peak_rss_bytes": peak_rss_bytes()
+        }
+
+    def to_json(self, indent=2) -> str:
+        """Returns the report as a JSON string."""
+        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+
+    def save(self, path) -> None:
+        """Writes the report as JSON to `path`."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
@@ -0,0 +1,102 @@
+# File path: utils/inverted_index.py
+
+""" inverted_index.py
+
+This module defines the `InvertedIndex` class, which maps every lemma of a corpus to its postings list,
+so that document frequencies can be read with a single dictionary lookup instead of rescanning the corpus.
+
+Class:
+- InvertedIndex: Lemma → postings list of (document id, term count) pairs.
+
+Functions:
+- build_inverted_index: Builds an InvertedIndex from a TokenCorpus or a list of lemmatised corpus texts.
+
+Dependencies:
+- collections.Counter: To count lemmas per document.
+- utils.vocabulary: TokenCorpus documents are indexed by integer token id.
+
+Usage:
+Build the index once with `creating_corpus(..., with_index=True)` or `build_inverted_index`, then pass it to
+`word_search` or `calculate_idf`. The same index can be reused for any number of analysis groups.
+"""
+
+from collections import Counter
+from .vocabulary import TokenCorpus
+
+
+class InvertedIndex:
+    def __init__(self, vocabulary=None):
+        """Initialises an empty inverted index.
+
+        Parameters:
+        - vocabulary (Vocabulary, optional): If given, postings are keyed by integer token id and lemmas
+          are translated through the vocabulary.
+
+        Attributes:
+        - postings (dict): Term (lemma or token id) → list of (document id, term count) tuples, ordered by document id.
+        - document_count (int): Number of documents added to the index.
+        """
+        self.vocabulary = vocabulary
+        self.postings = {}  # Term -> [(doc_id, count), ...]
+        self.document_count = 0  # Number of indexed documents
+
+    def _term(self, lemma):
+        return self.vocabulary.get_id(lemma) if self.vocabulary is not None else lemma
+
+    def add_document(self, text) -> int:
+        """Adds a lemmatised document to the index.
+
+        Parameters:
+        - text (str, list or array): The lemmatised text, as a space-separated string, a list of lemmas,
+          or an array of token ids when the index has a vocabulary.
+
+        Returns:
+        - int: The document id assigned to the text.
+        """
+        doc_id = self.document_count
+        tokens = text.split() if isinstance(text, str) else text
+        if self.vocabulary is not None and isinstance(tokens, list):
+            tokens = self.vocabulary.encode(tokens)
+        elif hasattr(tokens, "tolist"):
+            tokens = tokens.tolist()  # Token ids of a memory-mapped document, as Python ints
+        for term, count in Counter(tokens).items():
+            self.postings.setdefault(term, []).append((doc_id, count))
+        self.document_count += 1
+        return doc_id
+
+    def get_postings(self, lemma: str) -> list:
+        """Returns the postings list of a lemma (an empty list if the lemma is not indexed)."""
+        return self.postings.get(self._term(lemma), [])
+
+    def document_frequency(self, lemma: str) -> int:
+        """Returns the number of documents in which the lemma appears."""
+        return len(self.postings.get(self._term(lemma), ()))
+
+    def __contains__(self, lemma):
+        return self._term(lemma) in self.postings
+
+    def __len__(self):
+        return len(self.postings)
+
+
+def build_inverted_index(corpus: list) -> InvertedIndex:
+    """Builds an inverted index from a corpus of lemmatised texts.
+
+    Parameters:
+    - corpus (TokenCorpus or list): The corpus; the position of each text is its document id.
+      A TokenCorpus is indexed by token id over its vocabulary.
+
+    Returns:
+    - InvertedIndex: The populated index.
+
+    Example:
+    >>> index = build_inverted_index(["apple orange apple", "banana apple"])
+    >>> index.get_postings("apple")
+    [(0, 2), (1, 1)]
+    >>> index.document_frequency("orange")
+    1
+    """
+    index = InvertedIndex(corpus.vocabulary if isinstance(corpus, TokenCorpus) else None)
+    for text in corpus:
+        index.add_document(text)
+    return index
@@ -0,0 +1,203 @@
+# File path: utils/lemma_cache.py
+
+""" lemma_cache.py
+
+This module provides a token → lemma memoisation layer for the CLTK lemmatiser.
+Lemmas are kept in an in-memory LRU and persisted to an SQLite file, keyed by the lemmatiser
+model version, so repeated runs over the same corpus skip almost all lemmatiser work.
+
+Class:
+- LemmaCache: Wraps a lemmatiser and exposes the same `lemmatize` method, with hit/miss counters.
+
+Functions:
+- model_version_key: Builds a version key from the CLTK version, a model name and its model files.
+- get_model_version: Builds the version key of a lemmatiser object.
+
+Dependencies:
+- sqlite3: Persistent token → lemma store.
+- hashlib: For hashing the model version key.
+- collections: OrderedDict for the in-memory LRU, Counter for token counts.
+
+Usage:
+The `lemmatizer` global in `text_processing` is a LemmaCache; call `lemmatizer.stats()` to inspect hit rates.
+
+Notes:
+- Every lemmatiser in the GreekBackoffLemmatizer chain decides from the token alone, so caching per token
+  returns exactly the same lemmas as calling the lemmatiser directly.
+- A LemmaCache is not thread-safe: use it from one thread at a time (the analysis server lemmatises on a
+  single dedicated thread). Each process and thread gets its own SQLite connection.
+"""
+
+import os
+import sqlite3
+import threading
+import hashlib
+from collections import Counter, OrderedDict
+
+
+def model_version_key(model_name: str, models_path=None) -> str:
+    """Builds a version key from the CLTK version, a model name and the files of its model directory.
+
+    Parameters:
+    - model_name (str): Name of the lemmatiser class, e.g. "GreekBackoffLemmatizer".
+    - models_path (str, optional): Directory of the model files.
+
+    Returns:
+    - str: A short hash of the CLTK version and the size and modification time of every model file.
+    """
+    from importlib.metadata import version, PackageNotFoundError
+
+    try:
+        parts = [f"cltk {version('cltk')}"]
+    except PackageNotFoundError:
+        parts = ["cltk unknown"]
+    parts.append(model_name)
+
+    if models_path and os.path.isdir(models_path):
+        for name in sorted(os.listdir(models_path)):
+            stat = os.stat(os.path.join(models_path, name))
+            parts.append(f"{name}:{stat.st_size}:{int(stat.st_mtime)}")
+
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def get_model_version(model) -> str:
+    """Builds a version key for a lemmatiser model.
+
+    Parameters:
+    - model (object): The lemmatiser. Its `models_path` attribute, if any, is used to fingerprint the model files.
+
+    Returns:
+    - str: The key of `model_version_key` for the model's class and model directory.
+    """
+    return model_version_key(type(model).__name__, getattr(model, "models_path", None))
+
+
+class LemmaCache:
+    def __init__(self, model, cache_path=None, model_version=None, maxsize=200_000):
+        """Initialises the cache around a lemmatiser.
+
+        Parameters:
+        - model (object): The wrapped lemmatiser, e.g. GreekBackoffLemmatizer.
+        - cache_path (str or Path, optional): SQLite file for the persistent store. In-memory only if None.
+        - model_version (str, optional): Version key of the model. Computed with `get_model_version` if None.
+        - maxsize (int, optional): Maximum number of tokens kept in the in-memory LRU. Defaults to 200,000.
+        """
+        self.model = model  # The wrapped lemmatiser
+        self.cache_path = str(cache_path) if cache_path else None
+        self.model_version = model_version or get_model_version(model)
+        self.maxsize = maxsize
+        self.memory = OrderedDict()  # token -> lemma, least recently used first
+        self.hits = 0  # Tokens answered from memory or disk
+        self.disk_hits = 0  # Subset of hits answered from disk
+        self.misses = 0  # Tokens sent to the lemmatiser
+        self._connection = None
+        self._owner = None  # (process id, thread id) that opened the connection
+
+    def _connect(self):
+        """Opens the SQLite store, reopening it after a fork or in another thread, since SQLite connections
+        cannot be shared between processes or (by default) threads."""
+        if self.cache_path is None:
+            return None
+        owner = (os.getpid(), threading.get_ident())
+        if self._connection is None or self._owner != owner:
+            self._connection = sqlite3.connect(self.cache_path, timeout=30)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS lemmas ("
+                "version TEXT NOT NULL, token TEXT NOT NULL, lemma TEXT, "
+                "PRIMARY KEY (version, token))"
+            )
+            self._owner = owner
+        return self._connection
+
+    def _remember(self, token, lemma):
+        self.memory[token] = lemma
+        self.memory.move_to_end(token)
+        if len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+    def _load_from_disk(self, tokens) -> dict:
+        connection = self._connect()
+        if connection is None or not tokens:
+            return {}
+        found = {}
+        tokens = list(tokens)
+        for start in range(0, len(tokens), 500):  # Stay below SQLite's bound parameter limit
+            chunk = tokens[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = connection.execute(
+                f"SELECT token, lemma FROM lemmas WHERE version = ? AND token IN ({placeholders})",
+                [self.model_version, *chunk]
+            )
+            found.update(rows)
+        return found
+
+    def _save_to_disk(self, lemmas: dict):
+        connection = self._connect()
+        if connection is None or not lemmas:
+            return
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO lemmas (version, token, lemma) VALUES (?, ?, ?)",
+                    [(self.model_version, token, lemma) for token, lemma in lemmas.items()]
+                )
+        except sqlite3.OperationalError:
+            pass  # Another process holds the lock; the lemmas are simply recomputed next time
+
+    def lemmatize(self, tokens: list) -> list:
+        """Lemmatises a list of tokens, consulting the cache before the wrapped lemmatiser.
+
+        Parameters:
+        - tokens (list): Tokens to lemmatise.
+
+        Returns:
+        - list: (token, lemma) tuples, exactly as returned by the wrapped lemmatiser.
+        """
+        counts = Counter(tokens)
+        lemmas = {}
+        unknown = []
+        for token in counts:
+            if token in self.memory:
+                lemmas[token] = self.memory[token]
+                self.memory.move_to_end(token)
+            else:
+                unknown.append(token)
+
+        missed = 0
+        if unknown:
+            from_disk = self._load_from_disk(unknown)
+            missing = [token for token in unknown if token not in from_disk]
+            computed = dict(self.model.lemmatize(missing)) if missing else {}
+            self._save_to_disk(computed)
+            for token in unknown:
+                lemma = from_disk[token] if token in from_disk else computed[token]
+                lemmas[token] = lemma
+                self._remember(token, lemma)
+            self.disk_hits += sum(counts[token] for token in from_disk)
+            missed = sum(counts[token] for token in missing)
+
+        self.misses += missed
+        self.hits += len(tokens) - missed
+        return [(token, lemmas[token]) for token in tokens]
+
+    def stats(self) -> dict:
+        """Returns the hit/miss counters of the cache.
+
+        Returns:
+        - dict: 'hits', 'disk_hits', 'misses', 'hit_rate' and the number of tokens held in memory.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "memory_size": len(self.memory)
+        }
+
+    def __getattr__(self, name):
+        # Anything not handled by the cache is delegated to the wrapped lemmatiser
+        if name == "model":
+            raise AttributeError(name)
+        return getattr(self.model, name)
@@ -0,0 +1,186 @@
+# File path: utils/model_provisioning.py
+
+""" model_provisioning.py
+
+This module installs the CLTK Greek lemmatiser model (`grc_models_cltk`) from a local archive or
+directory, and provides the pre-flight check run before the lemmatiser is loaded. Nothing is
+downloaded unless explicitly requested, so startup never waits on the network.
+
+Class:
+- ModelNotProvisionedError: Raised when the model files are missing, with instructions to install them.
+
+Functions:
+- cltk_data_dir: Returns the CLTK data directory ($CLTK_DATA or ~/cltk_data), without importing CLTK.
+- greek_model_dir: Returns the directory the Greek model is installed in.
+- check_greek_model: Pre-flight check that the model files are present.
+- provision_greek_model: Installs the model from a local archive or directory.
+- download_greek_model: Fetches the model from the CLTK repository (explicit opt-in only).
+
+Dependencies:
+- shutil: For unpacking archives and copying directories.
+- tempfile: For staging the model next to its final location.
+
+Usage:
+python -m utils.model_provisioning path/to/grc_models_cltk.tar.gz
+python -m utils.model_provisioning path/to/grc_models_cltk/
+python -m utils.model_provisioning --download
+python -m utils.model_provisioning --check
+
+Notes:
+- The check stats a fixed list of files (REQUIRED_MODEL_FILES), so its cost does not depend on the
+  size of the model or of the data directory.
+- A model is staged next to its final location and moved into place only once complete, so an
+  interrupted install never leaves a partial model behind.
+"""
+
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+MODEL_NAME = "grc_models_cltk"
+REQUIRED_MODEL_FILES = (  # Files GreekBackoffLemmatizer loads, relative to the model directory
+    "lemmata/backoff/greek_lemmatized_sents.pickle",
+    "lemmata/backoff/greek_lemmata_cltk.pickle",
+    "lemmata/backoff/greek_model.pickle"
+)
+
+
+class ModelNotProvisionedError(FileNotFoundError):
+    """Raised when the Greek lemmatiser model is not installed."""
+
+
+def cltk_data_dir() -> Path:
+    """Returns the CLTK data directory, resolved as CLTK does ($CLTK_DATA, else ~/cltk_data)."""
+    return Path(os.path.expanduser(os.path.normpath(os.environ.get("CLTK_DATA", os.path.join("~", "cltk_data")))))
+
+
+def greek_model_dir(data_dir=None) -> Path:
+    """Returns the directory of the Greek model inside a CLTK data directory (the current one if None)."""
+    return Path(data_dir if data_dir is not None else cltk_data_dir()) / "grc" / "model" / MODEL_NAME
+
+
+def _missing_files(model_dir) -> list:
+    return [name for name in REQUIRED_MODEL_FILES if not os.path.isfile(os.path.join(model_dir, name))]
+
+
+def check_greek_model(model_dir=None) -> Path:
+    """Checks that every file of the Greek lemmatiser model is present.
+
+    Parameters:
+    - model_dir (str or Path, optional): The model directory. Defaults to `greek_model_dir()`.
+
+    Returns:
+    - Path: The model directory.
+
+    Raises:
+    - ModelNotProvisionedError: If a model file is missing.
+    """
+    model_dir = Path(model_dir) if model_dir is not None else greek_model_dir()
+    missing = _missing_files(model_dir)
+    if missing:
+        raise ModelNotProvisionedError(
+            f"The Greek lemmatiser model ({MODEL_NAME}) is not installed in {model_dir}: missing {', '.join(missing)}. "
+            f"Install it with `python -m utils.model_provisioning <archive or directory>`, "
+            f"or `python -m utils.model_provisioning --download` to fetch it from the CLTK repository."
+        )
+    return model_dir
+
+
+def _find_model_root(directory: Path) -> Path:
+    """Returns the folder of `directory` holding the model files (archives often wrap them in a folder)."""
+    for marker in sorted(directory.rglob(Path(REQUIRED_MODEL_FILES[-1]).name)):
+        root = marker.parents[len(Path(REQUIRED_MODEL_FILES[-1]).parts) - 1]
+        if not _missing_files(root):
+            return root
+    check_greek_model(directory)  # Raises with the list of missing files
+    return directory
+
+
+def _unpack_archive(archive, target) -> None:
+    try:
+        shutil.unpack_archive(str(archive), str(target), filter="data")  # Refuses paths outside `target`
+    except TypeError:
+        shutil.unpack_archive(str(archive), str(target))  # Python without archive extraction filters
+
+
+def provision_greek_model(source, model_dir=None, force=False) -> Path:
+    """Installs the Greek lemmatiser model from a local archive or directory.
+
+    Parameters:
+    - source (str or Path): A `.zip`, `.tar`, `.tar.gz`, `.tar.bz2` or `.tar.xz` archive, or a directory,
+      holding a copy of the `grc_models_cltk` repository (at its root or in a single sub-folder).
+    - model_dir (str or Path, optional): Where to install the model. Defaults to `greek_model_dir()`.
+    - force (bool, optional): Replace a complete installed model. Defaults to False.
+
+    Returns:
+    - Path: The installed model directory.
+
+    Raises:
+    - FileNotFoundError: If `source` does not exist.
+    - ModelNotProvisionedError: If `source` does not hold every model file.
+
+    Workflow:
+    1. Returns at once if the model is already installed and `force` is False.
+    2. Unpacks or copies `source` into a staging folder next to `model_dir`.
+    3. Checks that the staged model is complete, then moves it into place.
+    """
+    source = Path(source)
+    model_dir = Path(model_dir) if model_dir is not None else greek_model_dir()
+    if not source.exists():
+        raise FileNotFoundError(f"No such model archive or directory: {source}")
+    if not force and not _missing_files(model_dir):
+        return model_dir
+
+    model_dir.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix=f".{MODEL_NAME}.", dir=model_dir.parent) as staging:
+        staging = Path(staging)
+        if source.is_dir():
+            staged = staging / MODEL_NAME
+            shutil.copytree(_find_model_root(source), staged)
+        else:
+            _unpack_archive(source, staging / "archive")
+            staged = _find_model_root(staging / "archive")
+        check_greek_model(staged)
+
+        if model_dir.exists():
+            previous = staging / "previous"
+            os.replace(model_dir, previous)  # Removed with the staging folder
+        os.replace(staged, model_dir)
+    return model_dir
+
+
+def download_greek_model() -> Path:
+    """Fetches the Greek lemmatiser model from the CLTK repository. Only called on explicit request.
+
+    Returns:
+    - Path: The installed model directory.
+    """
+    from cltk.data.fetch import FetchCorpus
+
+    FetchCorpus(language="grc").import_corpus(MODEL_NAME)
+    return check_greek_model()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=f"Installs the CLTK Greek lemmatiser model ({MODEL_NAME}).")
+    parser.add_argument("source", nargs="?", help="archive or directory holding the model")
+    parser.add_argument("--download", action="store_true", help="fetch the model from the CLTK repository")
+    parser.add_argument("--check", action="store_true", help="only check that the model is installed")
+    parser.add_argument("--force", action="store_true", help="replace an installed model")
+    args = parser.parse_args()
+
+    try:
+        if args.check:
+            installed = check_greek_model()
+        elif args.download:
+            installed = download_greek_model()
+        elif args.source:
+            installed = provision_greek_model(args.source, force=args.force)
+        else:
+            parser.error("give an archive or directory, --download or --check")
+    except (ModelNotProvisionedError, FileNotFoundError) as e:
+        sys.exit(str(e))
+    print(f"{MODEL_NAME} is installed in {installed}")
@@ -0,0 +1,109 @@
+# File path: utils/model_snapshot.py
+
+""" model_snapshot.py
+
+This module saves a ready-to-use model object into a single versioned snapshot file and restores it,
+so a process can skip building the model from its data files. Building GreekBackoffLemmatizer loads
+its training sentences, shuffles them and trains a unigram tagger on every start; restoring its
+snapshot only unpickles the finished chain.
+
+Functions:
+- save_snapshot: Writes an object and its version key into a snapshot file.
+- load_snapshot: Restores an object from a snapshot file, if the file matches the expected version.
+- get_snapshot: Restores an object from its snapshot, building and saving it on a miss.
+
+File layout:
+- One line of JSON metadata (magic, format, model version, Python version), then the object pickled
+  with protocol 5.
+
+Dependencies:
+- pickle: For the object itself.
+- json: For the snapshot header.
+
+Usage:
+>>> model = get_snapshot(GreekBackoffLemmatizer, model_version, cache_dir / "lemmatizers" / "backoff.pickle")
+
+Notes:
+- A snapshot is only restored when its version key, snapshot format and Python version match, so a new
+  CLTK release or changed model files (both part of `model_version_key`) invalidate it.
+- Snapshots are pickles: they are written to, and only read from, the user's own cache directory.
+"""
+
+import os
+import sys
+import json
+import pickle
+
+SNAPSHOT_MAGIC = "tfidf_greek snapshot"  # First field of every snapshot header
+SNAPSHOT_FORMAT = 1  # Version of the file layout
+SNAPSHOT_PROTOCOL = 5  # Pickle protocol of the payload
+
+
+def _python_version() -> str:
+    return f"{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def save_snapshot(obj, path, model_version: str) -> None:
+    """Writes an object into a snapshot file, replacing it atomically.
+
+    Parameters:
+    - obj (object): The object to save; it must be picklable.
+    - path (str or Path): The snapshot file; its folder is created if needed.
+    - model_version (str): Version key the snapshot is valid for.
+    """
+    header = {
+        "magic": SNAPSHOT_MAGIC,
+        "format": SNAPSHOT_FORMAT,
+        "model_version": model_version,
+        "python": _python_version()
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary_file = f"{path}.{os.getpid()}.tmp"  # Per process, as pool workers may save concurrently
+    with open(temporary_file, "wb") as f:
+        f.write(json.dumps(header).encode("utf-8") + b"\n")
+        pickle.dump(obj, f, protocol=SNAPSHOT_PROTOCOL)
+    os.replace(temporary_file, path)
+
+
+def load_snapshot(path, model_version: str):
+    """Restores an object from a snapshot file.
+
+    Parameters:
+    - path (str or Path): The snapshot file.
+    - model_version (str): Version key the snapshot must have been saved with.
+
+    Returns:
+    - object: The restored object, or None if the file is missing, unreadable or outdated.
+    """
+    try:
+        with open(path, "rb") as f:
+            header = json.loads(f.readline().decode("utf-8"))
+            if (header.get("magic") != SNAPSHOT_MAGIC or header.get("format") != SNAPSHOT_FORMAT
+                    or header.get("model_version") != model_version or header.get("python") != _python_version()):
+                return None
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, EOFError, AttributeError, ImportError, pickle.UnpicklingError):
+        return None  # Damaged file or classes that changed since: build the object again
+
+
+def get_snapshot(build, model_version: str, path):
+    """Restores an object from its snapshot, or builds it and saves its snapshot.
+
+    Parameters:
+    - build (callable): Builds the object; only called if no valid snapshot exists.
+    - model_version (str): Version key of the object.
+    - path (str or Path): The snapshot file.
+
+    Returns:
+    - object: The restored or newly built object.
+    """
+    obj = load_snapshot(path, model_version)
+    if obj is None:
+        obj = build()
+        try:
+            save_snapshot(obj, path, model_version)
+        except (OSError, pickle.PicklingError):
+            pass  # A read-only cache only costs the next start a rebuild
+    return obj
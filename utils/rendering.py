@@ -0,0 +1,274 @@
+# File path: utils/rendering.py
+
+""" rendering.py
+
+This module provides the rendering layer shared by `generate_visualisations` and `save_results_to_folder`.
+Each figure (the bar chart of the top words and the TF-IDF word cloud) is built once, together with the
+WordCloud layout and its PNG encoding, and can then be displayed and saved any number of times.
+Figures that are only saved can be rendered in worker processes while the pipeline carries on.
+
+Classes:
+- ResultFigures: Lazily rendered, cached figures of one scored WordTable.
+- RenderExecutor: Process pool rendering figures in the background; its futures are joined at the end of a run.
+
+Functions:
+- layout_word_cloud: Lays out a WordCloud from word → TF-IDF score frequencies.
+- draw_bar_chart, draw_word_cloud: Draw a figure onto a matplotlib Figure.
+- render_png: Renders one figure headless and returns (and optionally writes) its PNG encoding.
+
+Dependencies:
+- matplotlib: For the figures; background renders use the Agg canvas and never touch pyplot.
+- wordcloud: For the word cloud layout.
+- concurrent.futures: For the rendering process pool.
+- io: For the cached PNG encodings.
+- utils.classes: Words are read from WordTable columns.
+
+Usage:
+>>> figures = generate_visualisations(words)                   # Renders and displays
+>>> save_results_to_folder(..., figures=figures)               # Reuses the same renderings
+>>> figures.close()
+
+>>> with RenderExecutor() as renderer:
+...     save_results_to_folder(..., render_executor=renderer)  # Figures are written by the workers
+...     ...                                                   # Next group is scored meanwhile
+...     renderer.join()
+
+Notes:
+- The WordCloud layout is the most expensive plotting step; sharing one ResultFigures between display
+  and saving computes it once instead of twice.
+- Only the top words of each figure are ranked (`WordTable.top`), so the words need not be sorted.
+- matplotlib and wordcloud are imported on first render, not at import time.
+"""
+
+import io
+from pathlib import Path
+from concurrent.futures import Future, ProcessPoolExecutor
+from .classes import as_word_table
+
+FONT_PATH = 'static/fonts/EBGaramond-VariableFont_wght.ttf'  # Font with polytonic Greek glyphs
+FIGURE_NAMES = ("bar_chart", "word_cloud")  # Figures saved with the results, as <name>.png
+FIGURE_SIZES = {"bar_chart": (10, 6), "word_cloud": (10, 5)}  # Figure sizes in inches
+WORD_CLOUD_MAX_WORDS = 200  # Words drawn in the word cloud (the WordCloud default)
+
+
+def layout_word_cloud(word_freq: dict, font_path=FONT_PATH):
+    """Lays out a WordCloud from word → TF-IDF score frequencies."""
+    from wordcloud import WordCloud
+
+    return WordCloud(
+        width=800,
+        height=400,
+        background_color='white',
+        colormap='Dark2',
+        font_path=font_path,
+        max_words=WORD_CLOUD_MAX_WORDS
+    ).generate_from_frequencies(word_freq)
+
+
+def draw_bar_chart(figure, words, raw_counts, top_n):
+    """Draws the horizontal bar chart of the top words, highest score at the top, onto `figure`."""
+    axes = figure.subplots()
+    axes.barh(words[::-1], raw_counts[::-1], color='skyblue')
+    axes.set_xlabel('Occurrences in the text')
+    axes.set_title(f'Top {top_n} Words by TF-IDF Score\n(X-axis shows raw occurrences)')
+    figure.tight_layout()
+
+
+def draw_word_cloud(figure, word_cloud):
+    """Draws a laid out WordCloud onto `figure`."""
+    axes = figure.subplots()
+    axes.imshow(word_cloud, interpolation='bilinear')
+    axes.axis('off')
+    axes.set_title('Word Cloud Based on TF-IDF Scores')
+
+
+def render_png(name: str, payload: dict, path=None) -> bytes:
+    """Renders the figure `name` from its payload without pyplot, on the Agg canvas.
+
+    Parameters:
+    - name (str): 'bar_chart' or 'word_cloud'.
+    - payload (dict): The figure inputs, see `ResultFigures.payload`.
+    - path (str or Path, optional): If given, the PNG file is also written there.
+
+    Returns:
+    - bytes: The PNG encoding.
+
+    Notes:
+    - This is the function run by RenderExecutor workers, so its arguments are plain picklable data.
+    """
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=FIGURE_SIZES[name])
+    if name == "bar_chart":
+        draw_bar_chart(figure, **payload)
+    else:
+        draw_word_cloud(figure, layout_word_cloud(**payload))
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png')
+    png = buffer.getvalue()
+    if path is not None:
+        Path(path).write_bytes(png)
+    return png
+
+
+class RenderExecutor:
+    def __init__(self, workers=2):
+        """Initialises the executor; the worker processes are started on the first submission.
+
+        Parameters:
+        - workers (int, optional): Number of rendering processes. Defaults to 2, one per figure.
+        """
+        self.workers = workers
+        self._pool = None
+        self._futures = []
+
+    def submit(self, function, *args) -> Future:
+        """Runs `function(*args)` in a worker process and returns its future."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        future = self._pool.submit(function, *args)
+        self._futures.append(future)
+        return future
+
+    def join(self) -> list:
+        """Waits for every submitted render.
+
+        Returns:
+        - list: The results, in submission order.
+
+        Raises:
+        - Exception: The first error raised by a render, after all of them have finished.
+        """
+        futures, self._futures = self._futures, []
+        errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+        return [future.result() for future in futures]
+
+    def shutdown(self) -> None:
+        """Stops the worker processes, cancelling renders that have not started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        self._futures = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.join()
+        finally:
+            self.shutdown()
+
+
+class ResultFigures:
+    def __init__(self, words, top_n=20, font_path=FONT_PATH):
+        """Initialises the figures of a scored word table; nothing is rendered yet.
+
+        Parameters:
+        - words (WordTable or list): The scored words; they need not be sorted, the top words are selected
+          by TF-IDF score.
+        - top_n (int, optional): Number of top words in the bar chart. Defaults to 20.
+        - font_path (str, optional): Font used by the word cloud. Defaults to FONT_PATH.
+        """
+        self.words = as_word_table(words)
+        self.top_n = top_n
+        self.font_path = font_path
+        self._word_cloud = None
+        self._figures = {}  # Figure name -> matplotlib Figure
+        self._png = {}  # Figure name -> PNG bytes
+        self._pending = {}  # Figure name -> Future of the PNG bytes, while rendered in the background
+
+    def payload(self, name: str) -> dict:
+        """Returns the plain inputs of the figure `name`, as passed to `render_png`."""
+        if name == "bar_chart":
+            top_words = self.words.top(self.top_n)
+            return {"words": list(top_words.word), "raw_counts": top_words.raw_count.tolist(), "top_n": self.top_n}
+        # The word cloud only draws its WORD_CLOUD_MAX_WORDS highest scores, so only those are selected
+        top_words = self.words.top(WORD_CLOUD_MAX_WORDS)
+        positive = top_words.tf_idf > 0
+        word_freq = dict(zip(top_words.take(positive.nonzero()[0]).word, top_words.tf_idf[positive].tolist()))
+        return {"word_freq": word_freq, "font_path": self.font_path}
+
+    @property
+    def word_cloud(self):
+        """The WordCloud laid out from the positive TF-IDF scores, computed on first access."""
+        if self._word_cloud is None:
+            self._word_cloud = layout_word_cloud(**self.payload("word_cloud"))
+        return self._word_cloud
+
+    def figure(self, name: str):
+        """Returns the figure `name` ('bar_chart' or 'word_cloud') as a pyplot figure, rendering it on first use.
+
+        Raises:
+        - KeyError: If `name` is not one of FIGURE_NAMES.
+        """
+        if name not in self._figures:
+            import matplotlib.pyplot as plt
+
+            figure = plt.figure(figsize=FIGURE_SIZES[name])
+            if name == "bar_chart":
+                draw_bar_chart(figure, **self.payload(name))
+            else:
+                draw_word_cloud(figure, self.word_cloud)
+            self._figures[name] = figure
+        return self._figures[name]
+
+    def png(self, name: str) -> bytes:
+        """Returns the figure `name` encoded as PNG, encoding it once (or waiting for its background render)."""
+        if name in self._pending:
+            self._png[name] = self._pending.pop(name).result()
+        if name not in self._png:
+            buffer = io.BytesIO()
+            self.figure(name).savefig(buffer, format='png')
+            self._png[name] = buffer.getvalue()
+        return self._png[name]
+
+    def save(self, path, name: str) -> Path:
+        """Writes the figure `name` as a PNG file at `path`."""
+        path = Path(path)
+        path.write_bytes(self.png(name))
+        return path
+
+    def save_all(self, folder) -> list:
+        """Writes every figure as `<name>.png` into `folder`.
+
+        Returns:
+        - list: The written file paths.
+        """
+        return [self.save(Path(folder) / f"{name}.png", name) for name in FIGURE_NAMES]
+
+    def submit(self, executor: RenderExecutor, folder=None) -> dict:
+        """Renders the figures in the background and writes them as `<name>.png` into `folder`, if given.
+
+        Parameters:
+        - executor (RenderExecutor): The executor rendering the figures.
+        - folder (str or Path, optional): Folder the PNG files are written to by the workers.
+
+        Returns:
+        - dict: Figure name -> Future of its PNG bytes. Figures already rendered or submitted are
+          written from this process instead, and returned as completed futures.
+        """
+        futures = {}
+        for name in FIGURE_NAMES:
+            path = None if folder is None else Path(folder) / f"{name}.png"
+            if name in self._pending or name in self._png or name in self._figures:
+                if path is not None:
+                    self.save(path, name)
+                futures[name] = Future()
+                futures[name].set_result(self.png(name))
+            else:
+                futures[name] = self._pending[name] = executor.submit(render_png, name, self.payload(name), path)
+        return futures
+
+    def close(self) -> None:
+        """Closes the rendered figures; the cached PNG encodings and word cloud are kept."""
+        if self._figures:
+            import matplotlib.pyplot as plt
+
+            for figure in self._figures.values():
+                plt.close(figure)
+            self._figures = {}
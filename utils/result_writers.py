@@ -0,0 +1,172 @@
+# File path: utils/result_writers.py
+
+""" result_writers.py
+
+This module provides pluggable writers for the word statistics table saved with the results.
+Each writer reads the WordTable columns directly, without building a data frame or a list of rows.
+
+Functions:
+- register_writer: Registers a writer function for an output format.
+- result_columns: Returns the named output columns of a WordTable.
+- check_formats: Normalises requested formats to a tuple and rejects unknown ones.
+- write_results: Writes a WordTable in one or more formats and times each writer.
+- write_csv, write_jsonl, write_parquet, write_feather, write_excel: The built-in writers.
+
+Formats:
+- csv: Comma-separated values (standard library).
+- jsonl: One JSON object per word (standard library).
+- parquet: Apache Parquet (requires pyarrow).
+- feather: Feather / Arrow IPC (requires pyarrow).
+- excel: Excel workbook, as written before (requires pandas and openpyxl); opt-in only.
+
+Dependencies:
+- csv, json: For the text formats.
+- time: For the writer timings.
+- pyarrow, pandas: Imported only by the writers that need them.
+
+Usage:
+>>> write_results(sorted_words, "results/run", formats=("csv", "parquet"))
+{'csv': {'path': 'results/run/results.csv', 'seconds': 0.004}, 'parquet': {...}}
+"""
+
+import csv
+import json
+import time
+from pathlib import Path
+from .classes import as_word_table
+
+DEFAULT_FORMATS = ("csv",)  # Formats written when none are requested
+
+# Format -> (writer function, file extension)
+WRITERS = {}
+
+
+def register_writer(name: str, extension: str):
+    """Registers the decorated function as the writer of format `name`.
+
+    Parameters:
+    - name (str): Format name used in `formats`.
+    - extension (str): File extension of the output, e.g. ".csv".
+
+    Notes:
+    - A writer is called as `writer(columns, path)`, where `columns` maps column names to lists or
+      NumPy arrays of equal length.
+    """
+    def decorator(writer):
+        WRITERS[name] = (writer, extension)
+        return writer
+    return decorator
+
+
+def result_columns(word_table) -> dict:
+    """Returns the output columns of a WordTable (or list of Word objects), in their saved order."""
+    word_table = as_word_table(word_table)
+    return {
+        'Word': word_table.word,
+        'Raw Count': word_table.raw_count,
+        'Frequency (%)': word_table.frequency,
+        'IDF': word_table.idf,
+        'TF-IDF': word_table.tf_idf,
+        'Found in Texts': word_table.found_in_texts
+    }
+
+
+def _python_columns(columns: dict) -> list:
+    """Converts NumPy columns to lists of Python scalars, column by column."""
+    return [column.tolist() if hasattr(column, "tolist") else column for column in columns.values()]
+
+
+@register_writer("csv", ".csv")
+def write_csv(columns: dict, path) -> None:
+    """Writes the columns as CSV with a header row."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(zip(*_python_columns(columns)))  # Rows are produced one at a time
+
+
+@register_writer("jsonl", ".jsonl")
+def write_jsonl(columns: dict, path) -> None:
+    """Writes one JSON object per row."""
+    names = list(columns)
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(dict(zip(names, row)), ensure_ascii=False) + "\n"
+                     for row in zip(*_python_columns(columns)))
+
+
+def _arrow_table(columns: dict):
+    """Builds a pyarrow Table from the columns, without copying the NumPy arrays where possible."""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("The parquet and feather formats require pyarrow: pip install pyarrow") from None
+    return pa.table({name: pa.array(column) for name, column in columns.items()})
+
+
+@register_writer("parquet", ".parquet")
+def write_parquet(columns: dict, path) -> None:
+    """Writes the columns as a Parquet file."""
+    import pyarrow.parquet as pq
+    pq.write_table(_arrow_table(columns), path)
+
+
+@register_writer("feather", ".feather")
+def write_feather(columns: dict, path) -> None:
+    """Writes the columns as a Feather (Arrow IPC) file."""
+    from pyarrow import feather
+    feather.write_feather(_arrow_table(columns), path)
+
+
+@register_writer("excel", ".xlsx")
+def write_excel(columns: dict, path) -> None:
+    """Writes the columns as an Excel workbook."""
+    import pandas as pd
+    pd.DataFrame(columns).to_excel(path, index=False)
+
+
+def check_formats(formats) -> tuple:
+    """Normalises requested result formats and checks that a writer exists for each.
+
+    Parameters:
+    - formats (str or iterable): Format name(s), see `WRITERS`.
+
+    Returns:
+    - tuple: The format names; a bare string becomes a one-element tuple.
+
+    Raises:
+    - ValueError: If a format is unknown.
+    """
+    formats = (formats,) if isinstance(formats, str) else tuple(formats)
+    unknown = [name for name in formats if name not in WRITERS]
+    if unknown:
+        raise ValueError(f"Unknown result formats {unknown}; available: {sorted(WRITERS)}")
+    return formats
+
+
+def write_results(word_table, folder, formats=DEFAULT_FORMATS, basename="results") -> dict:
+    """Writes the word statistics in each requested format and times each writer.
+
+    Parameters:
+    - word_table (WordTable or list): The words, in the order they are written (normally by TF-IDF).
+    - folder (str or Path): Folder the files are written to.
+    - formats (str or iterable, optional): Format name(s), see `WRITERS`. Defaults to ("csv",).
+    - basename (str, optional): File name without extension. Defaults to "results".
+
+    Returns:
+    - dict: Format -> {'path': written file, 'seconds': time taken by its writer}.
+
+    Raises:
+    - ValueError: If a format is unknown.
+    - ImportError: If the library needed by a format is not installed.
+    """
+    formats = check_formats(formats)
+
+    columns = result_columns(word_table)
+    written = {}
+    for name in formats:
+        writer, extension = WRITERS[name]
+        path = Path(folder) / f"{basename}{extension}"
+        start = time.perf_counter()
+        writer(columns, path)
+        written[name] = {"path": str(path), "seconds": time.perf_counter() - start}
+    return written
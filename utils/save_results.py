@@ -3,72 +3,110 @@
 """ save_results.py
 
 This module handles saving analysis results, metadata, and visualisations to a specified results folder.
-It supports exporting data as YAML and Excel files and generates bar charts and word clouds
-for text analysis outcomes.
+It exports metadata as YAML and word statistics in pluggable formats (CSV, JSON lines, Parquet,
+Feather or Excel), and generates bar charts and word clouds for text analysis outcomes.
 
 Functions:
 - save_results_to_folder: Saves word analysis results, metadata, and visualisations to a folder.
 
 Dependencies:
 - sys: For retrieving Python version information.
-- yaml: For exporting metadata to a YAML file.
+- yaml: For exporting metadata, including the run report, to a YAML file.
 - platform: For accessing operating system details.
-- pandas: For exporting word data to Excel.
+- utils.result_writers: Writers for the word statistics table.
+- utils.classes: The WordTable columns are written directly.
 - pathlib: For creating folder paths.
-- matplotlib.pyplot: For generating bar chart visualisations.
-- wordcloud: For creating word cloud visualisations.
+- utils.rendering: The bar chart and word cloud, rendered once by ResultFigures, optionally by a RenderExecutor.
 - datetime: For timestamp generation to name result folders.
 
 Usage:
 Call `save_results_to_folder` with appropriate word analysis results to save outputs.
+
+Notes:
+- matplotlib and wordcloud are imported when results are saved, not at import time; pandas and pyarrow
+  only when a format needing them is requested.
 """
 
 import sys
 import yaml
 import platform
-import pandas as pd
 from pathlib import Path
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
 from datetime import datetime
+from .classes import as_word_table
+from .result_writers import DEFAULT_FORMATS, check_formats, write_results
+from .rendering import ResultFigures
 
 
 def save_results_to_folder(words_list, sorted_words, corpus_path, corpus_files, analysis_path, analysis_files,
-                           save_results=False):
+                           save_results=False, results_folder=None, run_report=None, formats=DEFAULT_FORMATS,
+                           figures=None, render_executor=None):
     """Saves analysis results, metadata, and visualisations to a timestamped folder.
 
     Parameters:
-    - words_list (list): A list of Word objects containing word statistics.
-    - sorted_words (list): Words sorted by TF-IDF scores.
+    - words_list (WordTable or list): Word statistics, as a WordTable or a list of Word objects.
+    - sorted_words (WordTable or list): Words the figures are drawn from; they need not be sorted.
     - corpus_path (str): Path to the corpus directory.
     - corpus_files (list): List of corpus file paths.
     - analysis_path (str): Path to the analysis directory.
     - analysis_files (list): List of analysis file paths.
     - save_results (bool): Flag to enable saving results. Default is False.
+    - results_folder (str or Path, optional): Folder to save into. Defaults to a new timestamped folder.
+    - run_report (RunReport or dict, optional): Run report embedded into the metadata under 'run_report'.
+    - formats (str or iterable, optional): Formats of the word statistics file, any of 'csv', 'jsonl',
+      'parquet', 'feather' and 'excel'. Defaults to ('csv',).
+    - figures (ResultFigures, optional): Figures already rendered for `sorted_words`, e.g. the ones returned by
+      `generate_visualisations`; they are saved as they are. Defaults to rendering new ones.
+    - render_executor (RenderExecutor, optional): If given, figures not rendered yet are rendered and written
+      by its worker processes, while the word statistics and metadata are written here. The caller joins the
+      executor before relying on the PNG files.
+
+    Returns:
+    - Path or None: The results folder, or None if `save_results` is False.
+
+    Raises:
+    - ValueError: If a format is unknown; nothing is written.
 
     Workflow:
     1. Creates a timestamped results folder.
-    2. Saves metadata about the analysis process in a YAML file.
-    3. Exports word statistics as an Excel file.
-    4. Generates a bar chart visualising the top 20 words by raw occurrences.
-    5. Creates a word cloud based on TF-IDF scores.
+    2. Exports word statistics, sorted by TF-IDF, in each requested format.
+    3. Saves metadata about the analysis process, the written files with their writer timings, and the
+       run report if given, in a YAML file.
+    4. Saves a bar chart visualising the top 20 words by raw occurrences, reusing `figures` if given.
+    5. Saves a word cloud based on TF-IDF scores, reusing `figures` if given.
 
     Example:
     >>> save_results_to_folder(words_list, sorted_words, "data/corpus", corpus_files,
                               "data/analysis", analysis_files, save_results=True)
 
     Notes:
-    - Visualisations are saved as PNG files in the results folder.
+    - Visualisations are saved as PNG files in the results folder; with `render_executor`, they may still be
+      being written when this function returns.
     - Metadata includes system information, file paths, and word analysis summaries.
     """
     if not save_results:
         return
 
+    formats = check_formats(formats)  # Before the folder is created or any figure is rendered
+    words_list = as_word_table(words_list)
+    sorted_words = as_word_table(sorted_words)
+
     # Generate folder name with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    results_folder = Path(f'results/results_{timestamp}')
+    if results_folder is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        results_folder = f'results/results_{timestamp}'
+    results_folder = Path(results_folder)
     results_folder.mkdir(parents=True, exist_ok=True)
 
+    # Start the background renders first, so they overlap with the writers below
+    owns_figures = figures is None
+    if owns_figures:
+        figures = ResultFigures(sorted_words)
+    if render_executor is not None:
+        figures.submit(render_executor, results_folder)
+
+    # Save word statistics, highest TF-IDF first
+    outputs = write_results(words_list.sorted_by('tf_idf'), results_folder, formats)
+
     # Save metadata as YAML
     metadata_file = results_folder / "metadata.yaml"
     metadata = {
@@ -81,71 +119,35 @@ def save_results_to_folder(words_list, sorted_words, corpus_path, corpus_files,
             },
             "word_counts": {
                 "total_words_analyzed": len(words_list),
-                "total_unique_words": len(set([w.word for w in words_list]))
+                "total_unique_words": len(set(words_list.word))
             }
         },
         "data": {
             "corpus": {
                 "path": corpus_path,
                 "file_count": len(corpus_files),
-                "files": corpus_files
+                "files": [str(file_path) for file_path in corpus_files]
             },
             "analysis": {
                 "path": analysis_path,
                 "file_count": len(analysis_files),
-                "files": analysis_files
-            }
+                "files": [str(file_path) for file_path in analysis_files]
+            },
+            "results": {name: {"file": Path(output["path"]).name, "seconds": output["seconds"]}
+                        for name, output in outputs.items()}
         }
     }
+    if run_report is not None:
+        # Stages still running (e.g. saving itself) are embedded without their time
+        metadata["run_report"] = run_report.to_dict() if hasattr(run_report, "to_dict") else run_report
     with open(metadata_file, "w") as f:
         yaml.dump(metadata, f, default_flow_style=False, allow_unicode=True)
 
-    # Save data to Excel
-    excel_file = results_folder / "results.xlsx"
-    data = {
-        'Word': [w.word for w in words_list],
-        'Raw Count': [w.raw_count for w in words_list],
-        'Frequency (%)': [w.frequency for w in words_list],
-        'IDF': [w.idf for w in words_list],
-        'TF-IDF': [w.tf_idf for w in words_list],
-        'Found in Texts': [w.found_in_texts for w in words_list]
-    }
-    df = pd.DataFrame(data)
-    df.sort_values(by='TF-IDF', ascending=False, inplace=True)
-    df.to_excel(excel_file, index=False)
-
-    # Save visualisations
-    top_words = sorted_words[:20]  # Top 20 words
-    words = [w.word for w in top_words]
-    raw_counts = [w.raw_count for w in top_words]
-
-    # Save bar chart
-    bar_chart_file = results_folder / "bar_chart.png"
-    plt.figure(figsize=(10, 6))
-    plt.barh(words[::-1], raw_counts[::-1], color='skyblue')
-    plt.xlabel('Occurrences in the text')
-    plt.title(f'Top 20 Words by TF-IDF Score\n(X-axis shows raw occurrences)')
-    plt.tight_layout()
-    plt.savefig(bar_chart_file)
-    plt.close()
-
-    # Save word cloud
-    word_freq = {w.word: w.tf_idf for w in sorted_words if w.tf_idf > 0}
-    wordcloud_file = results_folder / "word_cloud.png"
-    wc = WordCloud(
-        width=800,
-        height=400,
-        background_color='white',
-        colormap='Dark2',
-        font_path='static/fonts/EBGaramond-VariableFont_wght.ttf'
-    )
-    wc.generate_from_frequencies(word_freq)
-
-    plt.figure(figsize=(10, 5))
-    plt.imshow(wc, interpolation='bilinear')
-    plt.axis('off')
-    plt.title('Word Cloud Based on TF-IDF Scores')
-    plt.savefig(wordcloud_file)
-    plt.close()
+    # Save visualisations, rendering them only if they have not been rendered yet
+    if render_executor is None:
+        figures.save_all(results_folder)  # bar_chart.png and word_cloud.png
+        if owns_figures:
+            figures.close()
 
     print(f"Results saved in folder: {results_folder}")
+    return results_folder
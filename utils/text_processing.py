@@ -6,56 +6,166 @@ This module provides functions for cleaning, normalising, and lemmatising Ancien
 It uses the Classical Language Toolkit (CLTK) for lemmatisation and text processing.
 
 Functions:
-- get_greek_lemmatizer: Retrieves a Greek lemmatiser, ensuring the required CLTK corpus is downloaded.
+- get_greek_lemmatizer: Retrieves a Greek lemmatiser, restored from a versioned snapshot when possible.
+- get_compiled_greek_lemmatizer: Returns the Greek lemmatiser compiled into a frozen lookup table.
+- use_compiled_lemmatizer: Returns whether the compiled lemmatiser is enabled.
+- load_normalizer: Loads the normaliser once per process.
+- load_lemmatizer: Loads the lemmatiser, wrapped in its lemma cache, once per process.
+- load_text_processors: Loads the lemmatiser and the normaliser once per process.
+- get_lemmatizer: Returns the (cached) lemmatiser, loading it on first use.
 - cleaning_greek_text: Cleans and normalises Ancient Greek text.
 - replace_grave_with_acute: Replaces grave-accented vowels with acute-accented counterparts.
 - lemmatizing_text_cltk: Tokenises, normalises, and lemmatises text using the CLTK library.
 - text_cleaning_lemmas: Combines text cleaning, lemmatisation, and optional statistical analysis for text files.
+- iter_lemmatized_chunks: Streams text files through cleaning, normalisation and lemmatisation chunk by chunk.
+- lemmatize_token_lists: Lemmatises many token lists with one lemmatiser call over their distinct tokens.
+- iter_lemmatized_files: Lemmatises text files in batches of many files, yielding one lemmatised text per file.
 
 Dependencies:
 - CLTK: Used for normalisation and lemmatisation.
 - re: For regular expressions to clean and process text.
-- string: Provides punctuation handling utilities.
 - utils: Imports helper functions for statistical analysis and file operations.
+- utils.lemma_cache: Persistent token → lemma cache wrapped around the lemmatiser.
+- utils.compiled_lemmatizer: Frozen lookup table compiled from the backoff lemmatiser chain.
+- utils.model_snapshot: Versioned snapshot of the ready-to-use backoff lemmatiser.
+- utils.model_provisioning: Pre-flight check of the installed lemmatiser model.
+- utils.tokenizer: Single-pass tokeniser for editorial markers, punctuation and accents.
 
 Usage:
 These functions are utilised to prepare Ancient Greek texts for word analysis and further processing.
+
+Notes:
+- CLTK is imported, and the lemmatiser loaded, on first use rather than at import time.
+- The lemmatiser model is never downloaded at run time: a missing model raises ModelNotProvisionedError
+  before CLTK is imported. Install it with `python -m utils.model_provisioning`.
+- The compiled lemmatiser is used by default; set TFIDF_GREEK_COMPILED_LEMMATIZER=0 to call the backoff
+  chain (behind the SQLite lemma cache) instead. Both return the same lemmas.
 """
 
+import os
 import re
-import string
-from cltk.core.data_types import Doc
-from cltk.data.fetch import FetchCorpus
-from cltk.lemmatize.grc import GreekBackoffLemmatizer
-from cltk.alphabet.processes import GreekNormalizeProcess
-from cltk.alphabet.text_normalization import split_leading_punct, split_trailing_punct, remove_odd_punct
 
 from .text_processing import *
-from .tfidf_analysis import statistical_analysing, words_to_objects
-from .file_operations import get_data
+from collections import Counter
+from .tfidf_analysis import statistical_analysing_counts, words_to_objects
+from .file_operations import iter_text_chunks, get_cache_dir
+from .lemma_cache import LemmaCache, model_version_key
+from .compiled_lemmatizer import get_compiled_lemmatizer
+from .model_snapshot import get_snapshot
+from .model_provisioning import check_greek_model
+from .tokenizer import GRAVE_TO_ACUTE, tokenize_greek
+
+
+def _build_greek_lemmatizer():
+    """Builds a Greek lemmatiser from the installed CLTK model files.
+
+    Returns:
+    - GreekBackoffLemmatizer: An instance of the lemmatiser.
+
+    Raises:
+    - ModelNotProvisionedError: If the model is not installed (see `utils.model_provisioning`).
+    """
+    check_greek_model()
+    from cltk.lemmatize.grc import GreekBackoffLemmatizer
+
+    return GreekBackoffLemmatizer()
 
 
 def get_greek_lemmatizer():
-    """Retrieves a Greek lemmatiser from CLTK. Downloads corpus if not found.
+    """Retrieves a Greek lemmatiser from CLTK, restored from its snapshot when one matches the installed model.
 
     Returns:
     - GreekBackoffLemmatizer: An instance of the lemmatiser.
+
+    Raises:
+    - ModelNotProvisionedError: If the model is not installed. Nothing is downloaded; install the model
+      with `python -m utils.model_provisioning`.
+
+    Workflow:
+    1. Checks that the model files are installed.
+    2. Restores the lemmatiser from `<cache>/lemmatizers/backoff_<version>.pickle` if it exists.
+    3. Otherwise builds it from the model files and saves its snapshot for the next process.
+
+    Notes:
+    - Set TFIDF_GREEK_LEMMATIZER_SNAPSHOT=0 to always build the lemmatiser from the model files.
     """
-    try:
-        lemmatizer_download = GreekBackoffLemmatizer()
-    except FileNotFoundError as e:
-        if 'grc_models_cltk' in str(e):
-            corpus_downloader = FetchCorpus(language="grc")
-            corpus_downloader.import_corpus("grc_models_cltk")
-            lemmatizer_download = GreekBackoffLemmatizer()
-        else:
-            raise e
-    return lemmatizer_download
+    if os.environ.get("TFIDF_GREEK_LEMMATIZER_SNAPSHOT", "1") == "0":
+        return _build_greek_lemmatizer()
+
+    models_path = check_greek_model() / "lemmata" / "backoff"
+    model_version = model_version_key("GreekBackoffLemmatizer", str(models_path))
+    snapshot_path = get_cache_dir() / "lemmatizers" / f"backoff_{model_version}.pickle"
+    return get_snapshot(_build_greek_lemmatizer, model_version, snapshot_path)
+
+
+def get_compiled_greek_lemmatizer():
+    """Returns the Greek backoff lemmatiser compiled into a frozen lookup table, cached on disk.
+
+    Returns:
+    - CompiledLemmatizer: The compiled lemmatiser; its `model_version` is that of GreekBackoffLemmatizer.
+
+    Raises:
+    - ModelNotProvisionedError: If the model is not installed.
+
+    Notes:
+    - The backoff lemmatiser is only loaded when no compiled table of the installed model is cached yet.
+    """
+    models_path = check_greek_model() / "lemmata" / "backoff"
+    model_version = model_version_key("GreekBackoffLemmatizer", str(models_path))
+    return get_compiled_lemmatizer(get_greek_lemmatizer, model_version, get_cache_dir())
+
+
+def use_compiled_lemmatizer() -> bool:
+    """Returns whether the compiled lemmatiser is enabled (TFIDF_GREEK_COMPILED_LEMMATIZER, default on)."""
+    return os.environ.get("TFIDF_GREEK_COMPILED_LEMMATIZER", "1") != "0"
 
 
-lemmatizer = get_greek_lemmatizer()
 lang = "grc"
-normalize_proc = GreekNormalizeProcess(language=lang)
+lemmatizer = None
+normalize_proc = None
+
+
+def load_normalizer():
+    """Loads the Greek normaliser into the module globals, once per process; the lemmatiser model is not needed."""
+    global normalize_proc
+    if normalize_proc is None:
+        from cltk.alphabet.processes import GreekNormalizeProcess
+
+        normalize_proc = GreekNormalizeProcess(language=lang)
+
+
+def load_lemmatizer():
+    """Loads the lemmatiser, wrapped in its lemma cache, into the module globals, once per process.
+
+    Notes:
+    - The model check runs first, so a missing model fails before CLTK is imported.
+    """
+    global lemmatizer
+    if lemmatizer is None:
+        check_greek_model()
+        if use_compiled_lemmatizer():
+            # Table lookups are cheaper than the SQLite store, so the compiled lemmatiser is only memoised in memory
+            compiled = get_compiled_greek_lemmatizer()
+            lemmatizer = LemmaCache(compiled, model_version=compiled.model_version)
+        else:
+            # The lemmatiser is wrapped in a persistent token -> lemma cache
+            lemmatizer = LemmaCache(get_greek_lemmatizer(), cache_path=get_cache_dir() / "lemmas.sqlite")
+
+
+def load_text_processors():
+    """Loads the lemmatiser and the normaliser into the module globals, once per process.
+
+    Notes:
+    - Also used as the initializer of corpus worker processes, so each worker loads the models once.
+    """
+    load_lemmatizer()
+    load_normalizer()
+
+
+def get_lemmatizer() -> LemmaCache:
+    """Returns the lemmatiser wrapped in its lemma cache, loading it on first use."""
+    load_lemmatizer()
+    return lemmatizer
 
 
 def cleaning_greek_text(text) -> str:
@@ -67,6 +177,11 @@ def cleaning_greek_text(text) -> str:
     Returns:
     - str: Cleaned and normalised text.
     """
+    from cltk.core.data_types import Doc
+    from cltk.alphabet.text_normalization import split_leading_punct, split_trailing_punct, remove_odd_punct
+
+    load_normalizer()
+
     # Normalize the text for Ancient Greek
     non_normed_doc = Doc(raw=text)
     normalized_doc = normalize_proc.run(input_doc=non_normed_doc)
@@ -89,15 +204,8 @@ def cleaning_greek_text(text) -> str:
 
 
 # Define the mapping from grave-accented to acute-accented vowels
-grave_to_acute_map = {
-    'ὰ': 'ά',
-    'ὲ': 'έ',
-    'ὴ': 'ή',
-    'ὶ': 'ί',
-    'ὺ': 'ύ',
-    'ὸ': 'ό',
-    'ὼ': 'ώ'
-}
+grave_to_acute_map = GRAVE_TO_ACUTE
+_grave_to_acute_table = str.maketrans(grave_to_acute_map)
 
 
 def replace_grave_with_acute(word: str) -> str:
@@ -109,9 +217,17 @@ def replace_grave_with_acute(word: str) -> str:
     Returns:
     - str: Word with grave accents replaced by acute accents.
     """
-    for grave, acute in grave_to_acute_map.items():
-        word = word.replace(grave, acute)
-    return word
+    return word.translate(_grave_to_acute_table)
+
+
+def _clean_lemma(lemma: str):
+    """Post-processes one lemma: lower case, punctuation dropped (None), 'δ' expanded to 'δέ'."""
+    lemma = lemma.lower()
+    if lemma in ('punc', 'col'):
+        return None
+    if lemma == 'δ':
+        return 'δέ'
+    return lemma
 
 
 def lemmatizing_text_cltk(text: str) -> str:
@@ -122,50 +238,103 @@ def lemmatizing_text_cltk(text: str) -> str:
 
     Returns:
     - str: A lemmatised and cleaned version of the text.
-    """
-    custom_punctuation = string.punctuation + "·«»⟦⟧…"
-
-    # Initial punctuation handling
-    text = split_trailing_punct(text, punctuation=list(custom_punctuation))
-    text = split_leading_punct(text, punctuation=list(custom_punctuation))
-    text = remove_odd_punct(text)
-
-    # Normalize the text for Ancient Greek
-    non_normed_doc = Doc(raw=text)
-    normalized_doc = normalize_proc.run(input_doc=non_normed_doc)
-    normalized_text = normalized_doc.raw
 
-    # Remove editorial markers
-    normalized_text = re.sub(r'col\d+', '', normalized_text)
-    normalized_text = re.sub(r'±\d+', '', normalized_text)
-    normalized_text = re.sub(r'\[.*?\]', '', normalized_text)
-    normalized_text = re.sub(r'[⏑–†]', '', normalized_text)
+    Notes:
+    - Editorial markers, punctuation and grave accents are handled in one pass by `tokenize_greek`.
+    """
+    load_lemmatizer()
 
     # Tokenise and clean tokens
-    tokenized_text = normalized_text.split()
-    tokens_cleaned = []
-    for t in tokenized_text:
-        t = re.sub(rf'^[{re.escape(custom_punctuation)}]+|[{re.escape(custom_punctuation)}]+$', '', t)
-        t = replace_grave_with_acute(t)
-        if t:
-            tokens_cleaned.append(t)
+    tokens_cleaned = tokenize_greek(text)
 
     # Lemmatise cleaned tokens
     text_lemmas = lemmatizer.lemmatize(tokens_cleaned)
-    lemmas = [tup[1].lower() for tup in text_lemmas]
 
     # Post-process tokens
     cleaned = []
-    for lemma in lemmas:
-        if lemma in ['punc', 'col']:
-            continue
-        if lemma == 'δ':
-            lemma = 'δέ'
-        cleaned.append(lemma)
+    for _, lemma in text_lemmas:
+        lemma = _clean_lemma(lemma)
+        if lemma is not None:
+            cleaned.append(lemma)
 
     return ' '.join(cleaned)
 
 
+def lemmatize_token_lists(token_lists) -> list:
+    """Lemmatises several token lists with a single lemmatiser call over their distinct tokens.
+
+    Parameters:
+    - token_lists (list): Lists of cleaned tokens, e.g. one per text chunk.
+
+    Returns:
+    - list: One list of post-processed lemmas per token list, as `lemmatizing_text_cltk` produces them.
+
+    Notes:
+    - Every token form is lemmatised once, however often and in however many lists it occurs; the lemmas
+      are identical because the lemmatiser decides from the token alone.
+    """
+    load_lemmatizer()
+
+    # Gather the distinct forms, in first-seen order
+    distinct_tokens = list(dict.fromkeys(token for tokens in token_lists for token in tokens))
+    lemma_of = {token: _clean_lemma(lemma) for token, lemma in lemmatizer.lemmatize(distinct_tokens)}
+
+    # Scatter the lemmas back to each list, dropping punctuation
+    return [[lemma for lemma in map(lemma_of.__getitem__, tokens) if lemma is not None] for tokens in token_lists]
+
+
+def iter_lemmatized_files(file_paths, batch_tokens=500_000, chunk_size=1 << 16):
+    """Streams text files through cleaning and tokenisation, and lemmatises them in batches of many files.
+
+    Parameters:
+    - file_paths (list): Paths of the files containing Ancient Greek text.
+    - batch_tokens (int, optional): Number of tokens gathered before the batch is lemmatised. Defaults to 500,000.
+    - chunk_size (int, optional): Approximate number of characters read per chunk. Defaults to 65,536.
+
+    Yields:
+    - tuple: (index of the file in `file_paths`, its lemmatised text), in file order.
+
+    Notes:
+    - Each batch is lemmatised with one `lemmatize_token_lists` call, so a form shared by many files is
+      lemmatised once per batch instead of once per file.
+    - The lemmas of each file are the same as those of `text_cleaning_lemmas([file_path], analysis=False)`.
+    """
+    def lemmatize_batch(batch):
+        lemma_lists = iter(lemmatize_token_lists([tokens for _, chunks in batch for tokens in chunks]))
+        for index, chunks in batch:
+            yield index, ' '.join(lemma for _ in chunks for lemma in next(lemma_lists))
+
+    batch = []  # (file index, token lists of its chunks)
+    batch_size = 0
+    for index, file_path in enumerate(file_paths):
+        chunks = [tokenize_greek(cleaning_greek_text(chunk)) for chunk in iter_text_chunks([file_path], chunk_size)]
+        batch.append((index, chunks))
+        batch_size += sum(len(tokens) for tokens in chunks)
+        if batch_size >= batch_tokens:
+            yield from lemmatize_batch(batch)
+            batch, batch_size = [], 0
+    if batch:
+        yield from lemmatize_batch(batch)
+
+
+def iter_lemmatized_chunks(file_paths, chunk_size=1 << 16):
+    """Streams text files through cleaning, normalisation, tokenisation and lemmatisation.
+
+    Parameters:
+    - file_paths (list): Paths of the files containing Ancient Greek text.
+    - chunk_size (int, optional): Approximate number of characters read per chunk. Defaults to 65,536.
+
+    Yields:
+    - str: The lemmatised text of each chunk (possibly empty).
+
+    Notes:
+    - Chunks end on line boundaries, and every cleaning step works within a line, so the lemmas are
+      the same as when processing the whole text at once.
+    """
+    for chunk in iter_text_chunks(file_paths, chunk_size):
+        yield lemmatizing_text_cltk(cleaning_greek_text(chunk))
+
+
 def text_cleaning_lemmas(file_path, analysis=True):
     """Combines text cleaning, lemmatisation, and optional statistical analysis.
 
@@ -174,18 +343,15 @@ def text_cleaning_lemmas(file_path, analysis=True):
     - analysis (bool): Whether to perform statistical analysis. Default is True.
 
     Returns:
-    - list or str: Word objects with analysis results if `analysis` is True, otherwise lemmatised text.
+    - WordTable or str: Word statistics with analysis results if `analysis` is True, otherwise lemmatised text.
+
+    Notes:
+    - Files are read in chunks and lemmatised in batches of many files (see `iter_lemmatized_files`), so
+      peak memory is bounded by the batch size; with `analysis` True only the word counts are kept.
     """
-    main_text = ''
-    for path in file_path:
-        if main_text:
-            main_text += '\n'
-        main_text += get_data(path)
-    cleaned_text = cleaning_greek_text(main_text)
-    lemmatized_text = lemmatizing_text_cltk(cleaned_text)
     if analysis:
-        analysed_text = statistical_analysing(lemmatized_text)
-        word_list = words_to_objects(analysed_text)
-        return word_list
-    else:
-        return lemmatized_text
+        word_counts = Counter()
+        for _, lemmatized_text in iter_lemmatized_files(file_path):
+            word_counts.update(lemmatized_text.lower().split())
+        return words_to_objects(statistical_analysing_counts(word_counts))
+    return ' '.join(text for _, text in iter_lemmatized_files(file_path) if text)
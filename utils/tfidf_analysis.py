@@ -7,22 +7,29 @@ and performing word searches in a text corpus.
 
 Functions:
 - statistical_analysing: Performs word frequency analysis.
-- words_to_objects: Converts word frequency data into Word objects.
+- statistical_analysing_counts: Performs word frequency analysis on precomputed word counts.
+- words_to_objects: Converts word frequency data into a WordTable.
+- idf_values: Computes IDF values for an array of document frequencies.
 - calculate_idf: Calculates IDF (Inverse Document Frequency) and TF-IDF scores for words.
 - word_search: Searches for words within a corpus and updates their appearance count.
 
 Dependencies:
 - math: For logarithmic calculations in IDF.
 - collections.Counter: To calculate word frequencies.
-- utils.classes.Word: Word class definition for storing word attributes.
+- numpy: For vectorised scoring of WordTable columns.
+- utils.classes: WordTable column store for storing word attributes.
+- utils.inverted_index: Inverted index used for document frequency lookups.
+- utils.df_table: Persisted document-frequency tables accepted by `calculate_idf`.
 
 Usage:
 These functions form the backbone of TF-IDF analysis pipelines for Ancient Greek text processing.
 """
 
 import math
+import numpy as np
 from collections import Counter
-from .classes import Word
+from .classes import WordTable
+from .inverted_index import build_inverted_index
 
 
 def statistical_analysing(text: str) -> dict:
@@ -34,27 +41,38 @@ def statistical_analysing(text: str) -> dict:
     Returns:
     - dict: A dictionary containing:
         - 'Word': List of unique words in the text.
-        - 'Raw Count': Number of occurrences of each word.
-        - 'Frequency (%)': Frequency of each word as a percentage of total words.
+        - 'Raw Count': Number of occurrences of each word (numpy array).
+        - 'Frequency (%)': Frequency of each word as a percentage of total words (numpy array).
 
     Example:
     >>> text = "apple orange apple"
     >>> stats = statistical_analysing(text)
     >>> print(stats)
-    {'Word': ['apple', 'orange'], 'Raw Count': [2, 1], 'Frequency (%)': [0.6667, 0.3333]}
+    {'Word': ['apple', 'orange'], 'Raw Count': array([2, 1]), 'Frequency (%)': array([0.6667, 0.3333])}
     """
-    words_list = text.lower().split()
-    total_words = len(words_list)
-    word_counts = Counter(words_list)
+    return statistical_analysing_counts(Counter(text.lower().split()))
+
+
+def statistical_analysing_counts(word_counts: Counter) -> dict:
+    """Performs word frequency analysis on word counts accumulated elsewhere, e.g. while streaming a text.
+
+    Parameters:
+    - word_counts (Counter): Number of occurrences of each word.
+
+    Returns:
+    - dict: The same dictionary as `statistical_analysing`.
+    """
+    total_words = sum(word_counts.values())
+    raw_counts = np.fromiter(word_counts.values(), dtype=np.int64, count=len(word_counts))
     return {
         'Word': list(word_counts.keys()),
-        'Raw Count': list(word_counts.values()),
-        'Frequency (%)': [count / total_words for count in word_counts.values()]
+        'Raw Count': raw_counts,
+        'Frequency (%)': raw_counts / total_words if total_words else raw_counts.astype(np.float64)
     }
 
 
-def words_to_objects(words_data: dict) -> list:
-    """Converts word frequency data into a list of Word objects.
+def words_to_objects(words_data: dict) -> WordTable:
+    """Converts word frequency data into a WordTable.
 
     Parameters:
     - words_data (dict): A dictionary containing word statistics:
@@ -63,7 +81,7 @@ def words_to_objects(words_data: dict) -> list:
         - 'Raw Count': List of word occurrence counts.
 
     Returns:
-    - list: A list of Word objects.
+    - WordTable: The word statistics as columns; iterating over it yields Word objects.
 
     Example:
     >>> data = {'Word': ['apple'], 'Frequency (%)': [0.5], 'Raw Count': [1]}
@@ -71,28 +89,65 @@ def words_to_objects(words_data: dict) -> list:
     >>> print(word_objects[0].word, word_objects[0].frequency)
     apple 0.5
     """
-    word_objects_list = [Word(word, frequency, raw_count) for word, frequency, raw_count in
-                         zip(words_data['Word'], words_data['Frequency (%)'], words_data['Raw Count'])]
-    return word_objects_list
+    return WordTable(words_data['Word'], words_data['Raw Count'], words_data['Frequency (%)'])
+
+
+def idf_values(number_of_documents: int, document_frequencies) -> np.ndarray:
+    """Computes log(number_of_documents / df) for an array of document frequencies, with 0 where df is 0.
+
+    Notes:
+    - `math.log` is evaluated once per distinct document frequency, so values are identical to a
+      per-word `math.log` (NumPy's vectorised log can differ in the last digit).
+    """
+    distinct, inverse = np.unique(document_frequencies, return_inverse=True)
+    table = np.array([math.log(number_of_documents / df) if df else 0.0 for df in distinct.tolist()],
+                     dtype=np.float64)
+    return table[inverse].reshape(np.shape(document_frequencies))
 
 
-def calculate_idf(number_of_documents: int, word_objects: list) -> None:
+def calculate_idf(number_of_documents, word_objects, index=None, df_table=None) -> None:
     """Calculates IDF and TF-IDF scores for each word object.
 
     Parameters:
-    - number_of_documents (int): Total number of documents in the corpus.
-    - word_objects (list): List of Word objects.
+    - number_of_documents (int or None): Total number of documents in the corpus. May be None when
+      `df_table` is given, which then supplies it.
+    - word_objects (WordTable or list): The words, as a WordTable or a list of Word objects.
+    - index (InvertedIndex, optional): If given, 'found_in_texts' is read from the index first.
+    - df_table (DocumentFrequencyTable, optional): If given, 'found_in_texts' is read from the table first,
+      so no corpus text is needed.
 
     Workflow:
     - If a word is not found in any document, it is assigned a high TF-IDF value (default 10000).
     - Otherwise, the IDF is calculated as log(number_of_documents / found_in_texts).
     - TF-IDF is then calculated as IDF multiplied by raw count.
+    - A WordTable is scored column-wise in one pass.
 
     Example:
-    >>> word_obj = Word('apple', raw_count=3, found_in_texts=2)
+    >>> word_obj = Word('apple', raw_count=3)
+    >>> word_obj.found_in_texts = 2
     >>> calculate_idf(10, [word_obj])
     >>> print(word_obj.idf, word_obj.tf_idf)
     """
+    if df_table is not None:
+        if number_of_documents is None:
+            number_of_documents = df_table.document_count
+        index = df_table  # Same document_frequency lookups as an InvertedIndex
+
+    if isinstance(word_objects, WordTable):
+        if df_table is not None:
+            word_objects.found_in_texts[:] = df_table.document_frequency_of(word_objects.word)
+        elif index is not None:
+            word_objects.found_in_texts[:] = [index.document_frequency(word) for word in word_objects.word]
+        found = word_objects.found_in_texts > 0
+        idf = idf_values(number_of_documents, word_objects.found_in_texts)
+        word_objects.idf[found] = idf[found]
+        word_objects.tf_idf[:] = np.where(found, idf * word_objects.raw_count, 10000)  # 10000 for unique words
+        return
+
+    if index is not None:
+        for word_obj in word_objects:
+            word_obj.found_in_texts = index.document_frequency(word_obj.word)
+
     for word_obj in word_objects:
         if word_obj.found_in_texts == 0:
             word_obj.tf_idf = 10000  # Assign a high TF-IDF value for unique words
@@ -101,17 +156,18 @@ def calculate_idf(number_of_documents: int, word_objects: list) -> None:
             word_obj.tf_idf = word_obj.idf * word_obj.raw_count
 
 
-def word_search(corpus: list, words_objects: list) -> None:
+def word_search(corpus, words_objects, index=None) -> None:
     """Searches for words within a corpus and updates their appearance count.
 
     Parameters:
-    - corpus (list): A list of text strings representing the corpus.
-    - words_objects (list): A list of Word objects to search for in the corpus.
+    - corpus (TokenCorpus or list): The corpus, as a TokenCorpus or a list of text strings.
+    - words_objects (WordTable or list): The words to search for, as a WordTable or a list of Word objects.
+    - index (InvertedIndex, optional): A prebuilt index of the corpus. Built from `corpus` if not given.
 
     Workflow:
-    - Creates a set of words to be searched for quick lookup.
-    - Iterates through each text in the corpus and finds matching words.
-    - Updates the 'found_in_texts' attribute for matching Word objects.
+    - Builds an inverted index of the corpus unless one is supplied.
+    - Looks up the document frequency of each word in the index.
+    - Updates the 'found_in_texts' attribute (or column) of the words.
 
     Example:
     >>> corpus = ["apple orange", "banana apple"]
@@ -120,11 +176,10 @@ def word_search(corpus: list, words_objects: list) -> None:
     >>> print(word_objs[0].found_in_texts)
     2
     """
-    words_set = {word_obj.word for word_obj in words_objects}  # Create a set of target words
-    for text in corpus:  # Iterate through texts in corpus
-        text_words = set(text.split())  # Convert text to a set of words
-        found_words = text_words.intersection(words_set)  # Find words in both sets
-        for word in found_words:  # Increment count for matched words
-            for word_obj in words_objects:
-                if word == word_obj.word:
-                    word_obj.found_in_texts += 1
+    if index is None:
+        index = build_inverted_index(corpus)  # Index the corpus once
+    if isinstance(words_objects, WordTable):
+        words_objects.found_in_texts += [index.document_frequency(word) for word in words_objects.word]
+        return
+    for word_obj in words_objects:  # One dictionary lookup per word
+        word_obj.found_in_texts += index.document_frequency(word_obj.word)
@@ -0,0 +1,137 @@
+# File path: utils/tfidf_matrix.py
+
+""" tfidf_matrix.py
+
+This module provides a vectorised TF-IDF engine built on a sparse document-term count matrix.
+Document frequencies, IDF and TF-IDF are computed for every document and every term at once with
+NumPy/SciPy sparse operations, instead of one Word object at a time.
+
+Class:
+- TfidfMatrix: CSR document-term matrix of a TokenCorpus with document frequency, IDF and TF-IDF.
+
+Dependencies:
+- numpy: For vectorised counting and lookups.
+- scipy.sparse: For the CSR document-term matrix.
+- utils.tfidf_analysis.idf_values: IDF values identical to those of `calculate_idf`.
+- utils.classes.WordTable: Analysis groups are scored column-wise.
+
+Usage:
+>>> engine = TfidfMatrix.from_corpus(corpus)
+>>> scores = engine.tf_idf()           # All documents × all terms
+>>> engine.score_words(word_objects)   # The ranking used by `main`
+"""
+
+import numpy as np
+from scipy import sparse
+from .classes import WordTable
+from .tfidf_analysis import idf_values
+
+
+class TfidfMatrix:
+    def __init__(self, counts, vocabulary):
+        """Initialises the engine from a document-term count matrix.
+
+        Parameters:
+        - counts (scipy.sparse.csr_matrix): Raw term counts, one row per document, one column per term id.
+        - vocabulary (Vocabulary): Maps lemmas to column ids.
+
+        Attributes:
+        - document_frequencies (numpy.ndarray): Number of documents containing each term.
+        """
+        self.counts = counts.tocsr()
+        self.vocabulary = vocabulary
+        self.document_frequencies = np.bincount(self.counts.indices, minlength=self.counts.shape[1])
+
+    @classmethod
+    def from_corpus(cls, corpus):
+        """Builds the CSR count matrix of a TokenCorpus.
+
+        Parameters:
+        - corpus (TokenCorpus): The corpus; row i is document i.
+
+        Returns:
+        - TfidfMatrix: The engine.
+        """
+        indptr = [0]
+        indices = []
+        data = []
+        for document in corpus:
+            token_ids = np.frombuffer(document, dtype=np.uint32) if document.itemsize == 4 \
+                else np.asarray(document, dtype=np.uint32)
+            term_ids, term_counts = np.unique(token_ids, return_counts=True)  # Sorted column ids per row
+            indices.append(term_ids)
+            data.append(term_counts)
+            indptr.append(indptr[-1] + len(term_ids))
+
+        counts = sparse.csr_matrix(
+            (np.concatenate(data) if data else np.zeros(0, dtype=np.int64),
+             np.concatenate(indices) if indices else np.zeros(0, dtype=np.uint32),
+             np.asarray(indptr, dtype=np.int64)),
+            shape=(len(corpus), len(corpus.vocabulary))
+        )
+        return cls(counts, corpus.vocabulary)
+
+    @property
+    def document_count(self) -> int:
+        """Number of documents (rows) in the matrix."""
+        return self.counts.shape[0]
+
+    def idf(self, number_of_documents=None) -> np.ndarray:
+        """Returns the IDF of every term, log(N / df), with 0 for terms found in no document.
+
+        Parameters:
+        - number_of_documents (int, optional): N. Defaults to the number of rows in the matrix.
+
+        Notes:
+        - Values are identical to those of `calculate_idf` (see `idf_values`).
+        """
+        n = self.document_count if number_of_documents is None else number_of_documents
+        return idf_values(n, self.document_frequencies)
+
+    def tf_idf(self, number_of_documents=None):
+        """Returns the TF-IDF matrix (raw count × IDF) of every document and term.
+
+        Returns:
+        - scipy.sparse.csr_matrix: Same shape and sparsity as the count matrix.
+        """
+        return self.counts.multiply(self.idf(number_of_documents)).tocsr()
+
+    def term_ids(self, lemmas) -> np.ndarray:
+        """Returns the column id of each lemma, or -1 for lemmas not in the corpus."""
+        get_id = self.vocabulary.get_id
+        return np.array([-1 if (term_id := get_id(lemma)) is None else term_id for lemma in lemmas], dtype=np.int64)
+
+    def document_frequency_of(self, lemmas) -> np.ndarray:
+        """Returns the document frequency of each lemma (0 for lemmas not in the corpus)."""
+        term_ids = self.term_ids(lemmas)
+        found = term_ids >= 0
+        frequencies = np.zeros(len(term_ids), dtype=np.int64)
+        frequencies[found] = self.document_frequencies[term_ids[found]]
+        return frequencies
+
+    def score_words(self, word_objects, number_of_documents=None) -> None:
+        """Scores an analysis group against the corpus, as `word_search` followed by `calculate_idf` does.
+
+        Parameters:
+        - word_objects (WordTable or list): The analysis group; raw counts are the term frequencies.
+        - number_of_documents (int, optional): N for the IDF. Defaults to the number of corpus documents.
+
+        Workflow:
+        - Sets 'found_in_texts' from the corpus document frequencies.
+        - Words found in no document get a TF-IDF of 10000; the others get log(N / df) × raw count.
+        """
+        n = self.document_count if number_of_documents is None else number_of_documents
+        table = word_objects if isinstance(word_objects, WordTable) else WordTable.from_words(word_objects)
+
+        document_frequencies = self.document_frequency_of(table.word)
+        found = document_frequencies > 0
+        idf = idf_values(n, document_frequencies)
+        table.found_in_texts[:] = document_frequencies
+        table.idf[found] = idf[found]
+        table.tf_idf[:] = np.where(found, idf * table.raw_count, 10000)  # 10000 for unique words
+
+        if table is not word_objects:  # Copy the scores back onto the Word objects
+            for row, word_obj in enumerate(word_objects):
+                word_obj.found_in_texts = table.found_in_texts[row].item()
+                word_obj.idf = table.idf[row].item()
+                word_obj.tf_idf = table.tf_idf[row].item()
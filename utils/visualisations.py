@@ -10,26 +10,34 @@ Functions:
   based on TF-IDF analysis.
 
 Dependencies:
-- matplotlib.pyplot: For creating bar chart visualisations.
-- wordcloud: For generating word clouds.
+- matplotlib.pyplot: For displaying the figures.
 - datetime: For generating timestamps to save visualisations.
+- utils.rendering: The figures are rendered once by ResultFigures.
 
 Usage:
 Call `generate_visualisations` with a list of sorted words to generate visual outputs.
+
+Notes:
+- matplotlib and wordcloud are imported on the first call, not at import time.
+- Passing the returned figures to `save_results_to_folder` saves them without rendering them again.
 """
 
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
 from datetime import datetime
+from .rendering import ResultFigures
 
 
-def generate_visualisations(sorted_words, top_n=20, save_figures=False):
+def generate_visualisations(sorted_words, top_n=20, save_figures=False, figures=None):
     """Generates bar charts and word clouds for word analysis results.
 
     Parameters:
-    - sorted_words (list): A list of Word objects sorted by TF-IDF scores.
+    - sorted_words (WordTable or list): Scored words, as a WordTable or a list of Word objects; they need not be
+      sorted, the top words are selected by TF-IDF score.
     - top_n (int, optional): Number of top words to include in the bar chart. Default is 20.
     - save_figures (bool, optional): If True, saves the figures as PNG files. Default is False.
+    - figures (ResultFigures, optional): Figures already rendered for `sorted_words`. Defaults to new ones.
+
+    Returns:
+    - ResultFigures: The rendered figures, to be reused (e.g. by `save_results_to_folder`) and closed by the caller.
 
     Workflow:
     1. Generates a bar chart for the top N words sorted by TF-IDF scores.
@@ -41,46 +49,23 @@ def generate_visualisations(sorted_words, top_n=20, save_figures=False):
     - Saves the figures if `save_figures` is set to True.
 
     Example:
-    >>> generate_visualisations(sorted_words, top_n=10, save_figures=True)
+    >>> figures = generate_visualisations(sorted_words, top_n=10, save_figures=True)
     """
+    if figures is None:
+        figures = ResultFigures(sorted_words, top_n=top_n)
+
     # Generate a timestamp for file naming
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
     # Visualisation 1: Bar Chart of Top TF-IDF Words
-    top_words = sorted_words[:top_n]
-    words = [w.word for w in top_words]
-    raw_counts = [w.raw_count for w in top_words]
-
-    plt.figure(figsize=(10, 6))
-    plt.barh(words[::-1], raw_counts[::-1], color='skyblue')
-    plt.xlabel('Occurrences in the text')
-    plt.title(f'Top {top_n} Words by TF-IDF Score\n(X-axis shows raw occurrences)')
-    plt.tight_layout()
-
-    if save_figures:
-        plt.savefig(f'top_tf_idf_words_{timestamp}.png')
-        plt.close()
-    else:
-        plt.show()
-
     # Visualisation 2: Word Cloud Based on TF-IDF Scores
-    word_freq = {w.word: w.tf_idf for w in sorted_words if w.tf_idf > 0}
-    wc = WordCloud(
-        width=800,
-        height=400,
-        background_color='white',
-        colormap='Dark2',
-        font_path='static/fonts/EBGaramond-VariableFont_wght.ttf'
-    )
-    wc.generate_from_frequencies(word_freq)
-
-    plt.figure(figsize=(10, 5))
-    plt.imshow(wc, interpolation='bilinear')
-    plt.axis('off')
-    plt.title('Word Cloud Based on TF-IDF Scores')
-
-    if save_figures:
-        plt.savefig(f'word_cloud_{timestamp}.png')
-        plt.close()
-    else:
-        plt.show()
+    for name, file_prefix in (("bar_chart", "top_tf_idf_words"), ("word_cloud", "word_cloud")):
+        if save_figures:
+            figures.save(f'{file_prefix}_{timestamp}.png', name)
+        else:
+            import matplotlib.pyplot as plt
+
+            figures.figure(name)  # Rendered just before it is shown, so the figures are shown one at a time
+            plt.show()
+
+    return figures
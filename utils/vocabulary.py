@@ -0,0 +1,109 @@
+# File path: utils/vocabulary.py
+
+""" vocabulary.py
+
+This module defines a compact, integer-based representation of a lemmatised corpus.
+Lemmas are interned once in a shared `Vocabulary`, and each document is stored as an `array('I')`
+of token ids (4 bytes per token) instead of a joined Python string.
+
+Classes:
+- Vocabulary: Interns lemmas to consecutive integer ids.
+- TokenCorpus: A sequence of documents stored as token-id arrays over a shared Vocabulary.
+
+Dependencies:
+- array: For compact unsigned 32-bit token arrays.
+
+Usage:
+`creating_corpus` returns a TokenCorpus; `word_search` and `build_inverted_index` accept it directly.
+"""
+
+from array import array
+
+
+class Vocabulary:
+    def __init__(self, lemmas=()):
+        """Initialises a vocabulary, optionally with lemmas in id order.
+
+        Parameters:
+        - lemmas (iterable, optional): Lemmas to intern, receiving ids 0, 1, 2, ...
+        """
+        self.ids = {}  # Lemma -> id
+        self.lemmas = []  # Id -> lemma
+        for lemma in lemmas:
+            self.add(lemma)
+
+    def add(self, lemma: str) -> int:
+        """Returns the id of a lemma, interning it if it is new."""
+        term_id = self.ids.get(lemma)
+        if term_id is None:
+            term_id = len(self.lemmas)
+            self.ids[lemma] = term_id
+            self.lemmas.append(lemma)
+        return term_id
+
+    def get_id(self, lemma: str):
+        """Returns the id of a lemma, or None if it is not in the vocabulary."""
+        return self.ids.get(lemma)
+
+    def encode(self, tokens) -> array:
+        """Converts lemmas (a list or a space-separated string) to an array of ids, interning new lemmas.
+
+        Example:
+        >>> vocabulary = Vocabulary()
+        >>> vocabulary.encode("apple orange apple")
+        array('I', [0, 1, 0])
+        """
+        if isinstance(tokens, str):
+            tokens = tokens.split()
+        return array('I', [self.add(token) for token in tokens])
+
+    def decode(self, token_ids) -> list:
+        """Converts an iterable of ids back to lemmas."""
+        return [self.lemmas[term_id] for term_id in token_ids]
+
+    def __contains__(self, lemma):
+        return lemma in self.ids
+
+    def __len__(self):
+        return len(self.lemmas)
+
+
+class TokenCorpus:
+    def __init__(self, vocabulary=None):
+        """Initialises an empty corpus.
+
+        Parameters:
+        - vocabulary (Vocabulary, optional): Vocabulary to share with other corpora. A new one is created if None.
+
+        Attributes:
+        - vocabulary (Vocabulary): The lemma ↔ id mapping.
+        - documents (list): One `array('I')` of token ids per document; the position is the document id.
+        """
+        self.vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        self.documents = []
+
+    def add_document(self, text) -> int:
+        """Encodes and appends a lemmatised document, returning its document id.
+
+        Parameters:
+        - text (str or list): The lemmatised text, as a space-separated string or a list of lemmas.
+        """
+        self.documents.append(self.vocabulary.encode(text))
+        return len(self.documents) - 1
+
+    def text(self, doc_id: int) -> str:
+        """Returns a document as a space-separated lemma string."""
+        return ' '.join(self.vocabulary.decode(self.documents[doc_id]))
+
+    def token_count(self) -> int:
+        """Returns the total number of tokens in the corpus."""
+        return sum(len(document) for document in self.documents)
+
+    def __getitem__(self, doc_id):
+        return self.documents[doc_id]
+
+    def __iter__(self):
+        return iter(self.documents)
+
+    def __len__(self):
+        return len(self.documents)